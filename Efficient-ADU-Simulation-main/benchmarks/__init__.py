@@ -0,0 +1 @@
+"""Benchmark suite for the simulation hot paths (see benchmarks.run_benchmarks)."""
@@ -0,0 +1,292 @@
+"""
+Benchmark suite for the simulation hot paths.
+
+Times SimulationEngine.run_simulation, OptimizationModule.find_optimal_design,
+GISAnalyzer.analyze_zoning_constraints and the per-design model calls (both the
+per-design loop and the DesignBatch path) at 10^3-10^6 designs or parcels, appends
+the results to a JSON history file and flags regressions against a stored baseline.
+
+Usage (from the project directory):
+    python -m benchmarks.run_benchmarks                   # full run, 10^3-10^6
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 --repeat 5
+    python -m benchmarks.run_benchmarks --save-baseline   # store this run as the baseline
+    python -m benchmarks.run_benchmarks --fail-on-regression
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from functools import cached_property, partial
+import numpy as np
+from src.SimulationEngine import SimulationEngine
+from src.OptimizationModule import OptimizationModule
+from src.GISAnalyzer import GISAnalyzer
+from src.CostEstimator import CostEstimator
+from src.EnergyModel import EnergyModel
+from src.DesignBatch import DesignBatch
+from src.DesignCodes import MATERIAL_TYPES, HVAC_TYPES, INSULATION_TYPES
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(BENCHMARK_DIR, "history.json")
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+
+PROPERTY_DATA = {"size": 5000, "slope": 5, "zoning_compliance": True}
+
+
+def make_designs(size, seed=0):
+    """
+    Builds a reproducible random design set.
+
+    Returns:
+    - tuple: (list of design dicts, the same designs as a DesignBatch).
+    """
+    rng = np.random.default_rng(seed)
+    floor_area = rng.integers(400, 1201, size)
+    materials = rng.integers(0, len(MATERIAL_TYPES), size)
+    hvac = rng.integers(0, len(HVAC_TYPES), size)
+    insulation = rng.integers(0, len(INSULATION_TYPES), size)
+
+    designs = [
+        {"floor_area": int(area), "materials": MATERIAL_TYPES[m], "hvac": HVAC_TYPES[h],
+         "insulation": INSULATION_TYPES[i]}
+        for area, m, h, i in zip(floor_area.tolist(), materials.tolist(), hvac.tolist(), insulation.tolist())
+    ]
+    return designs, DesignBatch.from_dicts(designs)
+
+
+def make_parcels(size, seed=0):
+    """
+    Builds a reproducible random parcel set (roughly a third of the parcels are rejected).
+
+    Returns:
+    - list: Property dicts with "size", "slope" and "zoning_compliance".
+    """
+    rng = np.random.default_rng(seed)
+    lot_sizes = rng.integers(3000, 9000, size).tolist()
+    slopes = rng.uniform(0, 20, size).tolist()
+    compliance = (rng.random(size) > 0.1).tolist()
+    return [{"size": lot, "slope": slope, "zoning_compliance": ok}
+            for lot, slope, ok in zip(lot_sizes, slopes, compliance)]
+
+
+def _loop(method, items):
+    def run():
+        for item in items:
+            method(item)
+    return run
+
+
+class Fixtures:
+    """
+    Inputs for one benchmark size, each built on first use, so a filtered run only pays
+    for the fixtures its selected benchmarks need (e.g. no 10^6 design dicts for
+    GISAnalyzer.screen_parcels).
+    """
+
+    def __init__(self, size):
+        self.size = size
+
+    @cached_property
+    def _design_set(self):
+        return make_designs(self.size)
+
+    @property
+    def designs(self):
+        return self._design_set[0]
+
+    @property
+    def batch(self):
+        return self._design_set[1]
+
+    @cached_property
+    def parcels(self):
+        return make_parcels(self.size)
+
+    @cached_property
+    def parcel_arrays(self):
+        return (np.array([parcel["size"] for parcel in self.parcels]),
+                np.array([parcel["slope"] for parcel in self.parcels]),
+                np.array([parcel["zoning_compliance"] for parcel in self.parcels]))
+
+
+def build_benchmarks(fixtures):
+    """
+    Lists every benchmark for one input size without building any inputs yet.
+
+    Parameters:
+    - fixtures (Fixtures): The inputs for that size.
+
+    Returns:
+    - dict: Benchmark name to a setup function that builds the inputs it needs (not
+      timed) and returns the zero-argument callable to time.
+    """
+    def screen_parcels():
+        gis_analyzer = GISAnalyzer()
+        lot_sizes, slopes, compliance = fixtures.parcel_arrays
+        return lambda: gis_analyzer.screen_parcels(lot_sizes, slopes, compliance)
+
+    return {
+        "SimulationEngine.run_simulation":
+            lambda: partial(SimulationEngine().run_simulation, PROPERTY_DATA, fixtures.designs),
+        "SimulationEngine.run_simulation[batch]":
+            lambda: partial(SimulationEngine().run_simulation, PROPERTY_DATA, fixtures.batch),
+        "OptimizationModule.find_optimal_design":
+            lambda: partial(OptimizationModule().find_optimal_design, fixtures.designs),
+        "OptimizationModule.find_optimal_design[batch]":
+            lambda: partial(OptimizationModule().find_optimal_design, fixtures.batch),
+        "GISAnalyzer.analyze_zoning_constraints":
+            lambda: _loop(GISAnalyzer().analyze_zoning_constraints, fixtures.parcels),
+        "GISAnalyzer.screen_parcels": screen_parcels,
+        "CostEstimator.estimate_total_cost": lambda: _loop(CostEstimator().estimate_total_cost, fixtures.designs),
+        "CostEstimator.estimate_total_cost[batch]":
+            lambda: partial(CostEstimator().estimate_total_cost, fixtures.batch),
+        "EnergyModel.compute_efficiency": lambda: _loop(EnergyModel().compute_efficiency, fixtures.designs),
+        "EnergyModel.compute_efficiency[batch]": lambda: partial(EnergyModel().compute_efficiency, fixtures.batch),
+        "EnergyModel.estimate_daily_energy_usage":
+            lambda: _loop(EnergyModel().estimate_daily_energy_usage, fixtures.designs),
+        "EnergyModel.estimate_daily_energy_usage[batch]":
+            lambda: partial(EnergyModel().estimate_daily_energy_usage, fixtures.batch),
+    }
+
+
+def time_call(function, repeat):
+    """
+    Returns the best wall-clock time of several runs (the least noisy estimate).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=3, only=None, progress=None):
+    """
+    Runs the suite.
+
+    Parameters:
+    - sizes (iterable): Numbers of designs / parcels to benchmark.
+    - repeat (int): Runs per measurement; the fastest run is reported.
+    - only (iterable): Substrings selecting a subset of benchmarks (default: all).
+    - progress (function): Called with (name, size, seconds) after each measurement.
+
+    Returns:
+    - dict: A run record with environment details and, per benchmark, per size
+      {"seconds", "per_item_us"}.
+    """
+    results = {}
+    for size in sizes:
+        for name, setup in build_benchmarks(Fixtures(size)).items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            seconds = time_call(setup(), repeat)
+            results.setdefault(name, {})[str(size)] = {"seconds": seconds, "per_item_us": seconds / size * 1e6}
+            if progress:
+                progress(name, size, seconds)
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results
+    }
+
+
+def find_regressions(run, baseline, threshold=0.25, min_seconds=0.001):
+    """
+    Compares a run against a baseline run.
+
+    Parameters:
+    - run (dict): Record returned by run_benchmarks().
+    - baseline (dict): An earlier record.
+    - threshold (float): Allowed relative slowdown (0.25 = 25% slower).
+    - min_seconds (float): Ignore measurements faster than this in both runs (timer noise).
+
+    Returns:
+    - list: One dict per regression with "benchmark", "size", "baseline", "current", "ratio".
+    """
+    regressions = []
+    for name, sizes in run["results"].items():
+        for size, current in sizes.items():
+            previous = baseline.get("results", {}).get(name, {}).get(size)
+            if previous is None or max(previous["seconds"], current["seconds"]) < min_seconds:
+                continue
+            ratio = current["seconds"] / max(previous["seconds"], 1e-12)
+            if ratio > 1 + threshold:
+                regressions.append({"benchmark": name, "size": int(size), "baseline": previous["seconds"],
+                                    "current": current["seconds"], "ratio": ratio})
+    return regressions
+
+
+def load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path) as json_file:
+        return json.load(json_file)
+
+
+def save_json(path, data):
+    with open(path, "w") as json_file:
+        json.dump(data, json_file, indent=2)
+
+
+def append_history(path, run):
+    """
+    Appends a run record to the JSON history file (a list of records).
+    """
+    history = load_json(path, [])
+    history.append(run)
+    save_json(path, history)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ADU simulation hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Numbers of designs / parcels (default: 10^3 to 10^6).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the fastest is kept.")
+    parser.add_argument("--only", nargs="+", help="Only run benchmarks whose name contains one of these.")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON history file to append to.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline run to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown (default 25%%).")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions.")
+    args = parser.parse_args(argv)
+
+    def progress(name, size, seconds):
+        print(f"{name:<50} {size:>9,}  {seconds:10.4f} s  {seconds / size * 1e6:10.3f} us/item")
+
+    run = run_benchmarks(args.sizes, args.repeat, args.only, progress)
+    append_history(args.history, run)
+    print(f"\nResults appended to {args.history}")
+
+    if args.save_baseline:
+        save_json(args.baseline, run)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_json(args.baseline, None)
+    if baseline is None:
+        print("No baseline stored yet (use --save-baseline).")
+        return 0
+
+    regressions = find_regressions(run, baseline, args.threshold)
+    if not regressions:
+        print(f"No regressions against the baseline from {baseline.get('timestamp')}.")
+        return 0
+
+    print(f"\nRegressions against the baseline from {baseline.get('timestamp')}:")
+    for regression in regressions:
+        print(f"  {regression['benchmark']} @ {regression['size']:,}: {regression['baseline']:.4f} s -> "
+              f"{regression['current']:.4f} s ({regression['ratio']:.2f}x)")
+    return 1 if args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
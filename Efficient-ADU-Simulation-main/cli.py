@@ -0,0 +1,210 @@
+"""
+Command-line entry point for the ADU simulation.
+
+    python cli.py simulate [--size 5000 --slope 5] [--designs designs.json] [--json]
+    python cli.py sweep --min-area 400 --max-area 1200 --step 25 [--top 5] [--output sweep.npz|.csv|.parquet]
+    python cli.py report [--designs designs.json | --sweep --step 5] [--output-dir reports]
+
+Add --timing to any subcommand to print the cold-start import time and total run time.
+NumPy is only loaded by the paths that evaluate design batches (sweep) and matplotlib only
+by report (with the headless Agg backend), so simulate starts without either.
+"""
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import heapq
+import json
+import sys
+from src.SimulationEngine import SimulationEngine
+from src.LazyImport import is_loaded
+
+_IMPORTED = time.perf_counter()
+
+# The five designs from main.py, used when no --designs file is given
+DEFAULT_DESIGNS = [
+    {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+    {"floor_area": 700, "materials": "steel_frame", "hvac": "high_efficiency", "insulation": "high_efficiency"},
+    {"floor_area": 800, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+    {"floor_area": 750, "materials": "wood_frame", "hvac": "high_efficiency", "insulation": "high_efficiency"},
+    {"floor_area": 1000, "materials": "concrete", "hvac": "high_efficiency", "insulation": "high_efficiency"},
+]
+
+
+def _property_data(args):
+    return {"size": args.size, "slope": args.slope, "zoning_compliance": not args.noncompliant}
+
+
+def _load_designs(args):
+    if args.designs is None:
+        return DEFAULT_DESIGNS
+    with open(args.designs) as designs_file:
+        return json.load(designs_file)
+
+
+def simulate(args):
+    """
+    Runs the simulation for one property and a design catalog.
+    """
+    results = SimulationEngine().run_simulation(_property_data(args), _load_designs(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 1 if "error" in results else 0
+
+    if "error" in results:
+        print(f"Simulation Error: {results['error']}")
+        return 1
+
+    print(f"Best Design Selected: {results['best_design']}")
+    for i, res in enumerate(results["all_designs"], start=1):
+        print(f"Design {i}: {res['design']}  efficiency {res['efficiency_score']}  "
+              f"{res['daily_energy_usage']} kWh/day  ${res['total_cost']:,.2f}")
+    return 0
+
+
+def _run_sweep(args, top_count=0, keep_columns=False):
+    """
+    Evaluates the full design grid for one property chunk by chunk.
+
+    Returns:
+    - tuple: (error message or None, design count, top designs as (score, -index, design),
+      ResultTable of all designs if keep_columns).
+    """
+    from src.DesignSpace import DesignSpace
+    from src.ResultTable import ResultTable
+
+    engine = SimulationEngine()
+    design_space = DesignSpace(range(args.min_area, args.max_area + 1, args.step))
+
+    top = []
+    tables = []
+    offset = 0
+    for chunk in design_space.iter_chunks(chunk_size=args.chunk_size):
+        results = engine.run_simulation_batch(_property_data(args), chunk)
+        if "error" in results:
+            return results["error"], 0, [], None
+
+        for entry in engine.optimization_module.find_top_designs(chunk, top_count, scores=results["scores"]):
+            top.append((entry["score"], -(offset + entry["index"]), entry["design"]))
+        top = heapq.nlargest(top_count, top)
+
+        if keep_columns:
+            tables.append(ResultTable.from_simulation(results, chunk))
+        offset += len(chunk)
+
+    table = ResultTable.concatenate(tables) if keep_columns else None
+    return None, len(design_space), top, table
+
+
+def sweep(args):
+    """
+    Evaluates the full design grid for one property and prints the top designs.
+    """
+    if args.output:
+        from src.ResultTable import ResultTable
+
+        # Reject an unsupported output format before the sweep rather than after it
+        try:
+            ResultTable.check_export_path(args.output)
+        except ValueError as error:
+            print(f"Error: {error}")
+            return 1
+
+    error, design_count, top, table = _run_sweep(args, args.top, keep_columns=bool(args.output))
+    if error:
+        print(f"Simulation Error: {error}")
+        return 1
+
+    print(f"Evaluated {design_count:,} designs.")
+    for rank, (score, _, design) in enumerate(top, start=1):
+        print(f"{rank}. score {score:.4f}: {design}")
+
+    if args.output:
+        table.export(args.output)
+        print(f"Results saved to {args.output}")
+    return 0
+
+
+def report(args):
+    """
+    Renders the report as PNG files (headless): per-design charts for a design catalog, or
+    aggregated charts (binned quantile bands, cost vs. efficiency histogram) for --sweep.
+    """
+    if args.sweep:
+        from src.ReportGenerator import ReportGenerator
+
+        error, design_count, _, table = _run_sweep(args, keep_columns=True)
+        if error:
+            print(f"Simulation Error: {error}")
+            return 1
+        paths = ReportGenerator(max_workers=args.workers).generate(table.columns(), args.output_dir)
+        print(f"Aggregated {design_count:,} designs.")
+        for path in paths:
+            print(f"Saved {path}")
+        return 0
+
+    from src.DesignCharts import save_design_charts
+
+    results = SimulationEngine().run_simulation(_property_data(args), _load_designs(args))
+    if "error" in results:
+        print(f"Simulation Error: {results['error']}")
+        return 1
+
+    for path in save_design_charts(results["all_designs"], args.output_dir):
+        print(f"Saved {path}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Efficient ADU Design Simulation")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--size", type=float, default=5000, help="Lot size in square feet.")
+    common.add_argument("--slope", type=float, default=5, help="Slope in degrees.")
+    common.add_argument("--noncompliant", action="store_true", help="Property fails zoning compliance.")
+    common.add_argument("--timing", action="store_true", help="Print cold-start and run times.")
+
+    simulate_parser = subcommands.add_parser("simulate", parents=[common], help="Simulate a design catalog.")
+    simulate_parser.add_argument("--designs", help="JSON file with a list of designs.")
+    simulate_parser.add_argument("--json", action="store_true", help="Print the full results as JSON.")
+    simulate_parser.set_defaults(handler=simulate)
+
+    grid = argparse.ArgumentParser(add_help=False)
+    grid.add_argument("--min-area", type=int, default=400)
+    grid.add_argument("--max-area", type=int, default=1200)
+    grid.add_argument("--step", type=int, default=25)
+    grid.add_argument("--chunk-size", type=int, default=100000)
+
+    sweep_parser = subcommands.add_parser("sweep", parents=[common, grid], help="Sweep the full design grid.")
+    sweep_parser.add_argument("--top", type=int, default=5, help="Number of best designs to print.")
+    sweep_parser.add_argument("--output", help="Save all results (.npz, .csv or .parquet).")
+    sweep_parser.set_defaults(handler=sweep)
+
+    report_parser = subcommands.add_parser("report", parents=[common, grid], help="Render the design charts.")
+    report_parser.add_argument("--designs", help="JSON file with a list of designs.")
+    report_parser.add_argument("--sweep", action="store_true",
+                               help="Report on the full design grid (aggregated charts) instead of --designs.")
+    report_parser.add_argument("--workers", type=int, help="Rendering processes for --sweep (0: in-process).")
+    report_parser.add_argument("--output-dir", default=".", help="Directory for the PNG files.")
+    report_parser.set_defaults(handler=report)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    status = args.handler(args)
+
+    if args.timing:
+        print(f"Startup (imports): {(_IMPORTED - _START) * 1000:.1f} ms, "
+              f"total: {(time.perf_counter() - _START) * 1000:.1f} ms, "
+              f"process CPU: {time.process_time() * 1000:.1f} ms "
+              f"(numpy loaded: {is_loaded('numpy')}, matplotlib loaded: {is_loaded('matplotlib')})",
+              file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,6 @@
+from src.DesignCodes import MATERIAL_TYPES, build_lookup_table, round_values
+from src.DesignBatch import DesignBatch
+
 class ADUDesign:
     """
     This module handles the design components of an Accessory Dwelling Unit (ADU),
@@ -9,12 +12,20 @@ class ADUDesign:
         Initializes an ADU design with the given parameters.
 
         Parameters:
-        - design_data (dict): Contains floor area, materials, and HVAC system type.
+        - design_data (dict or DesignBatch): Contains floor area, materials, and HVAC system type.
+          For a DesignBatch the attributes hold the batch columns (categories as codes).
         """
-        self.floor_area = design_data.get("floor_area", 600)  # Default: 600 sq. ft.
-        self.materials = design_data.get("materials", "wood_frame")
-        self.hvac = design_data.get("hvac", "standard")
-        self.insulation = design_data.get("insulation", "standard")
+        self.is_batch = isinstance(design_data, DesignBatch)
+        if self.is_batch:
+            self.floor_area = design_data.floor_area
+            self.materials = design_data.materials
+            self.hvac = design_data.hvac
+            self.insulation = design_data.insulation
+        else:
+            self.floor_area = design_data.get("floor_area", 600)  # Default: 600 sq. ft.
+            self.materials = design_data.get("materials", "wood_frame")
+            self.hvac = design_data.get("hvac", "standard")
+            self.insulation = design_data.get("insulation", "standard")
 
         # Space efficiency multiplier (accounts for walls, storage, etc.)
         self.space_efficiency = {
@@ -28,8 +39,12 @@ class ADUDesign:
         Calculates the livable space within the ADU after accounting for structural elements.
 
         Returns:
-        - float: Livable area in square feet.
+        - float: Livable area in square feet (an array for a DesignBatch).
         """
+        if self.is_batch:
+            efficiency_factors = build_lookup_table(self.space_efficiency, MATERIAL_TYPES, 0.85)[self.materials]
+            return round_values(self.floor_area * efficiency_factors, 2)
+
         efficiency_factor = self.space_efficiency.get(self.materials, 0.85)
         livable_area = self.floor_area * efficiency_factor
         return round(livable_area, 2)
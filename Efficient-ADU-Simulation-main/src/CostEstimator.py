@@ -1,3 +1,9 @@
+from src.LazyImport import lazy_import
+from src.DesignCodes import MATERIAL_TYPES, HVAC_TYPES, build_lookup_table, round_values
+from src.DesignBatch import DesignBatch
+
+np = lazy_import("numpy")
+
 class CostEstimator:
     """
     This module estimates the total construction cost of an ADU based on materials, labor,
@@ -24,16 +30,31 @@ class CostEstimator:
         # Labor cost per square foot
         self.labor_cost_per_sqft = 50  
 
+    def parameter_fingerprint(self):
+        """
+        Returns a hashable snapshot of every parameter that affects this model's outputs.
+
+        Returns:
+        - tuple: Changes whenever a base value or multiplier is changed.
+        """
+        return (self.base_cost_per_sqft,
+                self.labor_cost_per_sqft,
+                tuple(self.material_cost.items()),
+                tuple(self.hvac_cost.items()))
+
     def estimate_total_cost(self, design):
         """
         Estimates the total cost of an ADU construction project.
 
         Parameters:
-        - design (dict): ADU design parameters, including "floor_area", "materials", and "hvac".
+        - design (dict or DesignBatch): ADU design parameters, including "floor_area", "materials", and "hvac".
 
         Returns:
-        - float: Total estimated cost in USD.
+        - float: Total estimated cost in USD (an array of costs for a DesignBatch).
         """
+        if isinstance(design, DesignBatch):
+            return self.estimate_total_cost_batch(design.floor_area, design.materials, design.hvac)
+
         floor_area = design.get("floor_area", 600)  # Default size if not specified
         material_type = design.get("materials", "wood_frame")
         hvac_type = design.get("hvac", "standard")
@@ -51,6 +72,30 @@ class CostEstimator:
         total_cost = base_cost + labor_cost + hvac_system_cost
         return round(total_cost, 2)
 
+    def estimate_total_cost_batch(self, floor_area, materials, hvac):
+        """
+        Estimates total construction cost for a batch of designs in a few array operations.
+
+        Parameters:
+        - floor_area (np.ndarray): Floor areas in square feet.
+        - materials (np.ndarray): Material codes (see DesignCodes.MATERIAL_TYPES).
+        - hvac (np.ndarray): HVAC codes (see DesignCodes.HVAC_TYPES).
+
+        Returns:
+        - np.ndarray: Total estimated costs in USD, identical to estimate_total_cost().
+        """
+        floor_area = np.asarray(floor_area, dtype=np.float64)
+        material_multipliers = build_lookup_table(self.material_cost, MATERIAL_TYPES, 1.0)[materials]
+        hvac_multipliers = build_lookup_table(self.hvac_cost, HVAC_TYPES, 1.0)[hvac]
+
+        # Same operation order as the scalar path so the results match bit for bit
+        base_cost = floor_area * self.base_cost_per_sqft * material_multipliers
+        labor_cost = floor_area * self.labor_cost_per_sqft
+        hvac_system_cost = base_cost * hvac_multipliers
+
+        total_cost = base_cost + labor_cost + hvac_system_cost
+        return round_values(total_cost, 2)
+
 # Example usage
 if __name__ == "__main__":
     cost_estimator = CostEstimator()
@@ -0,0 +1,165 @@
+from src.LazyImport import lazy_import
+from src.DesignCodes import (MATERIAL_TYPES, HVAC_TYPES, INSULATION_TYPES,
+                             encode_categories, decode_category)
+
+np = lazy_import("numpy")
+
+class DesignBatch:
+    """
+    This module stores many ADU designs as a compact struct-of-arrays. Materials, HVAC and
+    insulation are int8 category codes (see DesignCodes) and floor area is an int32 array,
+    so a design costs 7 bytes instead of a dict. Fractional floor areas (and whole ones
+    outside the int32 range) are kept as float64 so the batch metrics match the per-design
+    path exactly.
+    """
+
+    def __init__(self, floor_area, materials, hvac, insulation):
+        """
+        Initializes a batch from column arrays.
+
+        Parameters:
+        - floor_area (array-like): Floor areas in square feet.
+        - materials (array-like): Material codes (see DesignCodes.MATERIAL_TYPES).
+        - hvac (array-like): HVAC codes (see DesignCodes.HVAC_TYPES).
+        - insulation (array-like): Insulation codes (see DesignCodes.INSULATION_TYPES).
+        """
+        floor_area = np.asarray(floor_area)
+        integral = np.issubdtype(floor_area.dtype, np.integer) or np.all(np.mod(floor_area, 1) == 0)
+        limits = np.iinfo(np.int32)
+        if integral and (floor_area.size == 0 or limits.min <= floor_area.min() and floor_area.max() <= limits.max):
+            self.floor_area = floor_area.astype(np.int32, copy=False)
+        else:
+            self.floor_area = floor_area.astype(np.float64, copy=False)
+
+        self.materials = np.asarray(materials).astype(np.int8, copy=False)
+        self.hvac = np.asarray(hvac).astype(np.int8, copy=False)
+        self.insulation = np.asarray(insulation).astype(np.int8, copy=False)
+
+        lengths = {len(self.floor_area), len(self.materials), len(self.hvac), len(self.insulation)}
+        if len(lengths) > 1:
+            raise ValueError("All DesignBatch columns must have the same length.")
+
+    @classmethod
+    def from_dicts(cls, designs):
+        """
+        Builds a batch from the existing list-of-dicts design form.
+
+        Parameters:
+        - designs (list): ADU design dicts with "floor_area", "materials", "hvac" and "insulation".
+
+        Returns:
+        - DesignBatch: The encoded designs. Missing keys take the same defaults as ADUDesign;
+          unknown category names are stored as DesignCodes.UNKNOWN_CODE.
+        """
+        designs = list(designs)
+        return cls(
+            [design.get("floor_area", 600) for design in designs],
+            encode_categories([design.get("materials", "wood_frame") for design in designs], MATERIAL_TYPES),
+            encode_categories([design.get("hvac", "standard") for design in designs], HVAC_TYPES),
+            encode_categories([design.get("insulation", "standard") for design in designs], INSULATION_TYPES)
+        )
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Builds a batch from a dict of columns, encoding any columns given as names.
+
+        Parameters:
+        - columns (dict): "floor_area", "materials", "hvac" and "insulation" columns.
+
+        Returns:
+        - DesignBatch: The encoded designs.
+        """
+        def codes(values, vocabulary):
+            values = np.asarray(values)
+            if values.dtype.kind in ("U", "S", "O"):
+                return encode_categories(values.tolist(), vocabulary)
+            return values
+
+        return cls(
+            columns["floor_area"],
+            codes(columns["materials"], MATERIAL_TYPES),
+            codes(columns["hvac"], HVAC_TYPES),
+            codes(columns["insulation"], INSULATION_TYPES)
+        )
+
+    @classmethod
+    def concatenate(cls, batches):
+        """
+        Joins several batches into one.
+
+        Parameters:
+        - batches (list): DesignBatch instances.
+
+        Returns:
+        - DesignBatch: All designs, in order.
+        """
+        batches = list(batches)
+        return cls(
+            np.concatenate([batch.floor_area for batch in batches]),
+            np.concatenate([batch.materials for batch in batches]),
+            np.concatenate([batch.hvac for batch in batches]),
+            np.concatenate([batch.insulation for batch in batches])
+        )
+
+    def columns(self):
+        """
+        Returns the batch as a dict of column arrays (no copies are made).
+
+        Returns:
+        - dict: "floor_area", "materials", "hvac" and "insulation" arrays.
+        """
+        return {
+            "floor_area": self.floor_area,
+            "materials": self.materials,
+            "hvac": self.hvac,
+            "insulation": self.insulation
+        }
+
+    def to_dicts(self):
+        """
+        Converts the batch back to the list-of-dicts design form.
+
+        Returns:
+        - list: ADU design dicts (unknown categories come back as None).
+        """
+        return [self[index] for index in range(len(self))]
+
+    @property
+    def nbytes(self):
+        """
+        Returns:
+        - int: Memory used by the column arrays in bytes.
+        """
+        return self.floor_area.nbytes + self.materials.nbytes + self.hvac.nbytes + self.insulation.nbytes
+
+    def __len__(self):
+        return len(self.floor_area)
+
+    def __getitem__(self, index):
+        """
+        Returns a single design as a dict for an integer index, or a sub-batch for a
+        slice, index array or boolean mask.
+        """
+        if isinstance(index, (int, np.integer)):
+            return {
+                "floor_area": self.floor_area[index].item(),
+                "materials": decode_category(self.materials[index], MATERIAL_TYPES),
+                "hvac": decode_category(self.hvac[index], HVAC_TYPES),
+                "insulation": decode_category(self.insulation[index], INSULATION_TYPES)
+            }
+
+        return DesignBatch(self.floor_area[index], self.materials[index],
+                           self.hvac[index], self.insulation[index])
+
+# Example usage
+if __name__ == "__main__":
+    adu_designs = [
+        {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+        {"floor_area": 750, "materials": "steel_frame", "hvac": "high_efficiency", "insulation": "high_efficiency"},
+        {"floor_area": 900, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+    ]
+
+    batch = DesignBatch.from_dicts(adu_designs)
+    print(f"Designs: {len(batch)}, memory: {batch.nbytes} bytes")
+    print(f"Round trip: {batch.to_dicts()}")
@@ -0,0 +1,86 @@
+import os
+
+def load_pyplot():
+    """
+    Imports matplotlib.pyplot with the headless Agg backend (no display needed). Only the
+    report paths call this, so other entry points never pay matplotlib's import time.
+
+    Returns:
+    - module: matplotlib.pyplot.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def save_design_charts(design_results, output_dir="."):
+    """
+    Saves the per-design charts for a small design catalog (one point or bar per design).
+
+    Parameters:
+    - design_results (list): The "all_designs" list of a run_simulation() result.
+    - output_dir (str): Directory for the PNG files.
+
+    Returns:
+    - list: Paths of the written PNG files.
+    """
+    plt = load_pyplot()
+    os.makedirs(output_dir, exist_ok=True)
+
+    floor_areas = [res["design"]["floor_area"] for res in design_results]
+    costs = [res["total_cost"] for res in design_results]
+    efficiencies = [res["efficiency_score"] for res in design_results]
+    energy_per_sqft = [round(res["daily_energy_usage"] / res["design"]["floor_area"], 4) for res in design_results]
+    cost_per_sqft = [round(res["total_cost"] / res["design"]["floor_area"], 2) for res in design_results]
+
+    paths = []
+
+    def save(filename):
+        plt.tight_layout()
+        path = os.path.join(output_dir, filename)
+        plt.savefig(path)
+        plt.close()
+        paths.append(path)
+
+    # 1. Bar Chart - Floor Area vs. Total Cost
+    plt.figure()
+    plt.bar([str(fa) + " sq ft" for fa in floor_areas], costs)
+    plt.title("Floor Area vs. Total Cost")
+    plt.xlabel("ADU Floor Area (sq ft)")
+    plt.ylabel("Cost (USD)")
+    save("floor_area_vs_cost.png")
+
+    # 2. Line Chart - Floor Area vs. Energy Efficiency
+    plt.figure()
+    plt.plot(floor_areas, efficiencies, marker='o')
+    plt.title("Floor Area vs. Energy Efficiency")
+    plt.xlabel("ADU Floor Area (sq ft)")
+    plt.ylabel("Efficiency Score")
+    save("floor_area_vs_efficiency.png")
+
+    # 3. Scatter Plot - Total Cost vs. Efficiency
+    plt.figure()
+    plt.scatter(costs, efficiencies)
+    plt.title("Total Cost vs. Energy Efficiency")
+    plt.xlabel("Total Cost (USD)")
+    plt.ylabel("Efficiency Score")
+    save("cost_vs_efficiency.png")
+
+    # 4. Line Chart - Floor Area vs. Energy Use per Sq Ft
+    plt.figure()
+    plt.plot(floor_areas, energy_per_sqft, marker='o', color='green')
+    plt.title("Floor Area vs. Energy Use per Sq Ft")
+    plt.xlabel("ADU Floor Area (sq ft)")
+    plt.ylabel("Energy Use (kWh/sq ft)")
+    save("floor_area_vs_energy_per_sqft.png")
+
+    # 5. Line Chart - Floor Area vs. Cost per Sq Ft
+    plt.figure()
+    plt.plot(floor_areas, cost_per_sqft, marker='o', color='red')
+    plt.title("Floor Area vs. Cost per Sq Ft")
+    plt.xlabel("ADU Floor Area (sq ft)")
+    plt.ylabel("Cost per Sq Ft (USD)")
+    save("floor_area_vs_cost_per_sqft.png")
+
+    return paths
@@ -0,0 +1,97 @@
+"""
+Categorical codes shared by the columnar (batch) evaluation paths.
+
+Each categorical design attribute is stored as a small integer index into one of the
+vocabularies below. Unknown values are encoded as UNKNOWN_CODE (-1); the lookup tables
+built by build_lookup_table() keep the model's default multiplier in their last slot, so
+indexing with -1 behaves exactly like the dict.get(..., default) calls in the scalar models.
+"""
+from src.LazyImport import lazy_import
+
+np = lazy_import("numpy")
+
+# Category vocabularies (the position in each tuple is the category code)
+MATERIAL_TYPES = ("wood_frame", "steel_frame", "concrete")
+HVAC_TYPES = ("standard", "high_efficiency")
+INSULATION_TYPES = ("standard", "high_efficiency", "passive_house")
+
+UNKNOWN_CODE = -1
+
+
+def encode_categories(values, vocabulary):
+    """
+    Converts category names to integer codes.
+
+    Parameters:
+    - values (iterable): Category names, e.g. ["wood_frame", "concrete"].
+    - vocabulary (tuple): One of the category vocabularies defined in this module.
+
+    Returns:
+    - np.ndarray: int8 codes, UNKNOWN_CODE for names outside the vocabulary.
+    """
+    index = {name: code for code, name in enumerate(vocabulary)}
+    return np.array([index.get(value, UNKNOWN_CODE) for value in values], dtype=np.int8)
+
+
+def decode_category(code, vocabulary):
+    """
+    Converts a single integer code back to its category name.
+
+    Parameters:
+    - code (int): Category code.
+    - vocabulary (tuple): The vocabulary the code was encoded with.
+
+    Returns:
+    - str or None: Category name, or None for UNKNOWN_CODE.
+    """
+    code = int(code)
+    if 0 <= code < len(vocabulary):
+        return vocabulary[code]
+    return None
+
+
+def build_lookup_table(mapping, vocabulary, default):
+    """
+    Resolves a model's multiplier dict into an array indexed by category code.
+
+    Parameters:
+    - mapping (dict): Multiplier dict from a model (e.g. CostEstimator.material_cost).
+    - vocabulary (tuple): Vocabulary the codes are drawn from.
+    - default (float): Value used for unknown categories (stored in the last slot).
+
+    Returns:
+    - np.ndarray: float64 table of length len(vocabulary) + 1.
+    """
+    values = [mapping.get(name, default) for name in vocabulary]
+    values.append(default)
+    return np.array(values, dtype=np.float64)
+
+
+def round_values(values, ndigits):
+    """
+    Rounds every element the same way the builtin round() would.
+
+    np.round scales by 10**ndigits before rounding, which can tip values sitting on a
+    rounding tie the other way; those few elements are re-rounded with the builtin so
+    the batch paths return exactly what the scalar models return.
+
+    Parameters:
+    - values (array-like): Values to round.
+    - ndigits (int): Number of decimal digits to keep.
+
+    Returns:
+    - np.ndarray: Rounded float64 values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    rounded = np.round(scaled) / scale
+
+    # Only values within a few ulps of a .5 tie can disagree with round()
+    fraction = scaled - np.floor(scaled)
+    near_tie = np.abs(fraction - 0.5) <= 8 * np.spacing(np.abs(scaled))
+    if near_tie.any():
+        tie_index = np.flatnonzero(near_tie)
+        rounded[tie_index] = [round(float(value), ndigits) for value in values[tie_index]]
+
+    return rounded
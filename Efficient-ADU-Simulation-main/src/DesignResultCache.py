@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+class DesignResultCache:
+    """
+    This module memoizes per-design model outputs (efficiency, daily energy usage and total
+    cost) so designs that repeat across parcels are looked up instead of recomputed. Entries
+    are keyed on the normalized design tuple plus a model-parameter version, and the least
+    recently used entries are evicted once the cache is full. Only the per-design path of
+    SimulationEngine.run_simulation uses the cache; the vectorized batch paths evaluate a
+    whole table in a few array operations, which is cheaper than hashing each design.
+    """
+
+    def __init__(self, maxsize=100000):
+        """
+        Initializes an empty cache.
+
+        Parameters:
+        - maxsize (int): Maximum number of cached designs.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.fingerprint = None
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def parameter_version(self, fingerprint):
+        """
+        Maps a model-parameter fingerprint to a small integer version. Changing any model
+        multiplier yields a new fingerprint and therefore a new version; only the current
+        fingerprint is remembered and the entries computed under the old one are dropped,
+        so neither stale results nor old fingerprints accumulate.
+
+        Parameters:
+        - fingerprint (tuple): Hashable snapshot of the model parameters.
+
+        Returns:
+        - int: Version number to include in cache keys.
+        """
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.version += 1
+            self.entries.clear()
+        return self.version
+
+    @staticmethod
+    def design_key(design, version):
+        """
+        Builds the cache key for a design dict, applying the same defaults as the models.
+
+        Parameters:
+        - design (dict): ADU design.
+        - version (int): Value returned by parameter_version().
+
+        Returns:
+        - tuple: Cache key.
+        """
+        return (version,
+                design.get("floor_area", 600),
+                design.get("materials", "wood_frame"),
+                design.get("hvac", "standard"),
+                design.get("insulation", "standard"))
+
+    def get(self, key):
+        """
+        Looks up a cached result and marks it as recently used.
+
+        Returns:
+        - tuple or None: The cached value, or None on a miss.
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Stores a result, evicting the least recently used entry if the cache is full.
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Removes every entry and resets the statistics.
+        """
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def cache_info(self):
+        """
+        Returns:
+        - dict: Hit/miss/eviction counts, hit rate, current size and maxsize.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self.entries),
+            "maxsize": self.maxsize
+        }
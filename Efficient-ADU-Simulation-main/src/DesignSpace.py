@@ -0,0 +1,134 @@
+import numpy as np
+from src.CostEstimator import CostEstimator
+from src.EnergyModel import EnergyModel
+from src.DesignBatch import DesignBatch
+from src.DesignCodes import (MATERIAL_TYPES, HVAC_TYPES, INSULATION_TYPES, UNKNOWN_CODE,
+                             encode_categories)
+
+class DesignSpace:
+    """
+    This module describes the full grid of candidate ADU designs (floor areas x materials x
+    HVAC x insulation) without materializing it. Designs are addressed by their flat index
+    into the grid and produced as DesignBatch chunks, either exhaustively, with a stride, by
+    random sampling, or by Latin hypercube sampling.
+    """
+
+    def __init__(self, floor_areas, materials=None, hvac=None, insulation=None):
+        """
+        Initializes the design space.
+
+        Parameters:
+        - floor_areas (array-like): Candidate floor areas, e.g. range(400, 1201, 25).
+        - materials (list): Materials to sweep (default: every key of CostEstimator.material_cost).
+        - hvac (list): HVAC systems to sweep (default: every key of CostEstimator.hvac_cost).
+        - insulation (list): Insulation levels (default: every key of EnergyModel.insulation_efficiency).
+        """
+        if materials is None:
+            materials = list(CostEstimator().material_cost)
+        if hvac is None:
+            hvac = list(CostEstimator().hvac_cost)
+        if insulation is None:
+            insulation = list(EnergyModel().insulation_efficiency)
+
+        self.floor_areas = np.asarray(floor_areas)
+        self.material_codes = self._encode(materials, MATERIAL_TYPES, "material")
+        self.hvac_codes = self._encode(hvac, HVAC_TYPES, "hvac")
+        self.insulation_codes = self._encode(insulation, INSULATION_TYPES, "insulation")
+
+        self.shape = (len(self.floor_areas), len(self.material_codes), len(self.hvac_codes),
+                      len(self.insulation_codes))
+        if 0 in self.shape:
+            raise ValueError("Every design dimension needs at least one option.")
+
+    @staticmethod
+    def _encode(values, vocabulary, label):
+        codes = encode_categories(values, vocabulary)
+        if np.any(codes == UNKNOWN_CODE):
+            unknown = [value for value, code in zip(values, codes) if code == UNKNOWN_CODE]
+            raise ValueError(f"Unknown {label} option(s): {unknown}")
+        return codes
+
+    def __len__(self):
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def designs_at(self, indices):
+        """
+        Builds the designs at the given flat grid indices.
+
+        Parameters:
+        - indices (array-like): Flat indices in [0, len(self)).
+
+        Returns:
+        - DesignBatch: One design per index, in the same order.
+        """
+        area_index, material_index, hvac_index, insulation_index = np.unravel_index(
+            np.asarray(indices, dtype=np.int64), self.shape)
+        return DesignBatch(self.floor_areas[area_index], self.material_codes[material_index],
+                           self.hvac_codes[hvac_index], self.insulation_codes[insulation_index])
+
+    def iter_chunks(self, chunk_size=100000, step=1, start=0):
+        """
+        Enumerates the grid lazily, optionally keeping only every step-th design.
+
+        Parameters:
+        - chunk_size (int): Maximum number of designs per yielded batch.
+        - step (int): Stride through the flat grid (1 enumerates everything).
+        - start (int): First flat index.
+
+        Yields:
+        - DesignBatch: Consecutive chunks of the (strided) grid.
+        """
+        if chunk_size < 1 or step < 1:
+            raise ValueError("chunk_size and step must be at least 1.")
+
+        total = len(self)
+        span = chunk_size * step
+        for chunk_start in range(start, total, span):
+            yield self.designs_at(np.arange(chunk_start, min(chunk_start + span, total), step))
+
+    def sample_random(self, count, seed=None, replace=False):
+        """
+        Draws designs uniformly at random from the grid.
+
+        Parameters:
+        - count (int): Number of designs to draw.
+        - seed (int): Seed for reproducible samples.
+        - replace (bool): Allow the same design to be drawn more than once.
+
+        Returns:
+        - DesignBatch: The sampled designs.
+        """
+        rng = np.random.default_rng(seed)
+        return self.designs_at(rng.choice(len(self), size=count, replace=replace))
+
+    def sample_latin_hypercube(self, count, seed=None):
+        """
+        Draws a Latin hypercube sample: every dimension is split into count equal strata and
+        each stratum is used exactly once, so all floor areas and categories are covered
+        evenly even for small samples.
+
+        Parameters:
+        - count (int): Number of designs to draw.
+        - seed (int): Seed for reproducible samples.
+
+        Returns:
+        - DesignBatch: The sampled designs.
+        """
+        rng = np.random.default_rng(seed)
+        dimension_indices = []
+        for size in self.shape:
+            strata = (rng.permutation(count) + rng.random(count)) / count
+            dimension_indices.append(np.minimum((strata * size).astype(np.int64), size - 1))
+
+        flat_indices = np.ravel_multi_index(dimension_indices, self.shape)
+        return self.designs_at(flat_indices)
+
+# Example usage
+if __name__ == "__main__":
+    design_space = DesignSpace(range(400, 1201, 25))
+    print(f"Design space size: {len(design_space)}")
+
+    for batch in design_space.iter_chunks(chunk_size=200, step=3):
+        print(f"Strided chunk of {len(batch)} designs, first: {batch[0]}")
+
+    print(f"Latin hypercube sample: {design_space.sample_latin_hypercube(5, seed=1).to_dicts()}")
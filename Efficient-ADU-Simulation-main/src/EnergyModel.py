@@ -1,3 +1,9 @@
+from src.LazyImport import lazy_import
+from src.DesignCodes import MATERIAL_TYPES, HVAC_TYPES, INSULATION_TYPES, build_lookup_table, round_values
+from src.DesignBatch import DesignBatch
+
+np = lazy_import("numpy")
+
 class EnergyModel:
     """
     This module computes the energy efficiency of an ADU based on its materials, insulation,
@@ -28,16 +34,43 @@ class EnergyModel:
             "passive_house": 0.70
         }
 
+        # Hourly load model: weather-driven heating/cooling on top of the flat daily base load
+        self.heating_balance_point = 18.0  # Degrees C below which heating is needed
+        self.cooling_balance_point = 24.0  # Degrees C above which cooling is needed
+        self.heating_coefficient = 0.04  # Relative extra load per heating degree-hour
+        self.cooling_coefficient = 0.05  # Relative extra load per cooling degree-hour
+        self.solar_gain_coefficient = 0.0002  # Relative load offset per W/m^2 of irradiance
+
+    def parameter_fingerprint(self):
+        """
+        Returns a hashable snapshot of every parameter that affects this model's outputs.
+
+        Returns:
+        - tuple: Changes whenever a base value, multiplier or hourly-model parameter is changed.
+        """
+        return (self.base_energy_per_sqft,
+                tuple(self.material_efficiency.items()),
+                tuple(self.hvac_efficiency.items()),
+                tuple(self.insulation_efficiency.items()),
+                self.heating_balance_point,
+                self.cooling_balance_point,
+                self.heating_coefficient,
+                self.cooling_coefficient,
+                self.solar_gain_coefficient)
+
     def compute_efficiency(self, design):
         """
         Computes the energy efficiency of an ADU based on its design parameters.
 
         Parameters:
-        - design (dict): ADU design details including floor area, materials, HVAC, and insulation.
+        - design (dict or DesignBatch): ADU design details including floor area, materials, HVAC, and insulation.
 
         Returns:
-        - float: An energy efficiency score between 0 and 1.
+        - float: An energy efficiency score between 0 and 1 (an array of scores for a DesignBatch).
         """
+        if isinstance(design, DesignBatch):
+            return self.compute_efficiency_batch(design.materials, design.hvac, design.insulation)
+
         floor_area = design.get("floor_area", 600)  # Default 600 sq. ft.
         material = design.get("materials", "wood_frame")
         hvac = design.get("hvac", "standard")
@@ -61,11 +94,14 @@ class EnergyModel:
         Estimates the daily energy consumption of an ADU.
 
         Parameters:
-        - design (dict): ADU design details including floor area, materials, HVAC, and insulation.
+        - design (dict or DesignBatch): ADU design details including floor area, materials, HVAC, and insulation.
 
         Returns:
-        - float: Estimated energy usage in kWh per day.
+        - float: Estimated energy usage in kWh per day (an array for a DesignBatch).
         """
+        if isinstance(design, DesignBatch):
+            return self.estimate_daily_energy_usage_batch(design.floor_area, design.insulation)
+
         floor_area = design.get("floor_area", 600)  # Default 600 sq. ft.
         insulation = design.get("insulation", "standard")
 
@@ -76,6 +112,121 @@ class EnergyModel:
         daily_energy_usage = self.base_energy_per_sqft * floor_area * insulation_multiplier
         return round(daily_energy_usage, 2)
 
+    def compute_efficiency_batch(self, materials, hvac, insulation):
+        """
+        Computes energy efficiency scores for a batch of designs in a few array operations.
+
+        Parameters:
+        - materials (np.ndarray): Material codes (see DesignCodes.MATERIAL_TYPES).
+        - hvac (np.ndarray): HVAC codes (see DesignCodes.HVAC_TYPES).
+        - insulation (np.ndarray): Insulation codes (see DesignCodes.INSULATION_TYPES).
+
+        Returns:
+        - np.ndarray: Efficiency scores, identical to compute_efficiency() per design.
+        """
+        material_scores = build_lookup_table(self.material_efficiency, MATERIAL_TYPES, 0.75)[materials]
+        hvac_scores = build_lookup_table(self.hvac_efficiency, HVAC_TYPES, 0.70)[hvac]
+        insulation_multipliers = build_lookup_table(self.insulation_efficiency, INSULATION_TYPES, 1.0)[insulation]
+
+        efficiency_scores = (material_scores + hvac_scores) / 2
+        efficiency_scores *= insulation_multipliers
+
+        return round_values(efficiency_scores, 2)
+
+    def estimate_daily_energy_usage_batch(self, floor_area, insulation):
+        """
+        Estimates daily energy consumption for a batch of designs.
+
+        Parameters:
+        - floor_area (np.ndarray): Floor areas in square feet.
+        - insulation (np.ndarray): Insulation codes (see DesignCodes.INSULATION_TYPES).
+
+        Returns:
+        - np.ndarray: Energy usage in kWh per day, identical to estimate_daily_energy_usage().
+        """
+        insulation_multipliers = build_lookup_table(self.insulation_efficiency, INSULATION_TYPES, 1.0)[insulation]
+
+        daily_energy_usage = self.base_energy_per_sqft * np.asarray(floor_area, dtype=np.float64) * insulation_multipliers
+        return round_values(daily_energy_usage, 2)
+
+    def weather_load_factors(self, weather):
+        """
+        Converts a weather series into a dimensionless hourly thermal load factor.
+
+        Parameters:
+        - weather (WeatherData): Hourly temperature and irradiance.
+
+        Returns:
+        - np.ndarray: Per-hour factor (heating + cooling degree terms minus solar gains).
+        """
+        heating = np.clip(self.heating_balance_point - weather.temperature, 0, None)
+        cooling = np.clip(weather.temperature - self.cooling_balance_point, 0, None)
+        return (self.heating_coefficient * heating
+                + self.cooling_coefficient * cooling
+                - self.solar_gain_coefficient * weather.irradiance)
+
+    def iter_hourly_energy_usage(self, designs, weather, chunk_size=4096, dtype="float32"):
+        """
+        Computes hourly energy loads chunk by chunk. Each design's base load is the flat
+        daily estimate spread over 24 hours; the weather factor is scaled by how sensitive
+        the design is to outdoor conditions, (1 - material efficiency) / HVAC efficiency,
+        using the same material, HVAC and insulation tables as the daily model.
+
+        Parameters:
+        - designs (DesignBatch or list): Designs to simulate.
+        - weather (WeatherData): Hourly weather series (normally 8760 hours).
+        - chunk_size (int): Designs per yielded block.
+        - dtype (np.dtype): Output dtype (float32 halves the memory of float64).
+
+        Yields:
+        - tuple: (first design index, (chunk designs x hours) array of kWh per hour).
+        """
+        if not isinstance(designs, DesignBatch):
+            designs = DesignBatch.from_dicts(designs)
+
+        material_scores = build_lookup_table(self.material_efficiency, MATERIAL_TYPES, 0.75)
+        hvac_scores = build_lookup_table(self.hvac_efficiency, HVAC_TYPES, 0.70)
+        insulation_multipliers = build_lookup_table(self.insulation_efficiency, INSULATION_TYPES, 1.0)
+        load_factors = self.weather_load_factors(weather)[None, :]
+
+        for start in range(0, len(designs), chunk_size):
+            chunk = designs[start:start + chunk_size]
+            base_hourly = (self.base_energy_per_sqft * chunk.floor_area.astype(np.float64)
+                           * insulation_multipliers[chunk.insulation] / 24)
+            sensitivity = (1 - material_scores[chunk.materials]) / hvac_scores[chunk.hvac]
+
+            hourly = base_hourly[:, None] * (1 + sensitivity[:, None] * load_factors)
+            yield start, np.clip(hourly, 0, None).astype(dtype, copy=False)
+
+    def estimate_hourly_energy_usage(self, designs, weather, out=None, chunk_size=4096, dtype="float32"):
+        """
+        Computes the (designs x hours) hourly energy load matrix for a batch of designs.
+
+        Parameters:
+        - designs (DesignBatch or list): Designs to simulate.
+        - weather (WeatherData): Hourly weather series.
+        - out (str or np.ndarray): Optional .npy path (written as a memory-mapped file, so
+          the matrix never has to fit in RAM) or a preallocated array.
+        - chunk_size (int): Designs computed per step.
+        - dtype (np.dtype): Output dtype.
+
+        Returns:
+        - np.ndarray: kWh per hour for each design (a np.memmap when out is a path).
+        """
+        design_count = len(designs)
+        shape = (design_count, len(weather))
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif isinstance(out, str):
+            out = np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=shape)
+
+        for start, block in self.iter_hourly_energy_usage(designs, weather, chunk_size, dtype):
+            out[start:start + len(block)] = block
+
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
 # Example usage
 if __name__ == "__main__":
     energy_model = EnergyModel()
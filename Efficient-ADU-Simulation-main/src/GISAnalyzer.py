@@ -1,26 +1,136 @@
+import logging
+from collections import Counter
+from functools import lru_cache
+from src.LazyImport import lazy_import
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+# Rejection reason codes returned by check_zoning_constraints() and screen_parcels()
+ZONING_APPROVED = 0
+LOT_TOO_SMALL = 1
+SLOPE_TOO_STEEP = 2
+FLOOD_ZONE = 3
+ZONING_NONCOMPLIANT = 4
+SETBACK_VIOLATION = 5
+FLOOR_AREA_EXCEEDED = 6
+
+REJECTION_REASONS = {
+    LOT_TOO_SMALL: "Lot size is too small for ADU placement.",
+    SLOPE_TOO_STEEP: "Slope exceeds the allowable limit for ADU construction.",
+    FLOOD_ZONE: "Property is located in a restricted flood zone.",
+    ZONING_NONCOMPLIANT: "Property is not compliant with zoning laws.",
+    SETBACK_VIOLATION: "Setbacks leave too little buildable area for the ADU.",
+    FLOOR_AREA_EXCEEDED: "ADU floor area exceeds the limit allowed for the lot."
+}
+
+# Default zoning rules; the single source for GISAnalyzer, PropertyModel and the
+# per-jurisdiction rule sets in ZoningRuleEngine (which fill missing keys from here)
+DEFAULT_ZONING_RULES = {
+    "minimum_lot_size": 4000,  # Minimum lot size in square feet for ADU approval
+    "max_slope": 15,  # Maximum slope (degrees) for ADU construction
+    "flood_zone_restriction": True,  # Flag to reject ADUs in flood zones
+    "setbacks": {"front": 0, "rear": 0, "side": 0},  # Feet from each lot line
+    "max_adu_floor_area_ratio": None,  # Max ADU floor area as a share of the lot size
+    "max_adu_floor_area": None  # Absolute max ADU floor area (sq. ft.)
+}
+
+@lru_cache(maxsize=None)
+def _sun_geometry():
+    """
+    Sun geometry shared by every latitude band (computed on first use): solar declination
+    per day of the year, hour angle at the middle of each solar hour, and extraterrestrial
+    irradiance in W/m^2 per day.
+    """
+    days = np.arange(1, 366)
+    declination = np.radians(23.45) * np.sin(2 * np.pi * (284 + days) / 365)
+    hour_angle = np.radians(15.0 * (np.arange(24) + 0.5 - 12))
+    extraterrestrial = 1367.0 * (1 + 0.033 * np.cos(2 * np.pi * days / 365))
+    return declination, hour_angle, extraterrestrial
+
+
 class GISAnalyzer:
     """
     This module analyzes zoning constraints and environmental factors to determine 
     whether an ADU can be placed on a property.
     """
 
+    # Annual clear-sky insolation per latitude band, shared by all instances (see
+    # sun_position_table); filled lazily so each band's trig is done once per process
+    _insolation_by_band = {}
+    latitude_band_width = 0.5  # Degrees
+
     def __init__(self):
         # Example zoning constraints (modifiable for real-world data)
         self.zoning_restrictions = {
-            "minimum_lot_size": 4000,  # Minimum lot size in square feet for ADU approval
-            "max_slope": 15,  # Maximum slope (degrees) for ADU construction
-            "flood_zone_restriction": True  # Flag to reject ADUs in flood zones
+            "minimum_lot_size": DEFAULT_ZONING_RULES["minimum_lot_size"],
+            "max_slope": DEFAULT_ZONING_RULES["max_slope"],
+            "flood_zone_restriction": DEFAULT_ZONING_RULES["flood_zone_restriction"]
         }
 
-    def analyze_zoning_constraints(self, property_data):
+        # Share of clear-sky irradiance reaching the ground on average (clouds, haze)
+        self.sky_clearness = 0.75
+
+        # Aggregated rejection counts per reason code (see get_rejection_counts)
+        self.rejection_counts = Counter()
+
+        # Optional PolygonOverlay layers that replace the per-property zoning_compliance
+        # flag for properties with coordinates (see set_overlays)
+        self.flood_zones = None
+        self.zoning_districts = None
+
+    def set_overlays(self, flood_zones=None, zoning_districts=None):
         """
-        Checks if the property meets zoning requirements.
+        Sets the polygon layers used to derive zoning compliance from parcel coordinates.
+
+        Parameters:
+        - flood_zones (PolygonOverlay): Flood-zone polygons.
+        - zoning_districts (PolygonOverlay): Zoning-district polygons.
+        """
+        self.flood_zones = flood_zones
+        self.zoning_districts = zoning_districts
+
+    def overlay_fingerprint(self):
+        """
+        Returns:
+        - tuple: Fingerprints of the configured overlays (None where unset).
+        """
+        return tuple(overlay.fingerprint() if overlay is not None else None
+                     for overlay in (self.flood_zones, self.zoning_districts))
+
+    def resolve_zoning_compliance(self, property_data):
+        """
+        Replaces the property's zoning_compliance flag with the one derived from the
+        configured overlays (see derive_zoning_compliance), when overlays are set and the
+        property has a latitude and longitude.
+
+        Parameters:
+        - property_data (dict): Information about the property.
+
+        Returns:
+        - dict: property_data itself if nothing is derived, otherwise an updated copy.
+        """
+        if self.flood_zones is None and self.zoning_districts is None:
+            return property_data
+        if property_data.get("latitude") is None or property_data.get("longitude") is None:
+            return property_data
+
+        compliance, _ = self.derive_zoning_compliance(latitudes=[property_data["latitude"]],
+                                                      longitudes=[property_data["longitude"]],
+                                                      flood_zones=self.flood_zones,
+                                                      zoning_districts=self.zoning_districts)
+        return {**property_data, "zoning_compliance": bool(compliance[0])}
+
+    def check_zoning_constraints(self, property_data):
+        """
+        Checks the property against the zoning requirements without logging or counting.
 
         Parameters:
         - property_data (dict): Contains details about property size, slope, and zoning compliance.
 
         Returns:
-        - bool: True if ADU placement is allowed, False otherwise.
+        - int: ZONING_APPROVED, or the reason code of the first failed check.
         """
         lot_size = property_data.get("size", 0)
         slope = property_data.get("slope", 0)
@@ -28,21 +138,118 @@ class GISAnalyzer:
 
         # Check lot size
         if lot_size < self.zoning_restrictions["minimum_lot_size"]:
-            print("Zoning Restriction: Lot size is too small for ADU placement.")
-            return False
+            return LOT_TOO_SMALL
 
         # Check slope restriction
         if slope > self.zoning_restrictions["max_slope"]:
-            print("Zoning Restriction: Slope exceeds the allowable limit for ADU construction.")
-            return False
+            return SLOPE_TOO_STEEP
 
         # Check flood zone restrictions
         if self.zoning_restrictions["flood_zone_restriction"] and not zoning_compliance:
-            print("Zoning Restriction: Property is located in a restricted flood zone.")
+            return FLOOD_ZONE
+
+        return ZONING_APPROVED
+
+    def analyze_zoning_constraints(self, property_data):
+        """
+        Checks if the property meets zoning requirements.
+
+        Parameters:
+        - property_data (dict): Contains details about property size, slope, and zoning compliance.
+
+        Returns:
+        - bool: True if ADU placement is allowed, False otherwise.
+        """
+        reason = self.check_zoning_constraints(property_data)
+        if reason != ZONING_APPROVED:
+            self.rejection_counts[reason] += 1
+            logger.info("Zoning Restriction: %s", REJECTION_REASONS[reason])
             return False
 
         return True
 
+    def screen_parcels(self, lot_sizes, slopes, zoning_compliance=None):
+        """
+        Applies the zoning checks of analyze_zoning_constraints() to many parcels at once,
+        without writing anything to stdout.
+
+        Parameters:
+        - lot_sizes (array-like): Lot sizes in square feet.
+        - slopes (array-like): Slopes in degrees.
+        - zoning_compliance (array-like): Flood-zone compliance flags (default: all compliant).
+
+        Returns:
+        - tuple: (np.ndarray of bool, True where ADU placement is allowed;
+                  np.ndarray of int8 reason codes, ZONING_APPROVED or the first failed check).
+        """
+        lot_sizes = np.asarray(lot_sizes)
+        slopes = np.asarray(slopes)
+        if zoning_compliance is None:
+            zoning_compliance = np.ones(len(lot_sizes), dtype=bool)
+        zoning_compliance = np.asarray(zoning_compliance, dtype=bool)
+
+        reasons = np.full(len(lot_sizes), ZONING_APPROVED, dtype=np.int8)
+
+        # Assign in reverse check order so the first failing check wins, as in the scalar path
+        if self.zoning_restrictions["flood_zone_restriction"]:
+            reasons[~zoning_compliance] = FLOOD_ZONE
+        reasons[slopes > self.zoning_restrictions["max_slope"]] = SLOPE_TOO_STEEP
+        reasons[lot_sizes < self.zoning_restrictions["minimum_lot_size"]] = LOT_TOO_SMALL
+
+        for reason, count in enumerate(np.bincount(reasons, minlength=len(REJECTION_REASONS) + 1)):
+            if reason != ZONING_APPROVED and count:
+                self.rejection_counts[reason] += int(count)
+
+        return reasons == ZONING_APPROVED, reasons
+
+    def get_rejection_counts(self, reset=False):
+        """
+        Returns how often each zoning check rejected a property.
+
+        Parameters:
+        - reset (bool): Clear the counters afterwards (e.g. at the end of a run).
+
+        Returns:
+        - dict: Rejection message to count.
+        """
+        counts = {REJECTION_REASONS[reason]: count for reason, count in sorted(self.rejection_counts.items())}
+        if reset:
+            self.rejection_counts.clear()
+        return counts
+
+    def derive_zoning_compliance(self, *, latitudes, longitudes, flood_zones=None, zoning_districts=None):
+        """
+        Derives the zoning_compliance flag from polygon overlays instead of trusting the
+        input data: a parcel complies when its centroid is outside every flood-zone polygon
+        and, if districts are given, inside a district that allows ADUs (a district allows
+        them unless its properties set "adu_allowed" to false). The arguments are
+        keyword-only because PolygonOverlay takes (longitudes, latitudes) while the rest of
+        this module uses (latitude, longitude).
+
+        Parameters:
+        - latitudes, longitudes (array-like): Parcel centroids in degrees.
+        - flood_zones (PolygonOverlay): Optional flood-zone polygons.
+        - zoning_districts (PolygonOverlay): Optional zoning-district polygons.
+
+        Returns:
+        - tuple: (np.ndarray of bool compliance flags, np.ndarray of district indices, -1 if
+          outside every district or no districts were given).
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        compliance = np.ones(len(latitudes), dtype=bool)
+        if flood_zones is not None:
+            compliance &= ~flood_zones.contains(longitudes, latitudes)
+        districts = np.full(len(compliance), -1, dtype=np.int64)
+
+        if zoning_districts is not None:
+            districts = zoning_districts.locate(longitudes, latitudes)
+            allows_adu = np.array([bool(properties.get("adu_allowed", True))
+                                   for properties in zoning_districts.properties] + [False])
+            compliance &= allows_adu[districts]
+
+        return compliance, districts
+
     def evaluate_sunlight_exposure(self, property_data):
         """
         Estimates sunlight exposure based on geospatial data.
@@ -65,8 +272,89 @@ class GISAnalyzer:
         else:
             return "High"
 
+    @staticmethod
+    def sun_position_table(latitude):
+        """
+        Computes the cosine of the solar zenith angle for every hour of the year.
+
+        Parameters:
+        - latitude (float): Latitude in degrees.
+
+        Returns:
+        - np.ndarray: (365 days x 24 solar hours) cos(zenith), 0 when the sun is down.
+        """
+        declination, hour_angle, _ = _sun_geometry()
+        phi = np.radians(latitude)
+        cos_zenith = (np.sin(phi) * np.sin(declination)[:, None]
+                      + np.cos(phi) * np.cos(declination)[:, None] * np.cos(hour_angle)[None, :])
+        return np.clip(cos_zenith, 0, None)
+
+    @classmethod
+    def _band_insolation(cls, band):
+        """
+        Returns the annual clear-sky horizontal insolation (kWh/m^2) at the centre of a
+        latitude band, computing and caching it on first use.
+        """
+        insolation = cls._insolation_by_band.get(band)
+        if insolation is None:
+            latitude = -90 + (band + 0.5) * cls.latitude_band_width
+            cos_zenith = cls.sun_position_table(latitude)
+
+            # Beam attenuation by air mass (Meinel model) plus ~10% diffuse sky radiation
+            daylight = cos_zenith > 0.01
+            air_mass = 1 / np.where(daylight, cos_zenith, 1)
+            beam = _sun_geometry()[2][:, None] * 0.7 ** (air_mass ** 0.678)
+            irradiance = np.where(daylight, 1.1 * beam * cos_zenith, 0)
+
+            insolation = float(irradiance.sum()) / 1000
+            cls._insolation_by_band[band] = insolation
+        return insolation
+
+    def estimate_annual_insolation_batch(self, latitudes, tree_cover=None):
+        """
+        Estimates annual solar insolation for many parcels: a cached per-band table lookup
+        plus a vector multiply for tree-cover shading. Longitude does not change annual
+        totals (it only shifts clock time), so it is not needed.
+
+        Parameters:
+        - latitudes (array-like): Parcel latitudes in degrees.
+        - tree_cover (array-like): Tree cover percentages (default: 20% shade).
+
+        Returns:
+        - np.ndarray: Annual insolation in kWh/m^2 reaching each parcel.
+        """
+        latitudes = np.clip(np.asarray(latitudes, dtype=np.float64), -90, 90)
+        if tree_cover is None:
+            tree_cover = np.full(len(latitudes), 20.0)
+        tree_cover = np.clip(np.asarray(tree_cover, dtype=np.float64), 0, 100)
+
+        band_count = int(round(180 / self.latitude_band_width))
+        bands = np.minimum(((latitudes + 90) / self.latitude_band_width).astype(np.int64), band_count - 1)
+
+        unique_bands, inverse = np.unique(bands, return_inverse=True)
+        band_insolation = np.array([self._band_insolation(int(band)) for band in unique_bands])
+
+        return band_insolation[inverse.reshape(-1)] * self.sky_clearness * (1 - tree_cover / 100)
+
+    def estimate_annual_insolation(self, property_data):
+        """
+        Estimates the annual solar insolation reaching a property from the sun position at
+        its latitude, attenuated by tree cover.
+
+        Parameters:
+        - property_data (dict): Contains latitude and tree cover percentage.
+
+        Returns:
+        - float: Annual insolation in kWh/m^2.
+        """
+        latitude = property_data.get("latitude", 34.0)  # Default: Georgia, USA
+        tree_cover_percentage = property_data.get("tree_cover", 20)  # Default 20% shade
+        return float(self.estimate_annual_insolation_batch([latitude], [tree_cover_percentage])[0])
+
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     gis_analyzer = GISAnalyzer()
 
     # Sample property data
@@ -86,3 +374,6 @@ if __name__ == "__main__":
     # Run sunlight exposure analysis
     sunlight_exposure = gis_analyzer.evaluate_sunlight_exposure(property_data)
     print(f"Sunlight Exposure: {sunlight_exposure}")
+
+    annual_insolation = gis_analyzer.estimate_annual_insolation(property_data)
+    print(f"Annual Insolation: {annual_insolation:,.0f} kWh/m^2")
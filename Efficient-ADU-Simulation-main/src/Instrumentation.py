@@ -0,0 +1,221 @@
+import json
+import time
+
+class _Stage:
+    """
+    Context manager timing one execution of a stage.
+    """
+    __slots__ = ("stats", "items", "wall_start", "cpu_start")
+
+    def __init__(self, stats, items):
+        self.stats = stats
+        self.items = items
+
+    def __enter__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        stats = self.stats
+        stats["wall_seconds"] += time.perf_counter() - self.wall_start
+        stats["cpu_seconds"] += time.process_time() - self.cpu_start
+        stats["calls"] += 1
+        stats["items"] += self.items
+        return False
+
+
+class _NullContext:
+    """
+    Shared do-nothing context manager used when instrumentation is disabled.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class Instrumentation:
+    """
+    This module collects per-stage timing for the SimulationEngine: wall-clock and CPU time,
+    call counts and items per second for every named stage (property validation, GIS checks,
+    design evaluation, optimization). It can additionally profile one run with cProfile or
+    tracemalloc. The report is returned alongside the simulation results and can be exported
+    as JSON.
+    """
+
+    enabled = True
+
+    def __init__(self, profile=None, profile_limit=25):
+        """
+        Initializes empty stage statistics.
+
+        Parameters:
+        - profile (str): "cprofile" or "tracemalloc" to profile the next run (default: none).
+        - profile_limit (int): Number of functions / allocation sites kept in the profile.
+        """
+        if profile not in (None, "cprofile", "tracemalloc"):
+            raise ValueError(f"Unknown profiler: {profile}")
+
+        self.profile = profile
+        self.profile_limit = profile_limit
+        self.profile_result = None
+        self.stages = {}
+
+    def stage(self, name, items=0):
+        """
+        Times one execution of a stage.
+
+        Parameters:
+        - name (str): Stage name.
+        - items (int): Number of items (designs, parcels) processed in this execution.
+
+        Returns:
+        - context manager: Use as `with instrumentation.stage("optimization", len(designs)):`.
+        """
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "items": 0}
+        return _Stage(stats, items)
+
+    def profiled(self):
+        """
+        Wraps one run with the configured profiler. Only the first run after construction
+        (or reset()) is profiled, so the profiler overhead is paid once.
+
+        Returns:
+        - context manager: Profiles the enclosed block, if a profile is still pending.
+        """
+        if self.profile is None or self.profile_result is not None:
+            return _NULL_CONTEXT
+        if self.profile == "cprofile":
+            return _CProfileRun(self)
+        return _TracemallocRun(self)
+
+    def report(self):
+        """
+        Returns:
+        - dict: "stages" maps each stage name to calls, wall_seconds, cpu_seconds, items and
+          items_per_second (by wall time); "profile" holds the profile of the profiled run.
+        """
+        stages = {}
+        for name, stats in self.stages.items():
+            wall_seconds = stats["wall_seconds"]
+            stages[name] = {**stats, "items_per_second": stats["items"] / wall_seconds if wall_seconds > 0 else None}
+        return {"stages": stages, "profile": self.profile_result}
+
+    def to_json(self, path=None):
+        """
+        Exports the report as JSON.
+
+        Parameters:
+        - path (str): File to write (default: only return the JSON text).
+
+        Returns:
+        - str: The JSON document.
+        """
+        document = json.dumps(self.report(), indent=2)
+        if path is not None:
+            with open(path, "w") as json_file:
+                json_file.write(document)
+        return document
+
+    def reset(self):
+        """
+        Clears the statistics; a configured profile is taken again on the next run.
+        """
+        self.stages = {}
+        self.profile_result = None
+
+
+class NullInstrumentation:
+    """
+    Disabled instrumentation: every stage is the same shared no-op context manager, so the
+    engine's timing hooks cost a method call per stage and nothing per design.
+    """
+
+    enabled = False
+    profile = None
+
+    def stage(self, name, items=0):
+        return _NULL_CONTEXT
+
+    def profiled(self):
+        return _NULL_CONTEXT
+
+    def report(self):
+        return {"stages": {}, "profile": None}
+
+    def reset(self):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class _CProfileRun:
+    def __init__(self, instrumentation):
+        import cProfile
+        self.instrumentation = instrumentation
+        self.profiler = cProfile.Profile()
+
+    def __enter__(self):
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        import pstats
+        self.profiler.disable()
+        stats = pstats.Stats(self.profiler).stats
+
+        functions = []
+        for (filename, line, function), (_, calls, total_time, cumulative_time, _) in stats.items():
+            functions.append({"function": f"{filename}:{line}({function})", "calls": calls,
+                              "total_seconds": total_time, "cumulative_seconds": cumulative_time})
+        functions.sort(key=lambda entry: entry["cumulative_seconds"], reverse=True)
+        self.instrumentation.profile_result = {"type": "cprofile",
+                                               "functions": functions[:self.instrumentation.profile_limit]}
+        return False
+
+
+class _TracemallocRun:
+    def __init__(self, instrumentation):
+        import tracemalloc
+        self.tracemalloc = tracemalloc
+        self.instrumentation = instrumentation
+        self.was_tracing = tracemalloc.is_tracing()
+
+    def __enter__(self):
+        if not self.was_tracing:
+            self.tracemalloc.start()
+        self.tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        snapshot = self.tracemalloc.take_snapshot()
+        current_bytes, peak_bytes = self.tracemalloc.get_traced_memory()
+        if not self.was_tracing:
+            self.tracemalloc.stop()
+
+        allocations = [{"location": str(statistic.traceback[0]), "size_bytes": statistic.size,
+                        "count": statistic.count}
+                       for statistic in snapshot.statistics("lineno")[:self.instrumentation.profile_limit]]
+        self.instrumentation.profile_result = {"type": "tracemalloc", "current_bytes": current_bytes,
+                                               "peak_bytes": peak_bytes, "allocations": allocations}
+        return False
+
+# Example usage
+if __name__ == "__main__":
+    instrumentation = Instrumentation(profile="cprofile", profile_limit=5)
+
+    with instrumentation.profiled():
+        with instrumentation.stage("design_evaluation", items=100000):
+            total = sum(i * i for i in range(100000))
+
+    print(instrumentation.to_json())
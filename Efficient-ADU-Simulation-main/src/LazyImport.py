@@ -0,0 +1,42 @@
+import importlib.util
+import sys
+
+# Module name -> class of the placeholder module created by lazy_import(); LazyLoader swaps
+# the class for a regular module type once the module's code has run
+_LAZY_MODULES = {}
+
+def lazy_import(name):
+    """
+    Imports a module lazily: the module object is returned at once, but its code only runs
+    on first attribute access. Entry points that never touch the module (e.g. a scalar
+    simulate-only run that never needs NumPy) therefore do not pay its import time.
+
+    Parameters:
+    - name (str): Module name, e.g. "numpy".
+
+    Returns:
+    - module: The (possibly not yet loaded) module.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    _LAZY_MODULES[name] = type(module)
+    return module
+
+
+def is_loaded(name):
+    """
+    Returns:
+    - bool: True if the module has been imported and its code has actually run.
+    """
+    module = sys.modules.get(name)
+    return module is not None and type(module) is not _LAZY_MODULES.get(name)
@@ -0,0 +1,307 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.CostEstimator import CostEstimator
+from src.EnergyModel import EnergyModel
+from src.DesignBatch import DesignBatch
+from src.DesignCodes import MATERIAL_TYPES, HVAC_TYPES, INSULATION_TYPES
+
+# Per-process state, set up once by _init_worker
+_worker_engine = None
+_worker_designs = None
+
+
+def _init_worker(engine, designs):
+    global _worker_engine, _worker_designs
+    _worker_engine = engine
+    _worker_designs = designs
+
+
+def _run_block(seed_sequence, sample_count, bins):
+    return _worker_engine._histogram_block(_worker_designs, seed_sequence, sample_count, bins)
+
+
+class MonteCarloEngine:
+    """
+    This module propagates uncertainty in the CostEstimator and EnergyModel parameters to
+    probabilistic estimates (e.g. P10/P50/P90 cost) per design. Every parameter follows a
+    triangular (low, mode, high) distribution; each block of parameter samples is evaluated
+    against the designs as (designs x samples) matrices of at most block_cells cells and
+    folded into fixed-size per-design histograms, so memory is O(designs x bins) rather
+    than O(designs x samples): it does not grow with the number of samples. It still grows
+    linearly with the number of designs (3 metrics x bins int64 counts per design; the
+    default bins shrink from 512 to 32 as the catalog grows, about 0.8 KB per design at
+    the floor).
+    """
+
+    # Result metrics, each summarized by a per-design histogram
+    metrics = ("total_cost", "daily_energy_usage", "efficiency_score")
+
+    # Upper bound on the (designs x samples) cells evaluated at once; larger catalogs are
+    # split into design chunks instead of shrinking the sample blocks
+    block_cells = 500_000
+
+    # Histogram cells per metric used to pick the default resolution (bins=None)
+    histogram_cells = 4_000_000
+
+    # Relative half-width of the default triangular distributions around the model values
+    default_spreads = {
+        "base_cost_per_sqft": 0.20,
+        "labor_cost_per_sqft": 0.25,
+        "material_cost": 0.10,
+        "hvac_cost": 0.05,
+        "base_energy_per_sqft": 0.15,
+        "material_efficiency": 0.05,
+        "hvac_efficiency": 0.05,
+        "insulation_efficiency": 0.10
+    }
+
+    def __init__(self, cost_estimator=None, energy_model=None, distributions=None, bins=None):
+        """
+        Initializes the engine.
+
+        Parameters:
+        - cost_estimator (CostEstimator): Model providing the central parameter values.
+        - energy_model (EnergyModel): Model providing the central parameter values.
+        - distributions (dict): Overrides for the default distributions. Scalar parameters map
+          to a (low, mode, high) tuple; multiplier tables map category names to such tuples.
+        - bins (int): Histogram resolution per design; quantiles are accurate to within
+          (max - min) / bins of each design's possible range. None picks 512 bins, reduced
+          for large catalogs (down to 32) so each metric's histograms stay within
+          histogram_cells cells.
+        """
+        cost_estimator = cost_estimator or CostEstimator()
+        energy_model = energy_model or EnergyModel()
+
+        def triangular(value, spread):
+            return (value * (1 - spread), value, value * (1 + spread))
+
+        spreads = self.default_spreads
+        self.distributions = {
+            "base_cost_per_sqft": triangular(cost_estimator.base_cost_per_sqft, spreads["base_cost_per_sqft"]),
+            "labor_cost_per_sqft": triangular(cost_estimator.labor_cost_per_sqft, spreads["labor_cost_per_sqft"]),
+            "material_cost": {name: triangular(value, spreads["material_cost"])
+                              for name, value in cost_estimator.material_cost.items()},
+            "hvac_cost": {name: triangular(value, spreads["hvac_cost"])
+                          for name, value in cost_estimator.hvac_cost.items()},
+            "base_energy_per_sqft": triangular(energy_model.base_energy_per_sqft, spreads["base_energy_per_sqft"]),
+            "material_efficiency": {name: triangular(value, spreads["material_efficiency"])
+                                    for name, value in energy_model.material_efficiency.items()},
+            "hvac_efficiency": {name: triangular(value, spreads["hvac_efficiency"])
+                                for name, value in energy_model.hvac_efficiency.items()},
+            "insulation_efficiency": {name: triangular(value, spreads["insulation_efficiency"])
+                                      for name, value in energy_model.insulation_efficiency.items()}
+        }
+        for name, distribution in (distributions or {}).items():
+            if isinstance(distribution, dict):
+                self.distributions[name].update(distribution)
+            else:
+                self.distributions[name] = distribution
+
+        self.bins = bins
+
+    def _bin_count(self, design_count):
+        if self.bins is not None:
+            return self.bins
+        return int(np.clip(self.histogram_cells // max(design_count, 1), 32, 512))
+
+    @staticmethod
+    def _draw(rng, distribution, sample_count):
+        low, mode, high = distribution
+        if low == high:
+            return np.full(sample_count, float(mode))
+        return rng.triangular(low, mode, high, sample_count)
+
+    def _draw_table(self, rng, name, vocabulary, default, sample_count):
+        """
+        Draws a (samples x categories + 1) multiplier table; the last column holds the
+        model default used for unknown categories.
+        """
+        table = np.full((sample_count, len(vocabulary) + 1), float(default))
+        for code, category in enumerate(vocabulary):
+            if category in self.distributions[name]:
+                table[:, code] = self._draw(rng, self.distributions[name][category], sample_count)
+        return table
+
+    def _draw_parameters(self, rng, sample_count):
+        """
+        Draws one block of parameter samples, in the argument order of _evaluate().
+        """
+        return (self._draw(rng, self.distributions["base_cost_per_sqft"], sample_count),
+                self._draw(rng, self.distributions["labor_cost_per_sqft"], sample_count),
+                self._draw_table(rng, "material_cost", MATERIAL_TYPES, 1.0, sample_count),
+                self._draw_table(rng, "hvac_cost", HVAC_TYPES, 1.0, sample_count),
+                self._draw(rng, self.distributions["base_energy_per_sqft"], sample_count),
+                self._draw_table(rng, "insulation_efficiency", INSULATION_TYPES, 1.0, sample_count),
+                self._draw_table(rng, "material_efficiency", MATERIAL_TYPES, 0.75, sample_count),
+                self._draw_table(rng, "hvac_efficiency", HVAC_TYPES, 0.7, sample_count))
+
+    def _parameter_table(self, pick, vocabulary, name, default):
+        values = [pick(self.distributions[name][category]) if category in self.distributions[name] else default
+                  for category in vocabulary]
+        return np.array(values + [default], dtype=np.float64)
+
+    def _evaluate(self, designs, base_cost, labor_cost, material_cost, hvac_cost, base_energy, insulation,
+                  material_efficiency, hvac_efficiency):
+        """
+        Evaluates cost, energy and efficiency for every design under every parameter sample.
+        The efficiency score is left unrounded (EnergyModel rounds it to 2 digits).
+
+        Returns:
+        - tuple: (total cost, daily energy usage, efficiency score), each a
+          (designs x samples) array.
+        """
+        floor_area = designs.floor_area.astype(np.float64)[:, None]
+
+        design_base_cost = floor_area * base_cost * material_cost[:, designs.materials].T
+        total_cost = design_base_cost + floor_area * labor_cost + design_base_cost * hvac_cost[:, designs.hvac].T
+        design_insulation = insulation[:, designs.insulation].T
+        daily_energy_usage = base_energy * floor_area * design_insulation
+        efficiency_score = (material_efficiency[:, designs.materials].T
+                            + hvac_efficiency[:, designs.hvac].T) / 2 * design_insulation
+        return total_cost, daily_energy_usage, efficiency_score
+
+    def _bounds(self, designs):
+        """
+        Every parameter enters the models with a positive coefficient, so the cheapest and
+        most expensive outcomes come from the all-low and all-high parameter corners.
+        """
+        corners = []
+        for pick in (min, max):
+            corners.append(self._evaluate(
+                designs,
+                np.array([pick(self.distributions["base_cost_per_sqft"])]),
+                np.array([pick(self.distributions["labor_cost_per_sqft"])]),
+                self._parameter_table(pick, MATERIAL_TYPES, "material_cost", 1.0)[None, :],
+                self._parameter_table(pick, HVAC_TYPES, "hvac_cost", 1.0)[None, :],
+                np.array([pick(self.distributions["base_energy_per_sqft"])]),
+                self._parameter_table(pick, INSULATION_TYPES, "insulation_efficiency", 1.0)[None, :],
+                self._parameter_table(pick, MATERIAL_TYPES, "material_efficiency", 0.75)[None, :],
+                self._parameter_table(pick, HVAC_TYPES, "hvac_efficiency", 0.7)[None, :]))
+
+        return {name: (low[:, 0], high[:, 0]) for name, low, high in zip(self.metrics, *corners)}
+
+    def _empty_totals(self, design_count, bins):
+        return {name: [np.zeros((design_count, bins), dtype=np.int64), np.zeros(design_count)]
+                for name in self.metrics}
+
+    def _histogram_block(self, designs, seed_sequence, sample_count, bins, out=None):
+        """
+        Draws one block of parameter samples and folds the results into histograms, one
+        design chunk of at most block_cells matrix cells at a time.
+
+        Parameters:
+        - out (dict): Histograms and sums to add into (default: new ones, returned).
+        """
+        rng = np.random.default_rng(seed_sequence)
+        parameters = self._draw_parameters(rng, sample_count)
+        bounds = self._bounds(designs)
+        design_count = len(designs)
+        if out is None:
+            out = self._empty_totals(design_count, bins)
+
+        chunk_rows = max(1, self.block_cells // max(sample_count, bins))
+        for start in range(0, design_count, chunk_rows):
+            rows = slice(start, start + chunk_rows)
+            chunk = designs[rows]
+            offsets = (np.arange(len(chunk)) * bins)[:, None]
+            for name, values in zip(self.metrics, self._evaluate(chunk, *parameters)):
+                low, high = (bound[rows] for bound in bounds[name])
+                width = np.where(high > low, high - low, 1.0)[:, None]
+                bin_index = np.clip(((values - low[:, None]) / width * bins).astype(np.int64), 0, bins - 1)
+                counts = np.bincount((bin_index + offsets).ravel(), minlength=len(chunk) * bins)
+                out[name][0][rows] += counts.reshape(len(chunk), bins)
+                out[name][1][rows] += values.sum(axis=1)
+        return out
+
+    def _quantiles(self, counts, low, high, quantiles):
+        """
+        Interpolates quantiles from per-design histograms.
+        """
+        cumulative = np.cumsum(counts, axis=1)
+        total = cumulative[:, -1:]
+        rows = np.arange(len(counts))
+        bin_width = (high - low) / counts.shape[1]
+
+        results = {}
+        for quantile in quantiles:
+            target = quantile * total
+            bin_index = np.argmax(cumulative >= target, axis=1)
+            before = np.where(bin_index > 0, cumulative[rows, bin_index - 1], 0)
+            in_bin = np.maximum(counts[rows, bin_index], 1)
+            fraction = np.clip((target[:, 0] - before) / in_bin, 0, 1)
+            results[f"p{round(quantile * 100)}"] = low + (bin_index + fraction) * bin_width
+        return results
+
+    def run(self, designs, sample_count, seed=None, block_size=None, max_workers=0,
+            quantiles=(0.1, 0.5, 0.9)):
+        """
+        Runs the Monte Carlo simulation.
+
+        Parameters:
+        - designs (DesignBatch or list): Designs to evaluate.
+        - sample_count (int): Number of parameter samples N.
+        - seed (int): Seed; results are identical for any max_workers and block order.
+        - block_size (int): Parameter samples per block (default: 4096). Large catalogs are
+          split into design chunks within a block, so blocks do not shrink with the catalog.
+        - max_workers (int): Worker processes for the blocks; 0 runs in this process,
+          None uses one worker per CPU. Each block in flight returns its own set of
+          histograms, so a parallel run holds up to 2 * max_workers extra copies of them.
+        - quantiles (tuple): Quantiles to report.
+
+        Returns:
+        - dict: For "total_cost", "daily_energy_usage" and "efficiency_score", per-design
+          arrays for each quantile (e.g. "p10") and the "mean"; plus "sample_count" and
+          "bins" (the histogram resolution used).
+        """
+        if not isinstance(designs, DesignBatch):
+            designs = DesignBatch.from_dicts(designs)
+        block_size = block_size or 4096
+        bins = self._bin_count(len(designs))
+
+        block_sizes = [min(block_size, sample_count - start) for start in range(0, sample_count, block_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(block_sizes))
+        totals = self._empty_totals(len(designs), bins)
+
+        def merge(block):
+            for name, (counts, sums) in block.items():
+                totals[name][0] += counts
+                totals[name][1] += sums
+
+        if max_workers == 0:
+            for block_seed, size in zip(seeds, block_sizes):
+                self._histogram_block(designs, block_seed, size, bins, out=totals)
+        else:
+            max_workers = max_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(self, designs)) as executor:
+                pending = deque()
+                for block_seed, size in zip(seeds, block_sizes):
+                    pending.append(executor.submit(_run_block, block_seed, size, bins))
+                    # Keep a bounded number of blocks in flight so memory stays flat
+                    if len(pending) >= 2 * max_workers:
+                        merge(pending.popleft().result())
+                while pending:
+                    merge(pending.popleft().result())
+
+        bounds = self._bounds(designs)
+        summary = {"sample_count": sample_count, "bins": bins}
+        for name, (counts, sums) in totals.items():
+            low, high = bounds[name]
+            summary[name] = self._quantiles(counts, low, high, quantiles)
+            summary[name]["mean"] = sums / max(sample_count, 1)
+        return summary
+
+# Example usage
+if __name__ == "__main__":
+    adu_designs = [
+        {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+        {"floor_area": 750, "materials": "steel_frame", "hvac": "high_efficiency", "insulation": "high_efficiency"},
+        {"floor_area": 900, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+    ]
+
+    summary = MonteCarloEngine().run(adu_designs, sample_count=100000, seed=42, max_workers=2)
+    for i, design in enumerate(adu_designs):
+        cost = summary["total_cost"]
+        print(f"{design}: P10 ${cost['p10'][i]:,.0f}  P50 ${cost['p50'][i]:,.0f}  P90 ${cost['p90'][i]:,.0f}")
@@ -1,4 +1,10 @@
-import numpy as np
+import heapq
+from itertools import product
+from src.LazyImport import lazy_import
+from src.DesignCodes import MATERIAL_TYPES, HVAC_TYPES, INSULATION_TYPES, build_lookup_table, round_values
+from src.DesignBatch import DesignBatch
+
+np = lazy_import("numpy")
 
 class OptimizationModule:
     """
@@ -6,19 +12,75 @@ class OptimizationModule:
     It evaluates multiple designs and selects the one that balances affordability and efficiency.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, cost_estimator=None, energy_model=None):
+        """
+        Initializes the optimizer.
+
+        Parameters:
+        - cost_estimator (CostEstimator): Enables unified scoring (with energy_model): designs
+          are ranked on the same cost and efficiency numbers the SimulationEngine reports,
+          resolved through one precomputed categorical lookup table (see score_table).
+        - energy_model (EnergyModel): See cost_estimator. If only one of the two is given,
+          a default instance of the other is used.
+        """
+        self.unified = cost_estimator is not None or energy_model is not None
+        if self.unified:
+            from src.CostEstimator import CostEstimator
+            from src.EnergyModel import EnergyModel
+            cost_estimator = cost_estimator or CostEstimator()
+            energy_model = energy_model or EnergyModel()
+        self.cost_estimator = cost_estimator
+        self.energy_model = energy_model
+        self._score_table = None
+        self._score_table_fingerprint = None
+        self._cost_terms = None
+        self._efficiency_rows = None
+
+        # Category name -> table index for dict designs (unknown names use the default slot)
+        self._material_codes = {name: code for code, name in enumerate(MATERIAL_TYPES)}
+        self._hvac_codes = {name: code for code, name in enumerate(HVAC_TYPES)}
+        self._insulation_codes = {name: code for code, name in enumerate(INSULATION_TYPES)}
+
+        # Base construction cost used by the optimizer's cost model
+        self.base_cost = 50000
+
+        # Cost multipliers
+        self.material_multiplier = {"wood_frame": 1.0, "steel_frame": 1.2, "concrete": 1.5}
+        self.hvac_multiplier = {"standard": 1.0, "high_efficiency": 1.1}
+
+        # Efficiency ratings
+        self.hvac_efficiency = {"standard": 0.7, "high_efficiency": 0.9}
+        self.material_efficiency = {"wood_frame": 0.75, "steel_frame": 0.8, "concrete": 0.85}
+
+    def parameter_fingerprint(self):
+        """
+        Returns a hashable snapshot of every parameter that affects the design scores.
+
+        Returns:
+        - tuple: Changes whenever a base value or multiplier (or the scoring mode) changes.
+        """
+        if self.unified:
+            return ("unified", self.cost_estimator.parameter_fingerprint(), self.energy_model.parameter_fingerprint())
+        return (self.base_cost,
+                tuple(self.material_multiplier.items()),
+                tuple(self.hvac_multiplier.items()),
+                tuple(self.hvac_efficiency.items()),
+                tuple(self.material_efficiency.items()))
 
     def evaluate_design(self, design):
         """
         Scores an ADU design based on cost and energy efficiency.
 
         Parameters:
-        - design (dict): Dictionary containing ADU specifications (floor_area, materials, hvac).
+        - design (dict or DesignBatch): Dictionary containing ADU specifications (floor_area, materials, hvac).
 
         Returns:
-        - float: A score representing the design's efficiency (higher is better).
+        - float: A score representing the design's efficiency (higher is better), or an array
+          of scores for a DesignBatch.
         """
+        if isinstance(design, DesignBatch):
+            return self.evaluate_design_batch(design.floor_area, design.materials, design.hvac, design.insulation)
+
         cost = self.estimate_cost(design)
         efficiency = self.estimate_energy_efficiency(design)
 
@@ -36,17 +98,453 @@ class OptimizationModule:
         Selects the best ADU design from a list based on optimization criteria.
 
         Parameters:
-        - designs (list): A list of dictionaries, each representing an ADU design.
+        - designs (list or DesignBatch): A list of dictionaries, each representing an ADU design.
 
         Returns:
         - dict: The optimal ADU design.
         """
+        if isinstance(designs, DesignBatch):
+            best_index = self.find_optimal_design_batch(designs.floor_area, designs.materials, designs.hvac,
+                                                        designs.insulation)
+            return None if best_index is None else designs[best_index]
+
         if not designs:
             return None
 
+        self.refresh_score_table()
         best_design = max(designs, key=self.evaluate_design)
         return best_design
 
+    def find_top_designs(self, designs, k, scores=None):
+        """
+        Selects the k best ADU designs in a single pass, without sorting every candidate.
+
+        Parameters:
+        - designs (iterable or DesignBatch): Design dicts (consumed lazily, kept in a bounded
+          heap of size k) or a DesignBatch (scored at once and selected with np.partition).
+        - k (int): Number of designs to return.
+        - scores (np.ndarray): Scores already computed for a DesignBatch (e.g. the "scores"
+          of run_simulation_batch()), so it is not scored again.
+
+        Returns:
+        - list: Up to k dicts with "design", "score" and "index" (position in the input),
+          best first; ties keep input order, like find_optimal_design().
+        """
+        if k < 1:
+            return []
+
+        if isinstance(designs, DesignBatch):
+            if scores is None:
+                scores = self.evaluate_design_batch(designs.floor_area, designs.materials, designs.hvac,
+                                                    designs.insulation)
+            top_indices = self._top_k_indices(scores, k)
+            return [{"design": designs[int(i)], "score": float(scores[i]), "index": int(i)} for i in top_indices]
+
+        # Min-heap of (score, -index, design): the root is the weakest design kept so far
+        self.refresh_score_table()
+        heap = []
+        for index, design in enumerate(designs):
+            entry = (self.evaluate_design(design), -index, design)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+
+        heap.sort(key=lambda item: item[:2], reverse=True)
+        return [{"design": design, "score": score, "index": -negative_index}
+                for score, negative_index, design in heap]
+
+    def _top_k_indices(self, scores, k):
+        """
+        Returns the indices of the k largest scores, best first, ties in index order.
+        """
+        count = len(scores)
+        if k >= count:
+            return np.lexsort((np.arange(count), -scores))
+
+        # Everything strictly above the k-th largest score, then the earliest ties
+        kth_score = np.partition(scores, count - k)[count - k]
+        above = np.flatnonzero(scores > kth_score)
+        ties = np.flatnonzero(scores == kth_score)[:k - len(above)]
+        indices = np.concatenate([above, ties])
+        return indices[np.lexsort((indices, -scores[indices]))]
+
+    def evaluate_design_batch(self, floor_area, materials, hvac, insulation=None):
+        """
+        Scores a batch of ADU designs in a few array operations.
+
+        Parameters:
+        - floor_area (np.ndarray): Floor areas in square feet.
+        - materials (np.ndarray): Material codes (see DesignCodes.MATERIAL_TYPES).
+        - hvac (np.ndarray): HVAC codes (see DesignCodes.HVAC_TYPES).
+        - insulation (np.ndarray): Insulation codes; only used for unified scoring
+          (default: "standard").
+
+        Returns:
+        - np.ndarray: Scores, identical to evaluate_design() per design.
+        """
+        floor_area = np.asarray(floor_area, dtype=np.float64)
+        if self.unified:
+            if insulation is None:
+                insulation = np.zeros(len(floor_area), dtype=np.int8)
+            table = self.refresh_score_table()
+            # Same operation order as CostEstimator.estimate_total_cost_batch (bit-exact)
+            base_cost = floor_area * table["base_cost_per_sqft"] * table["material_cost"][materials]
+            cost = round_values(base_cost + floor_area * table["labor_cost_per_sqft"]
+                                + base_cost * table["hvac_cost"][hvac], 2)
+            efficiency = table["efficiency"][materials, hvac, insulation]
+            return (0.6 * efficiency) + (0.4 * (1 / (1 + cost / 100000)))
+
+        material_factors = build_lookup_table(self.material_multiplier, MATERIAL_TYPES, 1.0)[materials]
+        hvac_factors = build_lookup_table(self.hvac_multiplier, HVAC_TYPES, 1.0)[hvac]
+        material_scores = build_lookup_table(self.material_efficiency, MATERIAL_TYPES, 0.75)[materials]
+        hvac_scores = build_lookup_table(self.hvac_efficiency, HVAC_TYPES, 0.7)[hvac]
+
+        cost = self.base_cost * material_factors * hvac_factors + (floor_area * 50)
+        efficiency = (hvac_scores + material_scores) / 2
+
+        cost_score = 1 / (1 + cost / 100000)
+        return (0.6 * efficiency) + (0.4 * cost_score)
+
+    def find_optimal_design_batch(self, floor_area, materials, hvac, insulation=None):
+        """
+        Selects the best design from a batch of designs.
+
+        Parameters:
+        - floor_area (np.ndarray): Floor areas in square feet.
+        - materials (np.ndarray): Material codes.
+        - hvac (np.ndarray): HVAC codes.
+        - insulation (np.ndarray): Insulation codes (used for unified scoring).
+
+        Returns:
+        - int or None: Index of the optimal design (first one on ties, like max()).
+        """
+        if len(floor_area) == 0:
+            return None
+
+        scores = self.evaluate_design_batch(floor_area, materials, hvac, insulation)
+        return int(np.argmax(scores))
+
+    def find_pareto_front(self, total_cost, efficiency_score, daily_energy_usage=None):
+        """
+        Finds the designs that are not dominated on cost, efficiency and (optionally) energy use.
+        A design is dominated when another one is at least as cheap, at least as efficient and
+        uses at most as much energy, and is strictly better on at least one of them.
+
+        Parameters:
+        - total_cost (array-like): Total cost per design (lower is better).
+        - efficiency_score (array-like): Efficiency score per design (higher is better).
+        - daily_energy_usage (array-like): Daily energy use per design (lower is better), or
+          None for a two-objective front.
+
+        Returns:
+        - np.ndarray: Indices of the non-dominated designs, in input order.
+        """
+        columns = [np.asarray(total_cost, dtype=np.float64), -np.asarray(efficiency_score, dtype=np.float64)]
+        if daily_energy_usage is not None:
+            columns.append(np.asarray(daily_energy_usage, dtype=np.float64))
+        objectives = np.column_stack(columns)
+        if len(objectives) == 0:
+            return np.array([], dtype=np.intp)
+
+        # Identical designs share one point; rows come back in lexicographic order, so any
+        # point that dominates another is always visited before it
+        points, inverse = np.unique(objectives, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        if points.shape[1] == 2:
+            # Dominated iff an earlier point is at least as good on the second objective
+            best_before = np.concatenate(([np.inf], np.minimum.accumulate(points[:-1, 1])))
+            keep = points[:, 1] < best_before
+        else:
+            keep = self._non_dominated_3d(points)
+
+        return np.flatnonzero(keep[inverse])
+
+    def _non_dominated_3d(self, points):
+        """
+        Sweep over lexicographically sorted, unique points: a point is dominated iff an
+        earlier one is at least as good on both the second and third objective. A Fenwick
+        tree over the ranks of the second objective holds the best third objective seen so
+        far for each prefix of ranks, so every point costs one O(log n) query and at most
+        one O(log n) update: O(n log n) overall, whatever the size of the front.
+        """
+        keep = np.zeros(len(points), dtype=bool)
+        # 1-based ranks; equal values share a rank so ties count as "at least as good"
+        ranks = (np.unique(points[:, 1], return_inverse=True)[1].reshape(-1) + 1).tolist()
+        size = max(ranks)
+        tree = [float("inf")] * (size + 1)
+
+        for i, (rank, third) in enumerate(zip(ranks, points[:, 2].tolist())):
+            # Best third objective among earlier points with a second objective <= this one
+            best = float("inf")
+            node = rank
+            while node:
+                if tree[node] < best:
+                    best = tree[node]
+                node &= node - 1
+            if best <= third:
+                continue
+
+            keep[i] = True
+            node = rank
+            while node <= size:
+                if third < tree[node]:
+                    tree[node] = third
+                node += node & -node
+
+        return keep
+
+    def rank_pareto_front(self, front, total_cost, efficiency_score, daily_energy_usage=None,
+                          cost_weight=0.4, efficiency_weight=0.6, energy_weight=0.0, bounds=None):
+        """
+        Re-weights a precomputed Pareto front without re-evaluating any designs. Each
+        objective is min-max normalized over the whole sweep (the full metric arrays, or
+        the given bounds) before the weighted sum, so the weights express relative
+        importance. The score is then a fixed positive-weighted sum of the objectives, and
+        the best score over the sweep is always reached on the front, so this gives the
+        same best score as re-scoring every design.
+
+        Parameters:
+        - front (np.ndarray): Indices returned by find_pareto_front().
+        - total_cost, efficiency_score, daily_energy_usage (array-like): Full metric arrays.
+        - cost_weight, efficiency_weight, energy_weight (float): Objective weights.
+        - bounds (dict): Optional (min, max) per metric name ("total_cost",
+          "efficiency_score", "daily_energy_usage"), e.g. when the arrays only cover the
+          front; defaults to the range of each full array.
+
+        Returns:
+        - tuple: (front indices ordered best first, their weighted scores).
+        """
+        front = np.asarray(front, dtype=np.intp)
+        bounds = bounds or {}
+
+        def normalized(name, values, higher_is_better):
+            values = np.asarray(values, dtype=np.float64)
+            if name in bounds:
+                low, high = bounds[name]
+            else:
+                low, high = (values.min(), values.max()) if len(values) else (0.0, 0.0)
+            values = values[front]
+            span = high - low
+            if span == 0:
+                return np.ones(len(values))
+            scaled = (values - low) / span
+            return scaled if higher_is_better else 1 - scaled
+
+        scores = (cost_weight * normalized("total_cost", total_cost, False)
+                  + efficiency_weight * normalized("efficiency_score", efficiency_score, True))
+        if daily_energy_usage is not None:
+            scores += energy_weight * normalized("daily_energy_usage", daily_energy_usage, False)
+
+        order = np.lexsort((front, -scores))
+        return front[order], scores[order]
+
+    def optimize_design(self, floor_area_range, budget=None, lot_size=None, max_lot_coverage=None,
+                        materials=MATERIAL_TYPES, hvac=HVAC_TYPES, insulation=INSULATION_TYPES,
+                        objective=None, bound=None, tolerance=1.0, unimodal=True, objective_axes=None):
+        """
+        Searches the design space itself instead of choosing among listed designs:
+        branch-and-bound over the categorical choices with a 1-D search on floor area.
+
+        For each material/hvac/insulation combination the feasible floor-area interval is
+        found first (the lot-coverage cap, then bisection on the budget, since cost grows
+        with floor area). Combinations are visited best-bound first and skipped once their
+        bound cannot beat the incumbent; the rest get a golden-section search on floor area.
+
+        Golden-section search assumes the objective is unimodal in floor area for each
+        combination (it rises to one peak, then falls, or is monotonic). That holds for the
+        default objective, whose score falls as floor area grows, but it cannot be checked
+        for a custom objective: pass unimodal=False for one that may have several peaks to
+        scan each interval on a grid of tolerance-sized steps instead.
+
+        Parameters:
+        - floor_area_range (tuple): (minimum, maximum) floor area in square feet.
+        - budget (float): Maximum cost as given by estimate_cost() (default: no limit).
+        - lot_size (float): Lot size in square feet, used with max_lot_coverage.
+        - max_lot_coverage (float): Maximum ADU floor area as a share of the lot.
+        - materials, hvac, insulation (tuple): Categorical options to consider.
+        - objective (function): design dict -> score to maximize (default: evaluate_design).
+        - bound (function): (design at minimum area, design at maximum area) -> upper bound on
+          the objective over that interval. Defaults to the score at the minimum area for the
+          default objective (it falls with floor area); no pruning for custom objectives.
+        - tolerance (float): Floor-area precision of the 1-D search, in square feet.
+        - unimodal (bool): Use golden-section search (True) or a grid scan (False) on floor area.
+        - objective_axes (iterable): Categorical axes ("materials", "hvac", "insulation") the
+          objective depends on; other axes are not branched on. Insulation (which the budget
+          ignores) keeps its first option, materials and hvac their cheapest option by
+          estimate_cost(), so the feasible designs stay the same. Defaults to materials and
+          hvac for the default objective without unified scoring, where insulation does not
+          affect the score, and to all three otherwise.
+
+        Returns:
+        - dict: "design" (None if nothing is feasible), "score", "evaluations" (objective
+          calls), "cost_evaluations" (budget checks) and "pruned" (combinations skipped).
+        """
+        counts = {"evaluations": 0, "cost_evaluations": 0, "pruned": 0}
+        self.refresh_score_table()
+
+        if objective is None:
+            objective = self.evaluate_design
+            if bound is None:
+                bound = lambda low_design, high_design: score(low_design)
+            if objective_axes is None and not self.unified:
+                objective_axes = ("materials", "hvac")
+        if objective_axes is not None:
+            # Budget checks ignore insulation, so any option will do. Materials and hvac change
+            # the cost by a per-square-foot factor independent of the other choices, so the
+            # cheapest option is feasible whenever any option is.
+            reference = {"floor_area": floor_area_range[0], "materials": materials[0], "hvac": hvac[0]}
+            if "materials" not in objective_axes:
+                materials = (min(materials, key=lambda option: self.estimate_cost({**reference, "materials": option})),)
+            if "hvac" not in objective_axes:
+                hvac = (min(hvac, key=lambda option: self.estimate_cost({**reference, "hvac": option})),)
+            insulation = insulation if "insulation" in objective_axes else insulation[:1]
+
+        def score(design):
+            counts["evaluations"] += 1
+            return objective(design)
+
+        def within_budget(design):
+            counts["cost_evaluations"] += 1
+            return self.estimate_cost(design) <= budget
+
+        low, high = floor_area_range
+        if lot_size is not None and max_lot_coverage is not None:
+            high = min(high, lot_size * max_lot_coverage)
+
+        # Feasible floor-area interval per combination
+        branches = []
+        for material, hvac_type, insulation_type in product(materials, hvac, insulation):
+            def design_at(floor_area, material=material, hvac_type=hvac_type, insulation_type=insulation_type):
+                return {"floor_area": floor_area, "materials": material, "hvac": hvac_type, "insulation": insulation_type}
+
+            if low > high:
+                continue
+            branch_high = high
+            if budget is not None:
+                if not within_budget(design_at(low)):
+                    continue
+                if not within_budget(design_at(high)):
+                    feasible, infeasible = low, high
+                    while infeasible - feasible > tolerance:
+                        middle = (feasible + infeasible) / 2
+                        if within_budget(design_at(middle)):
+                            feasible = middle
+                        else:
+                            infeasible = middle
+                    branch_high = feasible
+            branches.append((design_at, branch_high))
+
+        if bound is not None:
+            bounded = [(bound(design_at(low), design_at(branch_high)), design_at, branch_high)
+                       for design_at, branch_high in branches]
+            bounded.sort(key=lambda branch: branch[0], reverse=True)
+        else:
+            bounded = [(np.inf, design_at, branch_high) for design_at, branch_high in branches]
+
+        best_design = None
+        best_score = -np.inf
+        inverse_golden = (np.sqrt(5) - 1) / 2
+        for branch_bound, design_at, branch_high in bounded:
+            if branch_bound <= best_score:
+                counts["pruned"] += 1
+                continue
+
+            if not unimodal:
+                areas = np.append(np.arange(low, branch_high, tolerance), branch_high).tolist()
+                floor_area, branch_score = max(((area, score(design_at(area))) for area in areas),
+                                               key=lambda item: item[1])
+                if branch_score > best_score:
+                    best_design, best_score = design_at(floor_area), branch_score
+                continue
+
+            # Golden-section search on floor area, keeping the interval end points as candidates
+            a, b = low, branch_high
+            candidates = {a: score(design_at(a))}
+            if b != a:
+                candidates[b] = score(design_at(b))
+            c = b - inverse_golden * (b - a)
+            d = a + inverse_golden * (b - a)
+            score_c, score_d = score(design_at(c)), score(design_at(d))
+            while b - a > tolerance:
+                if score_c >= score_d:
+                    b, d, score_d = d, c, score_c
+                    c = b - inverse_golden * (b - a)
+                    score_c = score(design_at(c))
+                else:
+                    a, c, score_c = c, d, score_d
+                    d = a + inverse_golden * (b - a)
+                    score_d = score(design_at(d))
+            candidates[c] = score_c
+            candidates[d] = score_d
+
+            floor_area, branch_score = max(candidates.items(), key=lambda item: item[1])
+            if branch_score > best_score:
+                best_design, best_score = design_at(floor_area), branch_score
+
+        return {"design": best_design, "score": best_score if best_design else None, **counts}
+
+    def score_table(self):
+        """
+        Returns the categorical lookup table for unified scoring, building it on first use.
+        Every material/hvac/insulation combination is resolved once, so scoring a design
+        is a few table lookups. The table is not re-validated on each lookup; the run-level
+        methods (find_optimal_design, find_top_designs, evaluate_design_batch,
+        optimize_design) call refresh_score_table() once per call, and direct callers of
+        estimate_cost() or evaluate_design() should call it after changing a CostEstimator
+        or EnergyModel parameter.
+
+        Returns:
+        - dict: CostEstimator's "base_cost_per_sqft" and "labor_cost_per_sqft", the
+          "material_cost" and "hvac_cost" multipliers indexed by category code, and
+          "efficiency" indexed [material, hvac, insulation]; the last slot on each axis
+          holds the defaults used for unknown categories.
+        """
+        if self._score_table is None:
+            self.refresh_score_table()
+        return self._score_table
+
+    def refresh_score_table(self):
+        """
+        Rebuilds the unified scoring table if a CostEstimator or EnergyModel parameter has
+        changed since it was built (one fingerprint comparison).
+
+        Returns:
+        - dict or None: The current table (None without unified scoring).
+        """
+        if not self.unified:
+            return None
+
+        fingerprint = (self.cost_estimator.parameter_fingerprint(), self.energy_model.parameter_fingerprint())
+        if self._score_table is None or fingerprint != self._score_table_fingerprint:
+            cost, energy = self.cost_estimator, self.energy_model
+            material_scores = build_lookup_table(energy.material_efficiency, MATERIAL_TYPES, 0.75)[:, None, None]
+            hvac_scores = build_lookup_table(energy.hvac_efficiency, HVAC_TYPES, 0.70)[None, :, None]
+            insulation_multipliers = build_lookup_table(energy.insulation_efficiency, INSULATION_TYPES, 1.0)[None, None, :]
+
+            self._score_table = {
+                # CostEstimator's terms, kept separate so the cost is computed in its order
+                "base_cost_per_sqft": cost.base_cost_per_sqft,
+                "labor_cost_per_sqft": cost.labor_cost_per_sqft,
+                "material_cost": build_lookup_table(cost.material_cost, MATERIAL_TYPES, 1.0),
+                "hvac_cost": build_lookup_table(cost.hvac_cost, HVAC_TYPES, 1.0),
+                # Same as EnergyModel.compute_efficiency (independent of floor area)
+                "efficiency": round_values(((material_scores + hvac_scores) / 2 * insulation_multipliers).ravel(),
+                                           2).reshape(len(MATERIAL_TYPES) + 1, len(HVAC_TYPES) + 1, -1)
+            }
+            # Plain Python copies for the per-design path (list indexing beats NumPy scalars)
+            self._cost_terms = (cost.base_cost_per_sqft, cost.labor_cost_per_sqft,
+                                self._score_table["material_cost"].tolist(), self._score_table["hvac_cost"].tolist())
+            self._efficiency_rows = self._score_table["efficiency"].tolist()
+            self._score_table_fingerprint = fingerprint
+        return self._score_table
+
+    def _table_index(self, design):
+        return (self._material_codes.get(design.get("materials", "wood_frame"), -1),
+                self._hvac_codes.get(design.get("hvac", "standard"), -1),
+                self._insulation_codes.get(design.get("insulation", "standard"), -1))
+
     def estimate_cost(self, design):
         """
         Estimates the total construction cost of an ADU.
@@ -55,16 +553,23 @@ class OptimizationModule:
         - design (dict): Dictionary containing ADU details.
 
         Returns:
-        - float: Estimated cost in USD.
+        - float: Estimated cost in USD (the CostEstimator cost in unified scoring mode).
         """
-        base_cost = 50000  # Base construction cost
-        material_multiplier = {"wood_frame": 1.0, "steel_frame": 1.2, "concrete": 1.5}
-        hvac_multiplier = {"standard": 1.0, "high_efficiency": 1.1}
+        if self.unified:
+            if self._cost_terms is None:
+                self.refresh_score_table()
+            base_cost_per_sqft, labor_cost_per_sqft, material_cost, hvac_cost = self._cost_terms
+            material, hvac, _ = self._table_index(design)
+            floor_area = design.get("floor_area", 600)
+
+            # Same terms and order as CostEstimator.estimate_total_cost
+            base_cost = floor_area * base_cost_per_sqft * material_cost[material]
+            return round(base_cost + floor_area * labor_cost_per_sqft + base_cost * hvac_cost[hvac], 2)
 
-        material_factor = material_multiplier.get(design.get("materials", "wood_frame"), 1.0)
-        hvac_factor = hvac_multiplier.get(design.get("hvac", "standard"), 1.0)
+        material_factor = self.material_multiplier.get(design.get("materials", "wood_frame"), 1.0)
+        hvac_factor = self.hvac_multiplier.get(design.get("hvac", "standard"), 1.0)
 
-        total_cost = base_cost * material_factor * hvac_factor + (design.get("floor_area", 600) * 50)
+        total_cost = self.base_cost * material_factor * hvac_factor + (design.get("floor_area", 600) * 50)
         return total_cost
 
     def estimate_energy_efficiency(self, design):
@@ -75,13 +580,16 @@ class OptimizationModule:
         - design (dict): Dictionary containing ADU details.
 
         Returns:
-        - float: Energy efficiency score (0-1 scale).
+        - float: Energy efficiency score (0-1 scale; the EnergyModel score in unified mode).
         """
-        hvac_efficiency = {"standard": 0.7, "high_efficiency": 0.9}
-        material_efficiency = {"wood_frame": 0.75, "steel_frame": 0.8, "concrete": 0.85}
+        if self.unified:
+            if self._efficiency_rows is None:
+                self.refresh_score_table()
+            material, hvac, insulation = self._table_index(design)
+            return self._efficiency_rows[material][hvac][insulation]
 
-        hvac_score = hvac_efficiency.get(design.get("hvac", "standard"), 0.7)
-        material_score = material_efficiency.get(design.get("materials", "wood_frame"), 0.75)
+        hvac_score = self.hvac_efficiency.get(design.get("hvac", "standard"), 0.7)
+        material_score = self.material_efficiency.get(design.get("materials", "wood_frame"), 0.75)
 
         return (hvac_score + material_score) / 2
 
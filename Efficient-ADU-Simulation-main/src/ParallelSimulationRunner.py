@@ -0,0 +1,112 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from src.SimulationEngine import SimulationEngine
+
+# Per-process state, set up once by _init_worker
+_worker_engine = None
+_worker_designs = None
+
+
+def _init_worker(adu_designs, cache_size):
+    """
+    Builds the simulation engine (and with it the energy, cost, GIS and optimization
+    models) once per worker process, together with the shared design catalog.
+    """
+    global _worker_engine, _worker_designs
+    _worker_engine = SimulationEngine(cache_size=cache_size)
+    _worker_designs = adu_designs
+
+
+def _simulate_chunk(properties):
+    """
+    Runs the simulation for a chunk of properties inside a worker process.
+    """
+    return [_worker_engine.run_simulation(property_data, _worker_designs) for property_data in properties]
+
+
+class ParallelSimulationRunner:
+    """
+    This module evaluates many properties against a shared ADU design catalog by spreading
+    chunks of properties across a process pool. Results are streamed back in input order
+    while later chunks are still running.
+    """
+
+    def __init__(self, adu_designs, max_workers=None, chunksize=64, max_pending_chunks=None, cache_size=None):
+        """
+        Initializes the runner.
+
+        Parameters:
+        - adu_designs (list or DesignBatch): Design catalog evaluated for every property.
+        - max_workers (int): Number of worker processes (default: one per CPU).
+          Use 0 to run in the calling process, which is handy for debugging.
+        - chunksize (int): Number of properties sent to a worker per task.
+        - max_pending_chunks (int): Upper bound on chunks in flight; keeps memory bounded
+          when the property iterable is very large (default: 2 per worker).
+        - cache_size (int): Per-worker DesignResultCache size (default: no cache).
+        """
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1.")
+
+        self.adu_designs = adu_designs
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        self.max_pending_chunks = max_pending_chunks
+        self.cache_size = cache_size
+
+    def _chunks(self, properties):
+        iterator = iter(properties)
+        while True:
+            chunk = list(islice(iterator, self.chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+    def run(self, properties):
+        """
+        Simulates every property and yields the results in the same order.
+
+        Parameters:
+        - properties (iterable): Property dicts; consumed lazily, so generators work.
+
+        Yields:
+        - dict: The run_simulation() result for each property.
+        """
+        if self.max_workers == 0:
+            engine = SimulationEngine(cache_size=self.cache_size)
+            for property_data in properties:
+                yield engine.run_simulation(property_data, self.adu_designs)
+            return
+
+        max_workers = self.max_workers or os.cpu_count() or 1
+        max_pending = self.max_pending_chunks or 2 * max_workers
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                       initargs=(self.adu_designs, self.cache_size))
+        pending = deque()
+        try:
+            for chunk in self._chunks(properties):
+                pending.append(executor.submit(_simulate_chunk, chunk))
+
+                # Hand back finished chunks before submitting more than max_pending
+                while len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+# Example usage
+if __name__ == "__main__":
+    adu_designs = [
+        {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+        {"floor_area": 750, "materials": "steel_frame", "hvac": "high_efficiency", "insulation": "high_efficiency"},
+        {"floor_area": 900, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+    ]
+
+    properties = ({"size": 3000 + 100 * i, "slope": i % 20, "zoning_compliance": True} for i in range(40))
+
+    runner = ParallelSimulationRunner(adu_designs, max_workers=2, chunksize=8)
+    for i, result in enumerate(runner.run(properties)):
+        print(f"Property {i}: {result.get('best_design', result.get('error'))}")
@@ -0,0 +1,140 @@
+import csv
+import os
+from itertools import islice
+
+
+def _parse_bool(value):
+    """
+    Parses the flag spellings found in parcel exports ("true", "Y", "1", ...).
+    """
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("true", "t", "yes", "y", "1"):
+        return True
+    if text in ("false", "f", "no", "n", "0"):
+        return False
+    raise ValueError(f"Cannot interpret {value!r} as a boolean.")
+
+
+class ParcelReader:
+    """
+    This module streams parcel records from CSV (or Parquet) exports and maps them onto the
+    property dicts used by PropertyModel and GISAnalyzer. Rows are read lazily in chunks of
+    bounded size, so memory use does not depend on the size of the input file.
+    """
+
+    # Property keys and how to convert the raw column values
+    property_fields = {
+        "size": float,
+        "slope": float,
+        "zoning_compliance": _parse_bool,
+        "latitude": float,
+        "longitude": float,
+        "tree_cover": float
+    }
+
+    def __init__(self, path, column_map=None, chunk_size=10000, extra_columns=(), file_format=None):
+        """
+        Initializes the reader.
+
+        Parameters:
+        - path (str): Path to the parcel file.
+        - column_map (dict): Maps property keys ("size", "slope", ...) to column names in the
+          file. Keys that are not mapped are read from a column of the same name, if present.
+        - chunk_size (int): Maximum number of parcels held in memory per chunk.
+        - extra_columns (tuple): Columns copied through unchanged (e.g. a parcel id).
+        - file_format (str): "csv" or "parquet"; inferred from the file extension if omitted.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+
+        self.path = path
+        self.column_map = {key: key for key in self.property_fields}
+        self.column_map.update(column_map or {})
+        self.chunk_size = chunk_size
+        self.extra_columns = tuple(extra_columns)
+
+        if file_format is None:
+            file_format = "parquet" if os.path.splitext(path)[1].lower() in (".parquet", ".pq") else "csv"
+        if file_format not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported parcel file format: {file_format}")
+        self.file_format = file_format
+
+    def to_property(self, row):
+        """
+        Converts one raw row into a property dict.
+
+        Parameters:
+        - row (dict): Column name to raw value.
+
+        Returns:
+        - dict: Property data; empty or missing fields are left out so model defaults apply.
+        """
+        property_data = {}
+        for key, convert in self.property_fields.items():
+            value = row.get(self.column_map[key])
+            if value is None or value == "":
+                continue
+            property_data[key] = convert(value)
+
+        for column in self.extra_columns:
+            property_data[column] = row.get(column)
+
+        return property_data
+
+    def _iter_rows(self):
+        if self.file_format == "parquet":
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as exc:
+                raise ImportError("Reading Parquet parcel files requires pyarrow (pip install pyarrow).") from exc
+
+            parquet_file = pq.ParquetFile(self.path)
+            for record_batch in parquet_file.iter_batches(batch_size=self.chunk_size):
+                yield from record_batch.to_pylist()
+            return
+
+        with open(self.path, newline="") as parcel_file:
+            yield from csv.DictReader(parcel_file)
+
+    def iter_chunks(self):
+        """
+        Reads the file lazily, one bounded chunk at a time.
+
+        Yields:
+        - list: Up to chunk_size property dicts.
+        """
+        rows = self._iter_rows()
+        while True:
+            chunk = [self.to_property(row) for row in islice(rows, self.chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+
+    def __iter__(self):
+        """
+        Yields one property dict at a time (chunked reads underneath).
+        """
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+# Example usage
+if __name__ == "__main__":
+    import tempfile
+    from src.SimulationEngine import SimulationEngine
+
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as sample_file:
+        sample_file.write("parcel_id,LOT_SQFT,SLOPE_DEG,FLOOD_OK,LAT,LON,CANOPY\n")
+        sample_file.write("A-1,5000,5,Y,34.05,-84.1,30\n")
+        sample_file.write("A-2,3200,4,Y,34.06,-84.2,10\n")
+
+    reader = ParcelReader(sample_file.name, column_map={
+        "size": "LOT_SQFT", "slope": "SLOPE_DEG", "zoning_compliance": "FLOOD_OK",
+        "latitude": "LAT", "longitude": "LON", "tree_cover": "CANOPY"
+    }, extra_columns=("parcel_id",))
+
+    adu_designs = [{"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"}]
+    for result in SimulationEngine().run_simulation_stream(reader, adu_designs):
+        print(result)
+    os.remove(sample_file.name)
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import numpy as np
+
+class PolygonOverlay:
+    """
+    This module classifies points (parcel centroids) against a set of polygons such as flood
+    zones or zoning districts loaded from GeoJSON. Each polygon's bounding box is used to
+    pick candidate points with a binary search over x-sorted points, and the candidates are
+    tested against all of the polygon's edges at once with a vectorized even-odd
+    (ray-crossing) rule, which handles holes and multi-part polygons.
+    """
+
+    def __init__(self, polygons, properties=None, max_cells=4_000_000):
+        """
+        Initializes the overlay.
+
+        Parameters:
+        - polygons (list): One entry per feature, each a list of rings; a ring is a sequence
+          of (longitude, latitude) vertices. Outer rings, holes and extra parts of a
+          multi-polygon all go in the same list.
+        - properties (list): Optional attribute dict per feature (e.g. GeoJSON properties).
+        - max_cells (int): Upper bound on points x edges evaluated per step (memory cap).
+        """
+        self.properties = list(properties) if properties is not None else [{} for _ in polygons]
+        self.max_cells = max_cells
+        self.edges = []
+        self.bounding_boxes = []
+
+        for rings in polygons:
+            starts = []
+            ends = []
+            for ring in rings:
+                ring = np.asarray(ring, dtype=np.float64)[:, :2]
+                starts.append(ring)
+                ends.append(np.roll(ring, -1, axis=0))
+            start = np.concatenate(starts)
+            end = np.concatenate(ends)
+            self.edges.append((start[:, 0], start[:, 1], end[:, 0], end[:, 1]))
+            self.bounding_boxes.append((start[:, 0].min(), start[:, 1].min(), start[:, 0].max(), start[:, 1].max()))
+
+    def fingerprint(self):
+        """
+        Returns:
+        - str: Digest of every polygon edge and feature property; changes with any edit.
+        """
+        digest = hashlib.sha1(json.dumps(self.properties, sort_keys=True, default=str).encode("utf-8"))
+        for edges in self.edges:
+            for column in edges:
+                digest.update(np.ascontiguousarray(column).tobytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def from_geojson(cls, source, **kwargs):
+        """
+        Loads Polygon and MultiPolygon features from a GeoJSON FeatureCollection.
+
+        Parameters:
+        - source (str or dict): Path to a GeoJSON file, or the already parsed document.
+
+        Returns:
+        - PolygonOverlay: One overlay feature per GeoJSON polygon feature.
+        """
+        if isinstance(source, str):
+            with open(source) as geojson_file:
+                source = json.load(geojson_file)
+
+        polygons = []
+        properties = []
+        for feature in source.get("features", []):
+            geometry = feature.get("geometry") or {}
+            if geometry.get("type") == "Polygon":
+                rings = geometry["coordinates"]
+            elif geometry.get("type") == "MultiPolygon":
+                rings = [ring for part in geometry["coordinates"] for ring in part]
+            else:
+                continue
+            polygons.append(rings)
+            properties.append(feature.get("properties") or {})
+
+        return cls(polygons, properties, **kwargs)
+
+    def __len__(self):
+        return len(self.edges)
+
+    def _inside(self, x, y, edges):
+        """
+        Even-odd rule for candidate points against every edge of one feature.
+        """
+        x1, y1, x2, y2 = edges
+        inside = np.zeros(len(x), dtype=bool)
+        step = max(1, self.max_cells // max(len(x1), 1))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for start in range(0, len(x), step):
+                px = x[start:start + step, None]
+                py = y[start:start + step, None]
+                straddles = (y1 > py) != (y2 > py)
+                crossing_x = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+                crossings = np.count_nonzero(straddles & (px < crossing_x), axis=1)
+                inside[start:start + step] = crossings % 2 == 1
+        return inside
+
+    def locate(self, longitudes, latitudes):
+        """
+        Finds the polygon containing each point.
+
+        Parameters:
+        - longitudes, latitudes (array-like): Point coordinates in degrees.
+
+        Returns:
+        - np.ndarray: Index of the first containing feature per point, -1 if none.
+        """
+        x = np.asarray(longitudes, dtype=np.float64)
+        y = np.asarray(latitudes, dtype=np.float64)
+        result = np.full(len(x), -1, dtype=np.int64)
+
+        order = np.argsort(x, kind="stable")
+        sorted_x = x[order]
+
+        for feature, (min_x, min_y, max_x, max_y) in enumerate(self.bounding_boxes):
+            # Bounding-box prefilter: binary search on x, then a cheap y test
+            low = np.searchsorted(sorted_x, min_x, side="left")
+            high = np.searchsorted(sorted_x, max_x, side="right")
+            candidates = order[low:high]
+            candidates = candidates[(y[candidates] >= min_y) & (y[candidates] <= max_y) & (result[candidates] < 0)]
+            if len(candidates) == 0:
+                continue
+
+            inside = self._inside(x[candidates], y[candidates], self.edges[feature])
+            result[candidates[inside]] = feature
+
+        return result
+
+    def contains(self, longitudes, latitudes):
+        """
+        Returns:
+        - np.ndarray: True for points inside any of the polygons.
+        """
+        return self.locate(longitudes, latitudes) >= 0
+
+# Example usage
+if __name__ == "__main__":
+    flood_zones = PolygonOverlay.from_geojson({
+        "type": "FeatureCollection",
+        "features": [{
+            "type": "Feature",
+            "properties": {"zone": "AE"},
+            "geometry": {"type": "Polygon", "coordinates": [[[-84.5, 34.0], [-84.4, 34.0], [-84.4, 34.1], [-84.5, 34.1], [-84.5, 34.0]]]}
+        }]
+    })
+
+    rng = np.random.default_rng(0)
+    parcel_longitudes = -84.6 + rng.random(100000) * 0.3
+    parcel_latitudes = 33.9 + rng.random(100000) * 0.3
+    in_flood_zone = flood_zones.contains(parcel_longitudes, parcel_latitudes)
+    print(f"Parcels in flood zones: {in_flood_zone.sum()} of {len(in_flood_zone)}")
@@ -1,3 +1,9 @@
+import logging
+from src.GISAnalyzer import (ZONING_APPROVED, LOT_TOO_SMALL, SLOPE_TOO_STEEP, ZONING_NONCOMPLIANT,
+                             REJECTION_REASONS, DEFAULT_ZONING_RULES)
+
+logger = logging.getLogger(__name__)
+
 class PropertyModel:
     """
     This module represents a property and validates whether an ADU can be placed on it
@@ -15,9 +21,9 @@ class PropertyModel:
         self.slope = property_data.get("slope", 5)  # Default 5 degrees
         self.zoning_compliance = property_data.get("zoning_compliance", True)
 
-        # Define zoning requirements
-        self.minimum_lot_size = 4000  # Minimum required lot size (sq. ft.)
-        self.max_slope = 15  # Maximum allowable slope for ADU construction (degrees)
+        # Define zoning requirements (shared defaults, see GISAnalyzer.DEFAULT_ZONING_RULES)
+        self.minimum_lot_size = DEFAULT_ZONING_RULES["minimum_lot_size"]  # Minimum required lot size (sq. ft.)
+        self.max_slope = DEFAULT_ZONING_RULES["max_slope"]  # Maximum allowable slope for ADU construction (degrees)
 
     def get_constraints(self):
         """
@@ -32,29 +38,42 @@ class PropertyModel:
             "zoning_compliance": self.zoning_compliance
         }
 
-    def is_adu_allowed(self):
+    def get_rejection_reason(self):
         """
-        Determines if an ADU can be placed on the property based on constraints.
+        Determines which constraint, if any, prevents an ADU on the property.
 
         Returns:
-        - bool: True if ADU placement is allowed, False otherwise.
+        - int: ZONING_APPROVED, or the reason code (see GISAnalyzer) of the first failed check.
         """
         if self.size < self.minimum_lot_size:
-            print("Zoning Restriction: Lot size is too small for ADU placement.")
-            return False
+            return LOT_TOO_SMALL
 
         if self.slope > self.max_slope:
-            print("Zoning Restriction: Slope exceeds allowable limit for ADU construction.")
-            return False
+            return SLOPE_TOO_STEEP
 
         if not self.zoning_compliance:
-            print("Zoning Restriction: Property is not compliant with zoning laws.")
+            return ZONING_NONCOMPLIANT
+
+        return ZONING_APPROVED
+
+    def is_adu_allowed(self):
+        """
+        Determines if an ADU can be placed on the property based on constraints.
+
+        Returns:
+        - bool: True if ADU placement is allowed, False otherwise.
+        """
+        reason = self.get_rejection_reason()
+        if reason != ZONING_APPROVED:
+            logger.info("Zoning Restriction: %s", REJECTION_REASONS[reason])
             return False
 
         return True
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     properties = [
         {"size": 5000, "slope": 5, "zoning_compliance": True},
         {"size": 3000, "slope": 10, "zoning_compliance": True},  # Lot too small
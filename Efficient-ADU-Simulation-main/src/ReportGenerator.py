@@ -0,0 +1,218 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.DesignCharts import load_pyplot
+
+# Metrics summarized per floor-area bin: (result column, chart title, y-axis label)
+BINNED_METRICS = (
+    ("total_cost", "Total Cost by Floor Area", "Cost (USD)"),
+    ("efficiency_score", "Energy Efficiency by Floor Area", "Efficiency Score"),
+    ("daily_energy_usage", "Daily Energy Use by Floor Area", "Energy Use (kWh/day)"),
+    ("cost_per_sqft", "Cost per Sq Ft by Floor Area", "Cost per Sq Ft (USD)"),
+    ("energy_per_sqft", "Energy Use per Sq Ft by Floor Area", "Energy Use (kWh/sq ft)"),
+)
+
+
+def _render_chart(kind, data, path):
+    """
+    Renders one chart from aggregated data (runs in a worker process).
+    """
+    plt = load_pyplot()
+    figure, axes = plt.subplots()
+
+    if kind == "binned":
+        centers = data["centers"]
+        quantiles = data["quantiles"]
+        names = sorted(quantiles, key=lambda name: float(name[1:]))
+        low, high = quantiles[names[0]], quantiles[names[-1]]
+        axes.fill_between(centers, low, high, alpha=0.3, label=f"{names[0].upper()}-{names[-1].upper()}")
+        axes.plot(centers, data["median"], marker="o", markersize=3, label="Median")
+        axes.set_xlabel("ADU Floor Area (sq ft)")
+        axes.set_ylabel(data["label"])
+        axes.legend()
+    else:
+        from matplotlib.colors import LogNorm
+        counts = data["counts"].T
+        mesh = axes.pcolormesh(data["x_edges"], data["y_edges"], np.ma.masked_equal(counts, 0),
+                               norm=LogNorm(vmin=1, vmax=max(counts.max(), 1)), shading="flat")
+        figure.colorbar(mesh, ax=axes, label="Designs")
+        axes.set_xlabel("Total Cost (USD)")
+        axes.set_ylabel("Efficiency Score")
+
+    axes.set_title(data["title"])
+    figure.tight_layout()
+    figure.savefig(path)
+    plt.close(figure)
+    return path
+
+
+class ReportGenerator:
+    """
+    This module builds reports for design sweeps of any size. Instead of plotting one point
+    per design, it reduces the result arrays to aggregated views - per floor-area bin
+    quantile bands and medians, and a 2-D histogram of cost vs. efficiency - whose size
+    depends only on the number of bins, then renders the PNGs in parallel.
+    """
+
+    def __init__(self, bins=40, quantiles=(0.1, 0.5, 0.9), histogram_bins=(60, 60), max_workers=None):
+        """
+        Initializes the generator.
+
+        Parameters:
+        - bins (int): Floor-area bins (at most one per distinct floor area).
+        - quantiles (tuple): Quantiles per bin; the outermost two form the band.
+        - histogram_bins (tuple): (cost, efficiency) bins of the 2-D histogram.
+        - max_workers (int): Rendering processes; 0 renders in this process, None uses
+          one process per chart (up to the CPU count).
+        """
+        self.bins = bins
+        self.quantiles = tuple(quantiles)
+        self.histogram_bins = histogram_bins
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _columns(results):
+        """
+        Accepts a dict of result arrays or a list of per-design result dicts and adds the
+        per-square-foot metrics.
+        """
+        if isinstance(results, list):
+            results = {
+                "floor_area": [row["design"]["floor_area"] for row in results],
+                "total_cost": [row["total_cost"] for row in results],
+                "efficiency_score": [row["efficiency_score"] for row in results],
+                "daily_energy_usage": [row["daily_energy_usage"] for row in results],
+            }
+
+        columns = {name: np.asarray(results[name], dtype=np.float64)
+                   for name in ("floor_area", "total_cost", "efficiency_score", "daily_energy_usage")}
+        columns["cost_per_sqft"] = columns["total_cost"] / columns["floor_area"]
+        columns["energy_per_sqft"] = columns["daily_energy_usage"] / columns["floor_area"]
+        return columns
+
+    def _binned_quantiles(self, bin_index, values, bin_count):
+        """
+        Exact per-bin quantiles with one sort: values are ordered by (bin, value), so each
+        bin is a contiguous sorted run and every quantile is an index into it.
+        """
+        counts = np.bincount(bin_index, minlength=bin_count)
+        if len(values) == 0:
+            return {quantile: np.full(bin_count, np.nan) for quantile in (0.5,) + self.quantiles}, counts
+
+        # Sort by value, then stably by bin (a radix sort on the small bin codes)
+        order = np.argsort(values)
+        order = order[np.argsort(bin_index[order], kind="stable")]
+        sorted_values = values[order]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        last = np.maximum(counts - 1, 0)
+        occupied = counts > 0
+
+        results = {}
+        for quantile in (0.5,) + self.quantiles:
+            # Linear interpolation between the two closest ranks, as np.quantile does
+            position = quantile * last
+            lower = np.floor(position).astype(np.int64)
+            upper = np.minimum(lower + 1, last)
+            low_values = sorted_values[np.where(occupied, starts + lower, 0)]
+            high_values = sorted_values[np.where(occupied, starts + upper, 0)]
+            results[quantile] = np.where(occupied, low_values + (high_values - low_values) * (position - lower), np.nan)
+        return results, counts
+
+    def aggregate(self, results):
+        """
+        Reduces sweep results to fixed-size aggregated views.
+
+        Parameters:
+        - results (dict or list): Arrays "floor_area", "total_cost", "efficiency_score" and
+          "daily_energy_usage" (e.g. run_simulation_batch()["all_designs"] plus the floor
+          areas), or the "all_designs" list of run_simulation().
+
+        Returns:
+        - dict: "binned" maps each metric to bin "edges", "centers", "counts", "median" and
+          "quantiles" (e.g. "p10"); "histogram" holds "counts", "x_edges" (cost) and
+          "y_edges" (efficiency); "design_count" is the number of designs.
+        """
+        columns = self._columns(results)
+        floor_area = columns["floor_area"]
+
+        distinct = np.unique(floor_area)
+        if len(distinct) <= self.bins:
+            # One bin per distinct floor area (the usual case for a stepped sweep)
+            edges = np.append(distinct, distinct[-1] + 1) if len(distinct) else np.array([0.0, 1.0])
+            centers = distinct.astype(np.float64)
+            bin_index = np.searchsorted(distinct, floor_area)
+        else:
+            edges = np.linspace(distinct[0], distinct[-1], self.bins + 1)
+            centers = (edges[:-1] + edges[1:]) / 2
+            bin_index = np.clip(np.searchsorted(edges, floor_area, side="right") - 1, 0, self.bins - 1)
+        bin_count = len(centers)
+        bin_index = bin_index.astype(np.int16 if bin_count < 2 ** 15 else np.int64)
+
+        binned = {}
+        for name, _, _ in BINNED_METRICS:
+            values, counts = self._binned_quantiles(bin_index, columns[name], bin_count)
+            binned[name] = {
+                "edges": edges,
+                "centers": centers,
+                "counts": counts,
+                "median": values[0.5],
+                "quantiles": {f"p{round(quantile * 100)}": values[quantile] for quantile in self.quantiles}
+            }
+
+        counts, x_edges, y_edges = np.histogram2d(columns["total_cost"], columns["efficiency_score"],
+                                                  bins=self.histogram_bins)
+        return {
+            "design_count": len(floor_area),
+            "binned": binned,
+            "histogram": {"counts": counts.astype(np.int64), "x_edges": x_edges, "y_edges": y_edges}
+        }
+
+    def render(self, aggregates, output_dir="."):
+        """
+        Renders the aggregated views as PNG files, one chart per worker process.
+
+        Parameters:
+        - aggregates (dict): Value returned by aggregate().
+        - output_dir (str): Directory for the PNG files.
+
+        Returns:
+        - list: Paths of the written PNG files.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        tasks = []
+        for name, title, label in BINNED_METRICS:
+            data = {**aggregates["binned"][name], "title": title, "label": label}
+            tasks.append(("binned", data, os.path.join(output_dir, f"{name}_by_floor_area.png")))
+        tasks.append(("histogram", {**aggregates["histogram"], "title": "Total Cost vs. Energy Efficiency"},
+                      os.path.join(output_dir, "cost_vs_efficiency_histogram.png")))
+
+        if self.max_workers == 0:
+            return [_render_chart(*task) for task in tasks]
+
+        # Import matplotlib once here so forked workers start with it already loaded
+        load_pyplot()
+        max_workers = min(len(tasks), self.max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_render_chart, *task) for task in tasks]
+            return [future.result() for future in futures]
+
+    def generate(self, results, output_dir="."):
+        """
+        Aggregates the results and renders the report.
+
+        Returns:
+        - list: Paths of the written PNG files.
+        """
+        return self.render(self.aggregate(results), output_dir)
+
+# Example usage
+if __name__ == "__main__":
+    from src.DesignSpace import DesignSpace
+    from src.SimulationEngine import SimulationEngine
+
+    property_data = {"size": 5000, "slope": 5, "zoning_compliance": True}
+    designs = DesignSpace(range(400, 1201, 5)).sample_random(100000, seed=0, replace=True)
+    results = SimulationEngine().run_simulation_batch(property_data, designs)
+
+    paths = ReportGenerator().generate({**results["all_designs"], "floor_area": designs.floor_area}, "reports")
+    print(f"Saved {len(paths)} charts to reports/")
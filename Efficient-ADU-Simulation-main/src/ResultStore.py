@@ -0,0 +1,120 @@
+import hashlib
+import json
+import sqlite3
+
+class ResultStore:
+    """
+    This module persists simulation results in a SQLite database so repeated runs (e.g.
+    nightly county re-runs) only recompute what changed. Each row holds the run_simulation()
+    result for one parcel against one design catalog and is keyed by a hash of the parcel
+    record and a hash of the design catalog; the hash of the model-parameter fingerprint
+    is stored alongside, and a row is only reused while all three still match.
+    """
+
+    def __init__(self, path=":memory:"):
+        """
+        Opens (or creates) the store.
+
+        Parameters:
+        - path (str): SQLite database file (default: an in-memory store).
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # Write-ahead logging: readers are not blocked by a running job, and each chunk's
+        # transaction does not need a full sync to disk
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " parcel_hash TEXT NOT NULL,"
+            " design_hash TEXT NOT NULL,"
+            " parameter_hash TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " PRIMARY KEY (parcel_hash, design_hash))")
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_record(record):
+        """
+        Hashes any JSON-serializable record (parcel dict, design list, parameter fingerprint).
+
+        Returns:
+        - str: Hex digest, stable across processes and runs.
+        """
+        encoded = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+    def lookup(self, parcel_hashes, design_hash, parameter_hash):
+        """
+        Fetches the stored results that are still valid.
+
+        Parameters:
+        - parcel_hashes (list): Parcel hashes to look up.
+        - design_hash (str): Hash of the design catalog.
+        - parameter_hash (str): Hash of the current model-parameter fingerprint.
+
+        Returns:
+        - dict: Parcel hash to stored result, for the valid rows only.
+        """
+        found = {}
+        # Stay below SQLite's limit on bound parameters per statement
+        for start in range(0, len(parcel_hashes), 500):
+            chunk = parcel_hashes[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.connection.execute(
+                f"SELECT parcel_hash, result FROM results WHERE design_hash = ? AND parameter_hash = ?"
+                f" AND parcel_hash IN ({placeholders})", (design_hash, parameter_hash, *chunk))
+            for parcel_hash, result in rows:
+                found[parcel_hash] = json.loads(result)
+
+        self.hits += len(found)
+        self.misses += len(set(parcel_hashes)) - len(found)
+        return found
+
+    def store(self, rows):
+        """
+        Writes results in one transaction, replacing older rows for the same parcel and catalog.
+
+        Parameters:
+        - rows (iterable): (parcel_hash, design_hash, parameter_hash, result) tuples.
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results (parcel_hash, design_hash, parameter_hash, result) VALUES (?, ?, ?, ?)",
+                ((parcel_hash, design_hash, parameter_hash, json.dumps(result))
+                 for parcel_hash, design_hash, parameter_hash, result in rows))
+
+    def prune(self, design_hash, parameter_hash):
+        """
+        Deletes rows computed for another design catalog or other model parameters.
+
+        Returns:
+        - int: Number of deleted rows.
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "DELETE FROM results WHERE design_hash != ? OR parameter_hash != ?", (design_hash, parameter_hash))
+        return cursor.rowcount
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+# Example usage
+if __name__ == "__main__":
+    with ResultStore() as store:
+        parcel_hash = ResultStore.hash_record({"size": 5000, "slope": 5, "zoning_compliance": True})
+        store.store([(parcel_hash, "catalog", "parameters", {"best_design": {"floor_area": 600}})])
+        print(store.lookup([parcel_hash], "catalog", "parameters"))
+        print(store.lookup([parcel_hash], "catalog", "new-parameters"))
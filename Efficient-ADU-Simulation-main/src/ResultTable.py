@@ -0,0 +1,346 @@
+import csv
+from src.LazyImport import lazy_import
+from src.DesignBatch import DesignBatch
+from src.DesignCodes import (MATERIAL_TYPES, HVAC_TYPES, INSULATION_TYPES, decode_category,
+                             round_values)
+
+np = lazy_import("numpy")
+
+# Input design columns (categories stored as DesignCodes codes) and result metric columns
+DESIGN_COLUMNS = ("floor_area", "materials", "hvac", "insulation")
+METRIC_COLUMNS = ("efficiency_score", "daily_energy_usage", "total_cost")
+# Normalized metrics derived from the others: (column, numerator, rounding digits as in main.py)
+DERIVED_COLUMNS = (("energy_per_sqft", "daily_energy_usage", 4), ("cost_per_sqft", "total_cost", 2))
+
+_VOCABULARIES = {"materials": MATERIAL_TYPES, "hvac": HVAC_TYPES, "insulation": INSULATION_TYPES}
+# File extensions accepted by ResultTable.export()
+EXPORT_FORMATS = (".npz", ".csv", ".parquet")
+
+
+class ResultTable:
+    """
+    This module stores simulation results in columnar form: one array per design attribute
+    and per metric instead of one nested dict per design. The per-square-foot metrics are
+    computed as vector operations on first use, columns are handed out as read-only views
+    (no copies), and the whole table can be exported in bulk to .npz, CSV or Parquet.
+
+    Only the four design fields are kept, and categories are stored as DesignCodes codes:
+    a category name outside the vocabulary is stored as "unknown" (code -1) and other design
+    keys are dropped, so such designs do not round-trip exactly.
+    """
+
+    def __init__(self, columns, best_index=None):
+        """
+        Initializes a table from column arrays.
+
+        Parameters:
+        - columns (dict): "floor_area", "materials", "hvac", "insulation" (category codes, see
+          DesignCodes), "efficiency_score", "daily_energy_usage" and "total_cost" arrays.
+        - best_index (int): Index of the best design, if known.
+        """
+        missing = [name for name in DESIGN_COLUMNS + METRIC_COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"Missing result columns: {', '.join(missing)}")
+
+        design = DesignBatch.from_columns(columns)
+        self._columns = {
+            "floor_area": design.floor_area,
+            "materials": design.materials,
+            "hvac": design.hvac,
+            "insulation": design.insulation
+        }
+        for name in METRIC_COLUMNS:
+            self._columns[name] = np.asarray(columns[name], dtype=np.float64)
+
+        if len({len(values) for values in self._columns.values()}) > 1:
+            raise ValueError("All ResultTable columns must have the same length.")
+        self.best_index = best_index
+
+    @classmethod
+    def from_simulation(cls, results, design_table=None):
+        """
+        Builds a table from a simulation result.
+
+        Parameters:
+        - results (dict): A run_simulation() result, or a run_simulation_batch() result
+          together with its design_table.
+        - design_table (DesignBatch or dict): The designs passed to run_simulation_batch().
+
+        Returns:
+        - ResultTable: The results (empty if the simulation returned an error).
+        """
+        if "error" in results:
+            return cls({name: [] for name in DESIGN_COLUMNS + METRIC_COLUMNS})
+
+        design_results = results["all_designs"]
+        if isinstance(design_results, dict):
+            if design_table is None:
+                raise ValueError("A run_simulation_batch() result needs its design_table.")
+            if isinstance(design_table, DesignBatch):
+                design_table = design_table.columns()
+            best_index = results.get("best_index")
+            design_index = results.get("design_index")
+            if design_index is not None:
+                # Only the designs allowed by the zoning rules were evaluated
+                design_table = {name: np.asarray(values)[design_index] for name, values in design_table.items()}
+                if best_index is not None:
+                    best_index = int(np.searchsorted(design_index, best_index))
+            return cls({**design_table, **design_results}, best_index)
+
+        table = cls.from_rows(design_results)
+        best_design = results.get("best_design")
+        for index, row in enumerate(design_results):
+            if row["design"] == best_design:
+                table.best_index = index
+                break
+        return table
+
+    @classmethod
+    def from_rows(cls, design_results):
+        """
+        Builds a table from the "all_designs" list of run_simulation(). Unknown category
+        names and extra design keys are not kept (see the class docstring).
+
+        Parameters:
+        - design_results (list): Per-design result dicts with "design" and the metrics.
+
+        Returns:
+        - ResultTable: The results.
+        """
+        columns = DesignBatch.from_dicts([row["design"] for row in design_results]).columns()
+        for name in METRIC_COLUMNS:
+            columns[name] = [row[name] for row in design_results]
+        return cls(columns)
+
+    @classmethod
+    def concatenate(cls, tables):
+        """
+        Joins several tables into one (best_index is not carried over).
+
+        Parameters:
+        - tables (list): ResultTable instances.
+
+        Returns:
+        - ResultTable: All rows, in order.
+        """
+        tables = list(tables)
+        return cls({name: np.concatenate([table._columns[name] for table in tables])
+                    for name in DESIGN_COLUMNS + METRIC_COLUMNS})
+
+    @classmethod
+    def from_npz(cls, path):
+        """
+        Loads a table written by to_npz().
+
+        Parameters:
+        - path (str): Path of the .npz file.
+
+        Returns:
+        - ResultTable: The results.
+        """
+        with np.load(path) as archive:
+            columns = {name: archive[name] for name in DESIGN_COLUMNS + METRIC_COLUMNS}
+            best_index = int(archive["best_index"]) if "best_index" in archive.files else None
+        return cls(columns, best_index)
+
+    def _derived(self, name):
+        values = self._columns.get(name)
+        if values is None:
+            numerator, ndigits = next((numerator, ndigits) for column, numerator, ndigits in DERIVED_COLUMNS
+                                      if column == name)
+            floor_area = self._columns["floor_area"].astype(np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = round_values(self._columns[numerator] / floor_area, ndigits)
+            self._columns[name] = values
+        return values
+
+    @property
+    def energy_per_sqft(self):
+        """
+        Returns:
+        - np.ndarray: Daily energy use per square foot (kWh, rounded to 4 digits), read-only.
+        """
+        return self.column("energy_per_sqft")
+
+    @property
+    def cost_per_sqft(self):
+        """
+        Returns:
+        - np.ndarray: Total cost per square foot (USD, rounded to 2 digits), read-only.
+        """
+        return self.column("cost_per_sqft")
+
+    @property
+    def column_names(self):
+        """
+        Returns:
+        - tuple: All column names, derived metrics last.
+        """
+        return DESIGN_COLUMNS + METRIC_COLUMNS + tuple(name for name, _, _ in DERIVED_COLUMNS)
+
+    def column(self, name):
+        """
+        Returns one column as a read-only view of the table's storage (no copy is made).
+
+        Parameters:
+        - name (str): Column name (see column_names).
+
+        Returns:
+        - np.ndarray: The column; categorical columns hold DesignCodes codes.
+        """
+        if name not in self.column_names:
+            raise KeyError(f"Unknown result column: {name}")
+        view = self._derived(name).view()
+        view.flags.writeable = False
+        return view
+
+    def columns(self, names=None):
+        """
+        Returns several columns as read-only views.
+
+        Parameters:
+        - names (iterable): Column names (default: all of them).
+
+        Returns:
+        - dict: Column name to array.
+        """
+        return {name: self.column(name) for name in (names or self.column_names)}
+
+    @property
+    def nbytes(self):
+        """
+        Returns:
+        - int: Memory used by the stored column arrays in bytes.
+        """
+        return sum(values.nbytes for values in self._columns.values())
+
+    def __len__(self):
+        return len(self._columns["floor_area"])
+
+    def __getitem__(self, index):
+        """
+        Returns a single row as a run_simulation() result dict for an integer index, or a
+        sub-table for a slice, index array or boolean mask (slices share memory).
+        """
+        if isinstance(index, (int, np.integer)):
+            return {
+                "design": {
+                    "floor_area": self._columns["floor_area"][index].item(),
+                    **{name: decode_category(self._columns[name][index], vocabulary)
+                       for name, vocabulary in _VOCABULARIES.items()}
+                },
+                **{name: self._columns[name][index].item() for name in METRIC_COLUMNS}
+            }
+        return ResultTable({name: self._columns[name][index] for name in DESIGN_COLUMNS + METRIC_COLUMNS})
+
+    def to_dicts(self):
+        """
+        Converts the table back to the "all_designs" list form of run_simulation(). This is
+        lossy for out-of-vocabulary designs: unknown categories come back as None and extra
+        design keys are missing.
+
+        Returns:
+        - list: Per-design result dicts.
+        """
+        return [self[index] for index in range(len(self))]
+
+    def to_npz(self, path, compressed=False):
+        """
+        Writes every column (including the derived metrics) to a NumPy .npz archive.
+
+        Parameters:
+        - path (str): Output path.
+        - compressed (bool): Use np.savez_compressed.
+        """
+        columns = self.columns()
+        if self.best_index is not None:
+            columns["best_index"] = np.asarray(self.best_index)
+        (np.savez_compressed if compressed else np.savez)(path, **columns)
+
+    def to_csv(self, path, chunk_size=100000):
+        """
+        Writes the table as CSV with category names instead of codes (empty for unknown
+        categories), chunk by chunk.
+
+        Parameters:
+        - path (str): Output path.
+        - chunk_size (int): Rows converted to Python values at a time.
+        """
+        names = self.column_names
+        # Code -1 (unknown category) indexes the trailing empty name
+        lookups = {name: list(vocabulary) + [""] for name, vocabulary in _VOCABULARIES.items()}
+        columns = self.columns()
+
+        with open(path, "w", newline="") as output_file:
+            writer = csv.writer(output_file)
+            writer.writerow(names)
+            for start in range(0, len(self), chunk_size):
+                chunk = []
+                for name in names:
+                    values = columns[name][start:start + chunk_size].tolist()
+                    if name in lookups:
+                        values = [lookups[name][code] for code in values]
+                    chunk.append(values)
+                writer.writerows(zip(*chunk))
+
+    def to_parquet(self, path):
+        """
+        Writes the table to a Parquet file with dictionary-encoded category columns.
+
+        Parameters:
+        - path (str): Output path.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Writing Parquet result files requires pyarrow (pip install pyarrow).") from exc
+
+        arrays = {}
+        for name, values in self.columns().items():
+            if name in _VOCABULARIES:
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(values, mask=values < 0), pa.array(_VOCABULARIES[name]))
+            else:
+                arrays[name] = pa.array(values)
+        pq.write_table(pa.table(arrays), path)
+
+    @staticmethod
+    def check_export_path(path):
+        """
+        Checks that export() supports a path's file extension, e.g. before a long run.
+
+        Parameters:
+        - path (str): Output path.
+        """
+        if not path.endswith(EXPORT_FORMATS):
+            raise ValueError(f"Unsupported result file format: {path} (use {', '.join(EXPORT_FORMATS)})")
+
+    def export(self, path):
+        """
+        Writes the table in the format given by the file extension (.npz, .csv or .parquet).
+
+        Parameters:
+        - path (str): Output path.
+        """
+        self.check_export_path(path)
+        if path.endswith(".npz"):
+            self.to_npz(path)
+        elif path.endswith(".csv"):
+            self.to_csv(path)
+        else:
+            self.to_parquet(path)
+
+# Example usage
+if __name__ == "__main__":
+    from src.DesignSpace import DesignSpace
+    from src.SimulationEngine import SimulationEngine
+
+    property_data = {"size": 5000, "slope": 5, "zoning_compliance": True}
+    designs = DesignSpace(range(400, 1201, 5)).sample_random(100000, seed=0, replace=True)
+    results = SimulationEngine().run_simulation_batch(property_data, designs)
+
+    table = ResultTable.from_simulation(results, designs)
+    print(f"{len(table):,} results in {table.nbytes / 1e6:.1f} MB, best: {table[table.best_index]}")
+    print(f"Median cost per sq ft: ${np.median(table.cost_per_sqft):.2f}")
+    table.to_npz("results.npz")
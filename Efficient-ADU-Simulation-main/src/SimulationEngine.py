@@ -1,9 +1,20 @@
+import logging
+from collections import Counter
+from src.LazyImport import lazy_import
 from src.PropertyModel import PropertyModel
 from src.ADUDesign import ADUDesign
 from src.EnergyModel import EnergyModel
 from src.CostEstimator import CostEstimator
-from src.GISAnalyzer import GISAnalyzer
+from src.GISAnalyzer import GISAnalyzer, ZONING_APPROVED, ZONING_NONCOMPLIANT, REJECTION_REASONS
 from src.OptimizationModule import OptimizationModule
+from src.DesignCodes import MATERIAL_TYPES, HVAC_TYPES, INSULATION_TYPES, decode_category
+from src.DesignBatch import DesignBatch
+from src.DesignResultCache import DesignResultCache
+from src.Instrumentation import NULL_INSTRUMENTATION
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
 
 class SimulationEngine:
     """
@@ -11,68 +22,448 @@ class SimulationEngine:
     construction cost estimation, GIS analysis, and optimization.
     """
 
-    def __init__(self):
+    def __init__(self, cache_size=None, unified_scoring=False, instrumentation=None, zoning_rules=None):
+        """
+        Initializes the engine and its models.
+
+        Parameters:
+        - cache_size (int): Enables a DesignResultCache of this many designs so repeated
+          designs across parcels are looked up instead of recomputed by run_simulation
+          (default: no cache). The batch methods are vectorized and do not use it.
+        - unified_scoring (bool): Rank designs on the engine's own CostEstimator and
+          EnergyModel numbers instead of the OptimizationModule's built-in estimates.
+        - instrumentation (Instrumentation): Collects per-stage timings (and optionally a
+          profile) of every run; the report is added to the results as "instrumentation".
+          Disabled by default at near-zero cost.
+        - zoning_rules (ZoningRuleEngine): Per-jurisdiction rules applied to every property
+          (by its "jurisdiction" key) instead of the PropertyModel and GISAnalyzer checks.
+          Designs above a jurisdiction's floor-area limits are left out of the results.
+        """
         self.energy_model = EnergyModel()
         self.cost_estimator = CostEstimator()
         self.gis_analyzer = GISAnalyzer()
-        self.optimization_module = OptimizationModule()
+        if unified_scoring:
+            self.optimization_module = OptimizationModule(self.cost_estimator, self.energy_model)
+        else:
+            self.optimization_module = OptimizationModule()
 
-    def run_simulation(self, property_data, adu_designs):
+        # Aggregated rejection counts per reason code (see get_rejection_counts)
+        self.rejection_counts = Counter()
+
+        self.result_cache = DesignResultCache(cache_size) if cache_size else None
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.zoning_rules = zoning_rules
+
+    def get_rejection_counts(self, reset=False):
         """
-        Runs the simulation for ADU feasibility.
+        Returns how many properties were rejected for each reason since the last reset.
 
         Parameters:
-        - property_data (dict): Information about the property (size, slope, zoning compliance).
-        - adu_designs (list): A list of possible ADU designs.
+        - reset (bool): Clear the counters afterwards (e.g. at the end of a batch run).
 
         Returns:
-        - dict: Simulation results including best design, energy efficiency, and cost estimates.
+        - dict: Rejection message to count.
         """
+        counts = {REJECTION_REASONS[reason]: count for reason, count in sorted(self.rejection_counts.items())}
+        if reset:
+            self.rejection_counts.clear()
+        return counts
 
-        print("\nStarting ADU Simulation...")
+    def parameter_fingerprint(self):
+        """
+        Returns a snapshot of every model parameter and zoning rule that affects the results.
 
+        Returns:
+        - tuple: Changes whenever any model's parameters change.
+        """
+        return (self.energy_model.parameter_fingerprint(),
+                self.cost_estimator.parameter_fingerprint(),
+                self.optimization_module.parameter_fingerprint(),
+                tuple(sorted(self.gis_analyzer.zoning_restrictions.items())),
+                self.gis_analyzer.overlay_fingerprint(),
+                self.zoning_rules.parameter_fingerprint() if self.zoning_rules is not None else None)
+
+    def _check_property(self, property_data):
+        """
+        Validates the property constraints and GIS zoning rules shared by every run mode.
+        When the GISAnalyzer has polygon overlays, a property with coordinates has its
+        zoning_compliance flag derived from them instead of taken from the input. With
+        zoning_rules, the rule engine alone decides (including the flood-zone check).
+
+        Parameters:
+        - property_data (dict): Information about the property (size, slope, zoning compliance).
+
+        Returns:
+        - dict or None: An error result if the property is rejected, None otherwise.
+        """
         # Validate Property Constraints
-        property_model = PropertyModel(property_data)
-        constraints = property_model.get_constraints()
-        if not constraints["zoning_compliance"]:
-            print("Property does not comply with zoning laws. Simulation terminated.")
+        with self.instrumentation.stage("property_validation", 1):
+            property_data = self.gis_analyzer.resolve_zoning_compliance(property_data)
+            if self.zoning_rules is None:
+                constraints = PropertyModel(property_data).get_constraints()
+        if self.zoning_rules is None and not constraints["zoning_compliance"]:
+            self.rejection_counts[ZONING_NONCOMPLIANT] += 1
+            logger.info("Property does not comply with zoning laws. Simulation terminated.")
             return {"error": "Property does not meet zoning requirements."}
 
         # GIS Analysis
-        zoning_approved = self.gis_analyzer.analyze_zoning_constraints(property_data)
-        if not zoning_approved:
-            print("ADU placement is not permitted due to zoning restrictions.")
+        with self.instrumentation.stage("gis_checks", 1):
+            if self.zoning_rules is not None:
+                reason = self.zoning_rules.check_property(property_data)
+            else:
+                reason = self.gis_analyzer.check_zoning_constraints(property_data)
+        if reason != ZONING_APPROVED:
+            self.rejection_counts[reason] += 1
+            logger.info("ADU placement is not permitted due to zoning restrictions: %s", REJECTION_REASONS[reason])
             return {"error": "Zoning constraints prevent ADU placement."}
 
-        # Evaluate each ADU design
+        return None
+
+    def _allowed_designs(self, property_data, floor_area):
+        """
+        Returns a bool mask of the designs the property's jurisdiction allows, or None when
+        every design is allowed (no zoning_rules, or none of the designs is rejected).
+        """
+        if self.zoning_rules is None:
+            return None
+        allowed = self.zoning_rules.allowed_designs(property_data, floor_area)
+        return None if allowed.all() else allowed
+
+    def run_simulation(self, property_data, adu_designs):
+        """
+        Runs the simulation for ADU feasibility.
+
+        Parameters:
+        - property_data (dict): Information about the property (size, slope, zoning compliance).
+        - adu_designs (list or DesignBatch): A list of possible ADU designs. A DesignBatch is
+          evaluated through run_simulation_batch().
+
+        Returns:
+        - dict: Simulation results including best design, energy efficiency, and cost estimates.
+        """
+        if isinstance(adu_designs, DesignBatch):
+            return self.run_simulation_batch(property_data, adu_designs)
+
+        return self._instrumented_run(self._run_simulation, property_data, adu_designs)
+
+    def _instrumented_run(self, run, property_data, designs):
+        """
+        Times a whole run (profiling it if requested) and attaches the instrumentation report.
+        """
+        instrumentation = self.instrumentation
+        with instrumentation.profiled(), instrumentation.stage("run_simulation", 1):
+            simulation_results = run(property_data, designs)
+        if instrumentation.enabled:
+            simulation_results["instrumentation"] = instrumentation.report()
+        return simulation_results
+
+    def _run_simulation(self, property_data, adu_designs):
+        logger.debug("Starting ADU Simulation...")
+
+        error = self._check_property(property_data)
+        if error:
+            return error
+
+        allowed = self._allowed_designs(property_data, [design.get("floor_area", 600) for design in adu_designs])
+        if allowed is not None:
+            adu_designs = [design for design, keep in zip(adu_designs, allowed.tolist()) if keep]
+
+        # Evaluate each ADU design (looking repeated designs up in the cache, if enabled)
+        cache = self.result_cache
+        if cache is not None:
+            version = cache.parameter_version((self.energy_model.parameter_fingerprint(),
+                                               self.cost_estimator.parameter_fingerprint()))
+
         design_results = []
-        for design in adu_designs:
-            efficiency = self.energy_model.compute_efficiency(design)
-            energy_usage = self.energy_model.estimate_daily_energy_usage(design)
-            total_cost = self.cost_estimator.estimate_total_cost(design)
-
-            design_results.append({
-                "design": design,
-                "efficiency_score": efficiency,
-                "daily_energy_usage": energy_usage,
-                "total_cost": total_cost
-            })
+        with self.instrumentation.stage("design_evaluation", len(adu_designs)):
+            for design in adu_designs:
+                cached = None
+                if cache is not None:
+                    key = cache.design_key(design, version)
+                    cached = cache.get(key)
+
+                if cached is not None:
+                    efficiency, energy_usage, total_cost = cached
+                else:
+                    efficiency = self.energy_model.compute_efficiency(design)
+                    energy_usage = self.energy_model.estimate_daily_energy_usage(design)
+                    total_cost = self.cost_estimator.estimate_total_cost(design)
+                    if cache is not None:
+                        cache.put(key, (efficiency, energy_usage, total_cost))
+
+                design_results.append({
+                    "design": design,
+                    "efficiency_score": efficiency,
+                    "daily_energy_usage": energy_usage,
+                    "total_cost": total_cost
+                })
 
         # Find the best ADU design
-        best_design = self.optimization_module.find_optimal_design(adu_designs)
+        with self.instrumentation.stage("optimization", len(adu_designs)):
+            best_design = self.optimization_module.find_optimal_design(adu_designs)
 
         # Compile simulation results
         simulation_results = {
             "best_design": best_design,
             "all_designs": design_results,
-            "zoning_approved": zoning_approved
+            "zoning_approved": True
+        }
+
+        logger.debug("Simulation Completed Successfully.")
+        return simulation_results
+
+    def run_simulation_batch(self, property_data, design_table):
+        """
+        Runs the simulation for a columnar table of designs using vectorized model calls.
+
+        Parameters:
+        - property_data (dict): Information about the property (size, slope, zoning compliance).
+        - design_table (DesignBatch or dict): The designs, or a dict of column arrays
+          "floor_area", "materials", "hvac" and "insulation" with categories given as codes.
+
+        Returns:
+        - dict: Simulation results; "all_designs" holds one array per metric instead of a
+          list of per-design dicts. The numbers match run_simulation() exactly. "scores"
+          holds the OptimizationModule score of every design (e.g. for find_top_designs).
+          If zoning_rules rejected some designs, the metric and score arrays only cover the
+          allowed ones and "design_index" gives their positions in design_table;
+          "best_index" always refers to design_table.
+        """
+        return self._instrumented_run(self._run_simulation_batch, property_data, design_table)
+
+    def _run_simulation_batch(self, property_data, design_table):
+        logger.debug("Starting ADU Batch Simulation...")
+
+        error = self._check_property(property_data)
+        if error:
+            return error
+
+        if isinstance(design_table, DesignBatch):
+            design_table = design_table.columns()
+        allowed = self._allowed_designs(property_data, design_table["floor_area"])
+        design_index = None
+        if allowed is not None:
+            design_index = np.flatnonzero(allowed)
+            design_table = {name: np.asarray(values)[design_index] for name, values in design_table.items()}
+
+        design_results, scores, best_index, best_design = self._evaluate_design_table(design_table)
+        if design_index is not None and best_index is not None:
+            best_index = int(design_index[best_index])
+
+        simulation_results = {
+            "best_design": best_design,
+            "best_index": best_index,
+            "all_designs": design_results,
+            "scores": scores,
+            "zoning_approved": True
         }
+        if design_index is not None:
+            simulation_results["design_index"] = design_index
 
-        print("\nSimulation Completed Successfully.")
+        logger.debug("Batch Simulation Completed Successfully.")
         return simulation_results
 
+    def _evaluate_design_table(self, design_table):
+        """
+        Evaluates and ranks a columnar design table with vectorized model calls.
+
+        Returns:
+        - tuple: (dict of metric arrays, optimization scores, index of the best design, the
+          best design as a dict).
+        """
+        if isinstance(design_table, DesignBatch):
+            design_table = design_table.columns()
+
+        raw_floor_area = np.asarray(design_table["floor_area"])
+        floor_area = raw_floor_area.astype(np.float64)
+        materials = np.asarray(design_table["materials"])
+        hvac = np.asarray(design_table["hvac"])
+        insulation = np.asarray(design_table["insulation"])
+
+        # Evaluate the whole batch at once
+        with self.instrumentation.stage("design_evaluation", len(floor_area)):
+            design_results = {
+                "efficiency_score": self.energy_model.compute_efficiency_batch(materials, hvac, insulation),
+                "daily_energy_usage": self.energy_model.estimate_daily_energy_usage_batch(floor_area, insulation),
+                "total_cost": self.cost_estimator.estimate_total_cost_batch(floor_area, materials, hvac)
+            }
+
+        # Find the best ADU design
+        with self.instrumentation.stage("optimization", len(floor_area)):
+            scores = self.optimization_module.evaluate_design_batch(floor_area, materials, hvac, insulation)
+        # First best design on ties, like find_optimal_design_batch()
+        best_index = int(np.argmax(scores)) if len(scores) else None
+        best_design = None
+        if best_index is not None:
+            best_design = {
+                "floor_area": raw_floor_area[best_index].item(),
+                "materials": decode_category(materials[best_index], MATERIAL_TYPES),
+                "hvac": decode_category(hvac[best_index], HVAC_TYPES),
+                "insulation": decode_category(insulation[best_index], INSULATION_TYPES)
+            }
+        return design_results, scores, best_index, best_design
+
+    def run_simulation_many(self, properties, adu_designs):
+        """
+        Runs the simulation for several properties against the same design catalog. The
+        design results do not depend on the property, so the catalog is evaluated once with
+        vectorized model calls and only the property checks run per property.
+
+        Parameters:
+        - properties (iterable): Property dicts.
+        - adu_designs (list): Design dicts evaluated for every property.
+
+        Returns:
+        - list: One result per property, identical to run_simulation(). Accepted properties
+          share the same "all_designs" list; copy it before modifying one result.
+        """
+        properties = list(properties)
+        results = [self._check_property(property_data) for property_data in properties]
+        if all(results):
+            return results
+
+        shared = {"best_design": None, "all_designs": [], "zoning_approved": True}
+        if adu_designs:
+            design_table = DesignBatch.from_dicts(adu_designs)
+            design_results, scores, best_index, _ = self._evaluate_design_table(design_table)
+
+            metrics = zip(design_results["efficiency_score"].tolist(), design_results["daily_energy_usage"].tolist(),
+                          design_results["total_cost"].tolist())
+            shared["best_design"] = adu_designs[best_index]
+            shared["all_designs"] = [
+                {"design": design, "efficiency_score": efficiency, "daily_energy_usage": energy_usage,
+                 "total_cost": total_cost}
+                for design, (efficiency, energy_usage, total_cost) in zip(adu_designs, metrics)
+            ]
+
+            # Jurisdictions with floor-area limits keep only their allowed designs
+            for position, property_data in enumerate(properties):
+                allowed = None if results[position] else self._allowed_designs(property_data,
+                                                                                 design_table.floor_area)
+                if allowed is not None:
+                    indices = np.flatnonzero(allowed)
+                    results[position] = {
+                        "best_design": adu_designs[indices[np.argmax(scores[indices])]] if len(indices) else None,
+                        "all_designs": [shared["all_designs"][index] for index in indices.tolist()],
+                        "zoning_approved": True
+                    }
+
+        return [error or dict(shared) for error in results]
+
+    def run_simulation_stream(self, properties, adu_designs):
+        """
+        Runs the simulation for a stream of properties, one at a time.
+
+        Parameters:
+        - properties (iterable): Property dicts, e.g. a ParcelReader; consumed lazily.
+        - adu_designs (list or DesignBatch): Design catalog evaluated for every property.
+
+        Yields:
+        - dict: The run_simulation() result for each property, in input order.
+        """
+        for property_data in properties:
+            yield self.run_simulation(property_data, adu_designs)
+
+    def run_simulation_incremental(self, properties, adu_designs, store, chunk_size=1000):
+        """
+        Runs the simulation for a stream of properties, reusing results from a ResultStore.
+        Only parcels whose record, design catalog or model parameters changed since they
+        were stored are simulated again; everything else is streamed out of the store. The
+        model parameters are fingerprinted per chunk, so a parameter change made while the
+        results are being consumed applies to (and is stored under) the following chunks.
+
+        Parameters:
+        - properties (iterable): Property dicts, e.g. a ParcelReader; consumed lazily.
+        - adu_designs (list or DesignBatch): Design catalog evaluated for every property.
+        - store (ResultStore): Persistent store read from and updated with new results.
+        - chunk_size (int): Parcels per store lookup / write transaction.
+
+        Yields:
+        - dict: The run_simulation() result for each property, in input order. Results are
+          stored without the "instrumentation" report (it describes the run that produced
+          them), so only freshly simulated results carry it when instrumentation is enabled.
+        """
+        if isinstance(adu_designs, DesignBatch):
+            adu_designs = adu_designs.to_dicts()
+
+        design_hash = store.hash_record(adu_designs)
+
+        def process(chunk):
+            parameter_hash = store.hash_record(self.parameter_fingerprint())
+            parcel_hashes = [store.hash_record(property_data) for property_data in chunk]
+            stored = store.lookup(parcel_hashes, design_hash, parameter_hash)
+
+            new_rows = []
+            results = []
+            for property_data, parcel_hash in zip(chunk, parcel_hashes):
+                packed = stored.get(parcel_hash)
+                if packed is not None:
+                    result = self._unpack_result(packed, adu_designs)
+                else:
+                    result = self.run_simulation(property_data, adu_designs)
+                    stored[parcel_hash] = packed = self._pack_result(result, adu_designs)
+                    new_rows.append((parcel_hash, design_hash, parameter_hash, packed))
+                results.append(result)
+
+            store.store(new_rows)
+            return results
+
+        chunk = []
+        for property_data in properties:
+            chunk.append(property_data)
+            if len(chunk) >= chunk_size:
+                yield from process(chunk)
+                chunk = []
+        if chunk:
+            yield from process(chunk)
+
+    @staticmethod
+    def _pack_result(result, adu_designs):
+        """
+        Compacts a run_simulation() result for storage: designs are stored as catalog
+        indices and the per-design metrics as plain rows. The "instrumentation" report is
+        not stored.
+        """
+        if "error" in result:
+            return {"error": result["error"]}
+        best_design = result["best_design"]
+        packed = {
+            "best_index": None if best_design is None else adu_designs.index(best_design),
+            "metrics": [[row["efficiency_score"], row["daily_energy_usage"], row["total_cost"]]
+                        for row in result["all_designs"]],
+            "zoning_approved": result["zoning_approved"]
+        }
+        if len(result["all_designs"]) != len(adu_designs):
+            # Zoning rules left some designs out; the kept rows reuse the catalog's design
+            # objects in catalog order, so their indices are found in one forward pass
+            positions = iter(range(len(adu_designs)))
+            packed["design_indices"] = [next(index for index in positions if adu_designs[index] is row["design"])
+                                        for row in result["all_designs"]]
+        return packed
+
+    @staticmethod
+    def _unpack_result(packed, adu_designs):
+        """
+        Rebuilds the run_simulation() result stored by _pack_result().
+        """
+        if "error" in packed:
+            return {"error": packed["error"]}
+        best_index = packed["best_index"]
+        designs = adu_designs
+        if "design_indices" in packed:
+            designs = [adu_designs[index] for index in packed["design_indices"]]
+        return {
+            "best_design": None if best_index is None else adu_designs[best_index],
+            "all_designs": [{"design": design, "efficiency_score": efficiency, "daily_energy_usage": energy_usage,
+                             "total_cost": total_cost}
+                            for design, (efficiency, energy_usage, total_cost) in zip(designs, packed["metrics"])],
+            "zoning_approved": packed["zoning_approved"]
+        }
+
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     simulation_engine = SimulationEngine()
 
     # Sample property data
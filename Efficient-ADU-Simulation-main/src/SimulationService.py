@@ -0,0 +1,290 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from src.SimulationEngine import SimulationEngine
+
+logger = logging.getLogger(__name__)
+
+_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+_CATEGORY_FIELDS = ("materials", "hvac", "insulation")
+
+
+def _is_valid_design(design):
+    """
+    Checks the field types of one requested design: a numeric floor_area and string
+    category names, where given. Missing fields are allowed and take the models' defaults
+    (600 sq ft, as in ADUDesign), like run_simulation().
+    """
+    if not isinstance(design, dict):
+        return False
+    floor_area = design.get("floor_area", 600)
+    if isinstance(floor_area, bool) or not isinstance(floor_area, (int, float)):
+        return False
+    return all(isinstance(design[name], str) for name in _CATEGORY_FIELDS if name in design)
+
+
+class SimulationService:
+    """
+    This module serves SimulationEngine.run_simulation as a local HTTP/JSON service built on
+    asyncio. Concurrent requests are queued and micro-batched: the requests arriving within
+    a short window are grouped by design catalog and each group is evaluated in one
+    vectorized call (SimulationEngine.run_simulation_many) on a single warm engine.
+    Latency percentiles and queue depth are exposed as metrics.
+
+    Endpoints:
+    - POST /simulate: {"property": {...}, "designs": [...]} (designs default to the
+      service's catalog); returns the run_simulation() result.
+    - GET /metrics: request counts, batch sizes, p50/p99 latency and queue depth.
+    - GET /health: {"status": "ok"}.
+    """
+
+    def __init__(self, engine=None, designs=None, host="127.0.0.1", port=8080, batch_window=0.005,
+                 max_batch_size=256, max_body_bytes=1_000_000, latency_window=10000):
+        """
+        Initializes the service (call start() or serve_forever() to listen).
+
+        Parameters:
+        - engine (SimulationEngine): Engine kept warm for every request (default: a new one).
+        - designs (list): Default design catalog for requests without "designs".
+        - host, port: Listening address; port 0 picks a free port.
+        - batch_window (float): Seconds to wait for more requests after the first one.
+        - max_batch_size (int): Maximum requests evaluated in one batch.
+        - max_body_bytes (int): Largest accepted request body.
+        - latency_window (int): Number of recent requests used for latency percentiles.
+        """
+        self.engine = engine or SimulationEngine()
+        self.designs = designs or []
+        self.host = host
+        self.port = port
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_body_bytes = max_body_bytes
+
+        self.queue = None
+        self.server = None
+        self._batcher = None
+        # One worker thread: the engine is not shared between threads, and the event loop
+        # keeps accepting requests while a batch is evaluated
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        self.latencies = deque(maxlen=latency_window)
+        self.request_count = 0
+        self.batch_count = 0
+        self.batched_requests = 0
+        self.max_queue_depth = 0
+
+    async def start(self):
+        """
+        Starts listening and the batching task.
+
+        Returns:
+        - tuple: The (host, port) actually bound.
+        """
+        self.queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.host, self.port = self.server.sockets[0].getsockname()[:2]
+        logger.info("Simulation service listening on http://%s:%s", self.host, self.port)
+        return self.host, self.port
+
+    async def stop(self):
+        """
+        Stops listening and cancels the batching task.
+        """
+        self.server.close()
+        await self.server.wait_closed()
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+        self._executor.shutdown(wait=True)
+
+    def serve_forever(self):
+        """
+        Runs the service until interrupted.
+        """
+        async def serve():
+            await self.start()
+            async with self.server:
+                await self.server.serve_forever()
+
+        asyncio.run(serve())
+
+    async def submit(self, property_data, designs=None):
+        """
+        Queues one simulation and waits for its batch to be evaluated.
+
+        Parameters:
+        - property_data (dict): Information about the property.
+        - designs (list): Design catalog (default: the service's catalog).
+
+        Returns:
+        - dict: The run_simulation() result.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((property_data, self.designs if designs is None else designs, future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return await future
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.batch_count += 1
+            self.batched_requests += len(batch)
+            try:
+                results = await loop.run_in_executor(self._executor, self._evaluate, batch)
+            except Exception as error:
+                logger.exception("Batch evaluation failed")
+                results = [error] * len(batch)
+
+            for (_, _, future), result in zip(batch, results):
+                if future.cancelled():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _evaluate(self, batch):
+        """
+        Evaluates one batch, one vectorized engine call per distinct design catalog. A
+        catalog that fails only fails the requests that sent it.
+        """
+        groups = {}
+        for position, (property_data, designs, _) in enumerate(batch):
+            key = json.dumps(designs, sort_keys=True)
+            groups.setdefault(key, (designs, []))[1].append(position)
+
+        results = [None] * len(batch)
+        for designs, positions in groups.values():
+            try:
+                group_results = self.engine.run_simulation_many([batch[position][0] for position in positions],
+                                                                designs)
+            except Exception as error:
+                logger.exception("Evaluating a design catalog failed")
+                group_results = [error] * len(positions)
+            for position, result in zip(positions, group_results):
+                results[position] = result
+        return results
+
+    def metrics(self):
+        """
+        Returns:
+        - dict: Request and batch counts, mean batch size, p50/p99 latency in milliseconds
+          (over the most recent requests), current and maximum queue depth.
+        """
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+        return {
+            "requests": self.request_count,
+            "batches": self.batch_count,
+            "mean_batch_size": self.batched_requests / self.batch_count if self.batch_count else None,
+            "latency_ms": {"p50": percentile(0.50), "p99": percentile(0.99)},
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth
+        }
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0) or 0)
+                if length > self.max_body_bytes:
+                    await self._respond(writer, 413, {"error": "Request body too large."}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                parts = request_line.decode("latin-1").split()
+                method, path = (parts[0], parts[1]) if len(parts) >= 2 else ("", "")
+                status, payload = await self._route(method, path.split("?")[0], body)
+
+                keep_alive = headers.get("connection", "").lower() != "close" and not request_line.endswith(b"HTTP/1.0\r\n")
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        if path == "/simulate":
+            if method != "POST":
+                return 405, {"error": "Use POST."}
+            try:
+                request = json.loads(body or b"{}")
+                property_data = request["property"]
+                designs = request.get("designs")
+                # Reject malformed input here so it cannot fail a whole batch
+                if not isinstance(property_data, dict) or not (
+                        designs is None or isinstance(designs, list) and all(map(_is_valid_design, designs))):
+                    raise TypeError
+            except (ValueError, KeyError, TypeError, AttributeError):
+                return 400, {"error": 'Expected a JSON body {"property": {...}, "designs": [...]}.'}
+
+            start = time.perf_counter()
+            try:
+                result = await self.submit(property_data, designs)
+            except Exception as error:
+                return 500, {"error": str(error)}
+            self.latencies.append(time.perf_counter() - start)
+            self.request_count += 1
+            return 200, result
+
+        if path == "/metrics" and method == "GET":
+            return 200, self.metrics()
+        if path == "/health" and method == "GET":
+            return 200, {"status": "ok"}
+        return 404, {"error": f"Unknown endpoint: {method} {path}"}
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    # curl -X POST localhost:8080/simulate -d '{"property": {"size": 5000, "slope": 5, "zoning_compliance": true}}'
+    SimulationService(designs=[
+        {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+        {"floor_area": 750, "materials": "steel_frame", "hvac": "high_efficiency", "insulation": "high_efficiency"},
+        {"floor_area": 900, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+    ]).serve_forever()
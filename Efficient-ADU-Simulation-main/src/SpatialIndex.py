@@ -0,0 +1,316 @@
+import json
+import os
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+
+# Upper bound on the (queries x grid columns) cells gathered at once by the batch queries
+QUERY_CELLS = 1_000_000
+
+class SpatialIndex:
+    """
+    This module indexes parcel (or any point) coordinates on a uniform grid for radius and
+    nearest-neighbour queries. Coordinates are projected to meters with a local
+    equirectangular projection, which is accurate at county scale. Points are stored sorted
+    by grid cell, so any rectangle of cells maps to one contiguous slice per grid column and
+    queries need only a few vectorized binary searches. The index is plain NumPy arrays and
+    can be saved to a directory and memory-mapped back for instant reloads.
+    """
+
+    def __init__(self, latitudes, longitudes, cell_size=500.0):
+        """
+        Builds the index in bulk.
+
+        Parameters:
+        - latitudes (array-like): Point latitudes in degrees.
+        - longitudes (array-like): Point longitudes in degrees.
+        - cell_size (float): Grid cell size in meters (roughly the typical query radius).
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        if latitudes.shape != longitudes.shape:
+            raise ValueError("Latitudes and longitudes must have the same length.")
+
+        self.cell_size = float(cell_size)
+        self.reference_latitude = float(latitudes.mean()) if len(latitudes) else 0.0
+
+        x, y = self.project(latitudes, longitudes)
+        self.origin = (float(x.min()), float(y.min())) if len(x) else (0.0, 0.0)
+        cell_x, cell_y = self._cells(x, y)
+        self.rows = int(cell_y.max()) + 1 if len(cell_y) else 1
+
+        cell_ids = cell_x * self.rows + cell_y
+        self.order = np.argsort(cell_ids, kind="stable")
+        self.cell_ids = cell_ids[self.order]
+        self.x = x[self.order]
+        self.y = y[self.order]
+
+    def project(self, latitudes, longitudes):
+        """
+        Projects coordinates to meters around the index's reference latitude.
+
+        Returns:
+        - tuple: (x, y) arrays in meters.
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        x = EARTH_RADIUS_M * np.radians(longitudes) * np.cos(np.radians(self.reference_latitude))
+        y = EARTH_RADIUS_M * np.radians(latitudes)
+        return x, y
+
+    def _cells(self, x, y):
+        cell_x = np.floor((np.asarray(x) - self.origin[0]) / self.cell_size).astype(np.int64)
+        cell_y = np.floor((np.asarray(y) - self.origin[1]) / self.cell_size).astype(np.int64)
+        return cell_x, cell_y
+
+    def __len__(self):
+        return len(self.order)
+
+    def _candidates(self, x, y, reach):
+        """
+        Returns sorted positions of all points in the cells within reach cells of (x, y).
+        """
+        cell_x, cell_y = self._cells(x, y)
+        columns = np.arange(max(cell_x - reach, 0), cell_x + reach + 1)
+        low_row = max(cell_y - reach, 0)
+        high_row = min(cell_y + reach, self.rows - 1)
+        if len(columns) == 0 or low_row > high_row:
+            return np.array([], dtype=np.int64)
+
+        # Each grid column's rows [low_row, high_row] are one contiguous run of cell ids
+        starts = np.searchsorted(self.cell_ids, columns * self.rows + low_row, side="left")
+        ends = np.searchsorted(self.cell_ids, columns * self.rows + high_row, side="right")
+        runs = [np.arange(start, end) for start, end in zip(starts, ends) if end > start]
+        return np.concatenate(runs) if runs else np.array([], dtype=np.int64)
+
+    def _candidates_batch(self, x, y, reach):
+        """
+        Gathers the candidates of many queries at once (same reach for all of them).
+
+        Returns:
+        - tuple: (positions, query ids), grouped by query in input order; each query's
+          positions are ascending, as from _candidates().
+        """
+        cell_x, cell_y = self._cells(x, y)
+        columns = cell_x[:, None] + np.arange(-reach, reach + 1)
+        low_row = np.maximum(cell_y - reach, 0)[:, None]
+        high_row = np.minimum(cell_y + reach, self.rows - 1)[:, None]
+
+        starts = np.searchsorted(self.cell_ids, columns * self.rows + low_row, side="left")
+        ends = np.searchsorted(self.cell_ids, columns * self.rows + high_row, side="right")
+        lengths = np.where((columns >= 0) & (low_row <= high_row), ends - starts, 0)
+
+        # Expand every (start, length) run into consecutive positions without a Python loop
+        query_ids = np.repeat(np.arange(len(cell_x)), lengths.sum(axis=1))
+        lengths = lengths.ravel()
+        occupied = lengths > 0
+        run_lengths = lengths[occupied]
+        run_offsets = np.cumsum(run_lengths) - run_lengths
+        positions = (np.arange(int(run_lengths.sum())) - np.repeat(run_offsets, run_lengths)
+                     + np.repeat(starts.ravel()[occupied], run_lengths))
+        return positions, query_ids
+
+    def _query_chunks(self, count, reach):
+        step = max(1, QUERY_CELLS // (2 * reach + 1))
+        return (slice(start, start + step) for start in range(0, count, step))
+
+    def query_radius(self, latitude, longitude, radius):
+        """
+        Finds all indexed points within a distance of a location.
+
+        Parameters:
+        - latitude, longitude (float): Query location in degrees.
+        - radius (float): Search radius in meters.
+
+        Returns:
+        - np.ndarray: Original indices of the matching points, ascending.
+        """
+        x, y = self.project(latitude, longitude)
+        positions = self._candidates(x, y, int(np.ceil(radius / self.cell_size)))
+        distance_sq = (self.x[positions] - x) ** 2 + (self.y[positions] - y) ** 2
+        return np.sort(self.order[positions[distance_sq <= radius ** 2]])
+
+    def within_distance(self, latitudes, longitudes, radius):
+        """
+        Flags indexed points lying within a distance of any of the query locations, e.g.
+        "all parcels within 500 m of a flood zone" with the flood-zone points as queries.
+        Queries are processed in vectorized chunks, not one at a time.
+
+        Parameters:
+        - latitudes, longitudes (array-like): Query locations in degrees.
+        - radius (float): Distance in meters.
+
+        Returns:
+        - np.ndarray: Boolean mask over the indexed points (original order).
+        """
+        mask = np.zeros(len(self), dtype=bool)
+        x, y = self.project(np.atleast_1d(latitudes), np.atleast_1d(longitudes))
+        reach = int(np.ceil(radius / self.cell_size))
+        for chunk in self._query_chunks(len(x), reach):
+            positions, query_ids = self._candidates_batch(x[chunk], y[chunk], reach)
+            distance_sq = (self.x[positions] - x[chunk][query_ids]) ** 2 + (self.y[positions] - y[chunk][query_ids]) ** 2
+            mask[self.order[positions[distance_sq <= radius ** 2]]] = True
+        return mask
+
+    def nearest(self, latitude, longitude):
+        """
+        Finds the indexed point closest to a location.
+
+        Parameters:
+        - latitude, longitude (float): Query location in degrees.
+
+        Returns:
+        - tuple: (original index, distance in meters), or (None, inf) for an empty index.
+        """
+        if len(self) == 0:
+            return None, float("inf")
+
+        x, y = self.project(latitude, longitude)
+        cell_x, cell_y = self._cells(x, y)
+        columns = int(self.cell_ids[-1] // self.rows) + 1
+
+        # Start from the ring that reaches the grid, then widen until a point is found
+        reach = max(0, -cell_x, cell_x - columns + 1, -cell_y, cell_y - self.rows + 1, 1)
+        while True:
+            positions = self._candidates(x, y, reach)
+            if len(positions):
+                break
+            reach *= 2
+
+        distance_sq = (self.x[positions] - x) ** 2 + (self.y[positions] - y) ** 2
+        best = int(np.argmin(distance_sq))
+        best_distance = float(np.sqrt(distance_sq[best]))
+
+        # Points outside the searched square are at least reach cells away; search once
+        # more if the best candidate might not be the true nearest point
+        if best_distance > reach * self.cell_size:
+            positions = self._candidates(x, y, int(np.ceil(best_distance / self.cell_size)))
+            distance_sq = (self.x[positions] - x) ** 2 + (self.y[positions] - y) ** 2
+            best = int(np.argmin(distance_sq))
+            best_distance = float(np.sqrt(distance_sq[best]))
+
+        return int(self.order[positions[best]]), best_distance
+
+    def nearest_batch(self, latitudes, longitudes):
+        """
+        Finds the nearest indexed point for many locations (e.g. nearest transit stop for
+        every parcel, with the stops indexed). Same search as nearest(), but all queries
+        sharing a search reach are handled by one vectorized candidate gather, so the
+        Python-level work grows with the number of distinct reaches, not of queries.
+
+        Returns:
+        - tuple: (np.ndarray of original indices, np.ndarray of distances in meters); -1
+          and inf for an empty index.
+        """
+        x, y = self.project(np.atleast_1d(latitudes), np.atleast_1d(longitudes))
+        indices = np.full(len(x), -1, dtype=np.int64)
+        distances = np.full(len(x), np.inf)
+        if len(self) == 0 or len(x) == 0:
+            return indices, distances
+
+        cell_x, cell_y = self._cells(x, y)
+        columns = int(self.cell_ids[-1] // self.rows) + 1
+        reach = np.maximum.reduce([-cell_x, cell_x - columns + 1, -cell_y, cell_y - self.rows + 1,
+                                   np.ones(len(x), dtype=np.int64)])
+
+        # Widen each query's square until it holds a point, then search once more where
+        # the best candidate might not be the true nearest point (as nearest() does)
+        pending = np.arange(len(x))
+        refine = []
+        while len(pending):
+            found = self._nearest_in_reach(x, y, pending, reach, indices, distances)
+            refine.append(found[distances[found] > reach[found] * self.cell_size])
+            pending = pending[indices[pending] < 0]
+            reach[pending] *= 2
+
+        refine = np.concatenate(refine)
+        reach[refine] = np.ceil(distances[refine] / self.cell_size).astype(np.int64)
+        self._nearest_in_reach(x, y, refine, reach, indices, distances)
+        return self.order[indices], distances
+
+    def _nearest_in_reach(self, x, y, queries, reach, indices, distances):
+        """
+        Searches each query's square of reach cells, storing the best sorted position and
+        distance for the queries that have any candidate. Ties go to the lowest position,
+        as with np.argmin in nearest().
+
+        Returns:
+        - np.ndarray: The queries that found a candidate.
+        """
+        found = []
+        for query_reach in np.unique(reach[queries]):
+            group = queries[reach[queries] == query_reach]
+            for chunk in self._query_chunks(len(group), int(query_reach)):
+                chunk_queries = group[chunk]
+                positions, query_ids = self._candidates_batch(x[chunk_queries], y[chunk_queries], int(query_reach))
+                if len(positions) == 0:
+                    continue
+                distance_sq = ((self.x[positions] - x[chunk_queries][query_ids]) ** 2
+                               + (self.y[positions] - y[chunk_queries][query_ids]) ** 2)
+
+                # Per-query minimum over each contiguous run of candidates
+                group_ids, group_starts = np.unique(query_ids, return_index=True)
+                best_sq = np.full(len(chunk_queries), np.inf)
+                best_sq[group_ids] = np.minimum.reduceat(distance_sq, group_starts)
+                at_best = np.flatnonzero(distance_sq == best_sq[query_ids])
+                _, first = np.unique(query_ids[at_best], return_index=True)
+                best = at_best[first]
+
+                hits = chunk_queries[query_ids[best]]
+                indices[hits] = positions[best]
+                distances[hits] = np.sqrt(distance_sq[best])
+                found.append(hits)
+        return np.concatenate(found) if found else np.array([], dtype=np.int64)
+
+    def save(self, directory):
+        """
+        Saves the index as .npy arrays plus a small JSON header.
+
+        Parameters:
+        - directory (str): Target directory (created if needed).
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in ("order", "cell_ids", "x", "y"):
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, "index.json"), "w") as header:
+            json.dump({"cell_size": self.cell_size, "reference_latitude": self.reference_latitude,
+                       "origin": self.origin, "rows": self.rows}, header)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Loads an index written by save().
+
+        Parameters:
+        - directory (str): Directory passed to save().
+        - mmap (bool): Memory-map the arrays instead of reading them (near-instant loads;
+          pages are read from disk only when queries touch them).
+
+        Returns:
+        - SpatialIndex: The loaded index.
+        """
+        with open(os.path.join(directory, "index.json")) as header:
+            meta = json.load(header)
+
+        index = cls.__new__(cls)
+        index.cell_size = meta["cell_size"]
+        index.reference_latitude = meta["reference_latitude"]
+        index.origin = tuple(meta["origin"])
+        index.rows = meta["rows"]
+        for name in ("order", "cell_ids", "x", "y"):
+            setattr(index, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None))
+        return index
+
+# Example usage
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    parcel_latitudes = 34.0 + rng.random(100000) * 0.3
+    parcel_longitudes = -84.5 + rng.random(100000) * 0.3
+
+    index = SpatialIndex(parcel_latitudes, parcel_longitudes, cell_size=500)
+    nearby = index.query_radius(34.15, -84.35, 500)
+    print(f"Parcels within 500 m: {len(nearby)}")
+
+    transit_stops = SpatialIndex([34.10, 34.20, 34.25], [-84.40, -84.30, -84.45])
+    stop, distance = transit_stops.nearest(34.15, -84.35)
+    print(f"Nearest transit stop: {stop} at {distance:,.0f} m")
@@ -0,0 +1,68 @@
+import csv
+import numpy as np
+
+class WeatherData:
+    """
+    This module holds an hourly typical-year weather series (dry-bulb temperature and global
+    horizontal irradiance) used by the time-series energy model.
+    """
+
+    hours_per_year = 8760
+
+    def __init__(self, temperature, irradiance):
+        """
+        Initializes the weather series.
+
+        Parameters:
+        - temperature (array-like): Hourly outdoor temperature in degrees Celsius.
+        - irradiance (array-like): Hourly global horizontal irradiance in W/m^2.
+        """
+        self.temperature = np.asarray(temperature, dtype=np.float64)
+        self.irradiance = np.asarray(irradiance, dtype=np.float64)
+        if self.temperature.shape != self.irradiance.shape or self.temperature.ndim != 1:
+            raise ValueError("Temperature and irradiance must be 1-D series of the same length.")
+
+    @classmethod
+    def from_csv(cls, path, temperature_column="temperature", irradiance_column="irradiance"):
+        """
+        Loads a typical-year CSV file (one row per hour).
+
+        Parameters:
+        - path (str): Path to the weather file.
+        - temperature_column (str): Column with the temperature in degrees Celsius.
+        - irradiance_column (str): Column with the irradiance in W/m^2.
+
+        Returns:
+        - WeatherData: The loaded series.
+        """
+        temperature = []
+        irradiance = []
+        with open(path, newline="") as weather_file:
+            for row in csv.DictReader(weather_file):
+                temperature.append(float(row[temperature_column]))
+                irradiance.append(float(row[irradiance_column]))
+        return cls(temperature, irradiance)
+
+    @classmethod
+    def synthetic(cls, mean_temperature=17.0, seasonal_amplitude=10.0, daily_amplitude=6.0, peak_irradiance=900.0):
+        """
+        Builds a smooth synthetic typical year (seasonal and daily cycles), useful for
+        examples and tests when no weather file is at hand.
+
+        Returns:
+        - WeatherData: 8760 hourly values.
+        """
+        hours = np.arange(cls.hours_per_year)
+        day_of_year = hours // 24
+        hour_of_day = hours % 24
+
+        seasonal = -np.cos(2 * np.pi * (day_of_year - 15) / 365)
+        daily = -np.cos(2 * np.pi * (hour_of_day - 3) / 24)
+        temperature = mean_temperature + seasonal_amplitude * seasonal + daily_amplitude * daily
+
+        daylight = np.clip(np.sin(np.pi * (hour_of_day - 6) / 12), 0, None)
+        irradiance = peak_irradiance * daylight * (0.75 + 0.25 * seasonal)
+        return cls(temperature, irradiance)
+
+    def __len__(self):
+        return len(self.temperature)
@@ -0,0 +1,248 @@
+import copy
+import json
+import numpy as np
+from src.GISAnalyzer import (DEFAULT_ZONING_RULES, ZONING_APPROVED, LOT_TOO_SMALL, SLOPE_TOO_STEEP,
+                             FLOOD_ZONE, SETBACK_VIOLATION, FLOOR_AREA_EXCEEDED)
+
+class ZoningRuleEngine:
+    """
+    This module evaluates per-jurisdiction ADU zoning rules (lot size, slope, flood zones,
+    setbacks and maximum ADU floor area) for whole batches of parcels. Rule sets are loaded
+    from config, each is compiled once into a vectorized predicate that only runs the
+    checks the jurisdiction actually uses, and parcels are grouped by jurisdiction so every
+    rule set is applied in a single pass over its parcels. SimulationEngine uses it in
+    place of GISAnalyzer's fixed rules when given one (see check_property).
+    """
+
+    def __init__(self, rule_sets, default_jurisdiction="default"):
+        """
+        Initializes and compiles the rule sets.
+
+        Parameters:
+        - rule_sets (dict): Jurisdiction name to a rules dict using the keys of
+          GISAnalyzer.DEFAULT_ZONING_RULES; missing keys inherit from the default
+          jurisdiction's rules, then from DEFAULT_ZONING_RULES.
+        - default_jurisdiction (str): Rule set applied to jurisdictions without their own.
+        """
+        base_rules = self._merge(DEFAULT_ZONING_RULES, rule_sets.get(default_jurisdiction, {}))
+
+        self.default_jurisdiction = default_jurisdiction
+        self.rule_sets = {default_jurisdiction: base_rules}
+        for jurisdiction, rules in rule_sets.items():
+            self.rule_sets[jurisdiction] = self._merge(base_rules, rules)
+
+        self.predicates = {jurisdiction: self.compile(rules) for jurisdiction, rules in self.rule_sets.items()}
+
+    @classmethod
+    def from_config(cls, path, **kwargs):
+        """
+        Loads rule sets from a JSON file: {"jurisdiction": {"minimum_lot_size": ..., ...}}.
+
+        Returns:
+        - ZoningRuleEngine: The compiled engine.
+        """
+        with open(path) as config_file:
+            return cls(json.load(config_file), **kwargs)
+
+    @staticmethod
+    def _merge(base, overrides):
+        rules = copy.deepcopy(base)
+        for key, value in overrides.items():
+            if key == "setbacks":
+                rules["setbacks"] = {**rules["setbacks"], **value}
+            elif key in rules:
+                rules[key] = value
+            else:
+                raise ValueError(f"Unknown zoning rule: {key}")
+        return rules
+
+    @staticmethod
+    def compile(rules):
+        """
+        Compiles one rule set into a vectorized predicate. Thresholds are resolved and
+        unused checks dropped here, once, instead of on every parcel.
+
+        Parameters:
+        - rules (dict): A complete rules dict.
+
+        Returns:
+        - function: predicate(parcels) -> np.ndarray of int8 reason codes, where parcels
+          is a dict of equally long arrays ("size", "slope", "zoning_compliance" and
+          optionally "adu_floor_area", "lot_width", "lot_depth", "existing_footprint").
+        """
+        minimum_lot_size = float(rules["minimum_lot_size"])
+        max_slope = float(rules["max_slope"])
+        flood_rule = bool(rules["flood_zone_restriction"])
+        side = float(rules["setbacks"].get("side", 0))
+        depth_setback = float(rules["setbacks"].get("front", 0)) + float(rules["setbacks"].get("rear", 0))
+        has_setbacks = side > 0 or depth_setback > 0
+        floor_area_ratio = rules["max_adu_floor_area_ratio"]
+        max_floor_area = rules["max_adu_floor_area"]
+
+        # Checks in reverse priority order: later assignments win, so the first failing
+        # check (lot size, slope, flood, setbacks, floor area) is the reported reason
+        checks = []
+        if floor_area_ratio is not None or max_floor_area is not None:
+            def floor_area_check(parcels):
+                floor_area = parcels.get("adu_floor_area")
+                if floor_area is None:
+                    return None
+                limit = np.full(len(floor_area), np.inf)
+                if floor_area_ratio is not None:
+                    limit = np.minimum(limit, float(floor_area_ratio) * parcels["size"])
+                if max_floor_area is not None:
+                    limit = np.minimum(limit, float(max_floor_area))
+                return floor_area > limit
+            checks.append((FLOOR_AREA_EXCEEDED, floor_area_check))
+
+        if has_setbacks:
+            # Area-based approximation: the primary dwelling's footprint is assumed to sit
+            # inside the setback envelope and is subtracted from its area; the actual
+            # placement and shape of the buildings are not modeled
+            def setback_check(parcels):
+                width = parcels.get("lot_width")
+                depth = parcels.get("lot_depth")
+                if width is None or depth is None:
+                    return None
+                buildable = np.clip(width - 2 * side, 0, None) * np.clip(depth - depth_setback, 0, None)
+                existing = parcels.get("existing_footprint")
+                if existing is not None:
+                    buildable = np.clip(buildable - existing, 0, None)
+                footprint = parcels.get("adu_floor_area")
+                return buildable <= 0 if footprint is None else buildable < footprint
+            checks.append((SETBACK_VIOLATION, setback_check))
+
+        if flood_rule:
+            checks.append((FLOOD_ZONE, lambda parcels: ~parcels["zoning_compliance"]))
+        checks.append((SLOPE_TOO_STEEP, lambda parcels: parcels["slope"] > max_slope))
+        checks.append((LOT_TOO_SMALL, lambda parcels: parcels["size"] < minimum_lot_size))
+
+        def predicate(parcels):
+            reasons = np.full(len(parcels["size"]), ZONING_APPROVED, dtype=np.int8)
+            for reason, check in checks:
+                failed = check(parcels)
+                if failed is not None:
+                    reasons[failed] = reason
+            return reasons
+
+        return predicate
+
+    def evaluate(self, jurisdictions, lot_sizes, slopes, zoning_compliance=None, adu_floor_area=None,
+                 lot_width=None, lot_depth=None, existing_footprint=None):
+        """
+        Evaluates a batch of parcels, each against its own jurisdiction's rules.
+
+        Parameters:
+        - jurisdictions (array-like): Jurisdiction name per parcel (or a single name for all).
+        - lot_sizes (array-like): Lot sizes in square feet.
+        - slopes (array-like): Slopes in degrees.
+        - zoning_compliance (array-like): Flood-zone compliance flags (default: compliant).
+        - adu_floor_area (array-like): Proposed ADU floor area (enables floor-area rules).
+        - lot_width, lot_depth (array-like): Lot dimensions in feet (enable setback rules).
+        - existing_footprint (array-like): Footprint of the primary dwelling in square feet,
+          taken out of the buildable area by the setback rules (default: none).
+
+        Returns:
+        - tuple: (np.ndarray of bool, True where an ADU is allowed; np.ndarray of int8
+          reason codes as in GISAnalyzer.REJECTION_REASONS).
+        """
+        size = np.asarray(lot_sizes, dtype=np.float64)
+        parcels = {"size": size, "slope": np.asarray(slopes, dtype=np.float64)}
+        parcels["zoning_compliance"] = (np.ones(len(size), dtype=bool) if zoning_compliance is None
+                                        else np.asarray(zoning_compliance, dtype=bool))
+        for name, values in (("adu_floor_area", adu_floor_area), ("lot_width", lot_width), ("lot_depth", lot_depth),
+                             ("existing_footprint", existing_footprint)):
+            if values is not None:
+                parcels[name] = np.broadcast_to(np.asarray(values, dtype=np.float64), size.shape)
+
+        if isinstance(jurisdictions, str):
+            jurisdictions = [jurisdictions]
+        names, group = np.unique(np.asarray(jurisdictions, dtype=object).astype(str), return_inverse=True)
+        group = np.broadcast_to(group.reshape(-1), size.shape)
+
+        reasons = np.empty(len(size), dtype=np.int8)
+        if len(names) == 1:
+            reasons[:] = self._predicate(names[0])(parcels)
+        else:
+            # Sort parcels by jurisdiction once, then run each compiled predicate on its slice
+            order = np.argsort(group, kind="stable")
+            bounds = np.searchsorted(group[order], np.arange(len(names) + 1))
+            for index, name in enumerate(names):
+                members = order[bounds[index]:bounds[index + 1]]
+                reasons[members] = self._predicate(name)({key: values[members] for key, values in parcels.items()})
+
+        return reasons == ZONING_APPROVED, reasons
+
+    def check_property(self, property_data):
+        """
+        Evaluates a single property dict against its jurisdiction's rules.
+
+        Parameters:
+        - property_data (dict): "size", "slope", "zoning_compliance" and optionally
+          "jurisdiction", "adu_floor_area", "lot_width", "lot_depth" and "existing_footprint".
+
+        Returns:
+        - int: ZONING_APPROVED, or the reason code of the first failed check.
+        """
+        optional = {name: [property_data[name]] for name in
+                    ("adu_floor_area", "lot_width", "lot_depth", "existing_footprint")
+                    if property_data.get(name) is not None}
+        _, reasons = self.evaluate(property_data.get("jurisdiction", self.default_jurisdiction),
+                                   [property_data.get("size", 0)], [property_data.get("slope", 0)],
+                                   [property_data.get("zoning_compliance", True)], **optional)
+        return int(reasons[0])
+
+    def allowed_designs(self, property_data, floor_area):
+        """
+        Checks a design catalog against a property's jurisdiction rules: each design's floor
+        area is taken as the proposed ADU floor area, so designs above the jurisdiction's
+        floor-area caps (or too large for the setback envelope) are rejected.
+
+        Parameters:
+        - property_data (dict): The property, as for check_property().
+        - floor_area (array-like): Floor area of each design in square feet.
+
+        Returns:
+        - np.ndarray: bool, True for the designs the jurisdiction allows on the property.
+        """
+        floor_area = np.asarray(floor_area, dtype=np.float64)
+        optional = {name: property_data[name] for name in ("lot_width", "lot_depth", "existing_footprint")
+                    if property_data.get(name) is not None}
+        allowed, _ = self.evaluate(property_data.get("jurisdiction", self.default_jurisdiction),
+                                   np.full(len(floor_area), property_data.get("size", 0), dtype=np.float64),
+                                   np.full(len(floor_area), property_data.get("slope", 0), dtype=np.float64),
+                                   np.full(len(floor_area), bool(property_data.get("zoning_compliance", True))),
+                                   adu_floor_area=floor_area, **optional)
+        return allowed
+
+    def parameter_fingerprint(self):
+        """
+        Returns:
+        - str: The compiled rule sets as canonical JSON; changes whenever a rule changes.
+        """
+        return json.dumps(self.rule_sets, sort_keys=True)
+
+    def _predicate(self, jurisdiction):
+        predicate = self.predicates.get(jurisdiction)
+        if predicate is None:
+            predicate = self.predicates[self.default_jurisdiction]
+        return predicate
+
+# Example usage
+if __name__ == "__main__":
+    engine = ZoningRuleEngine({
+        "default": {"minimum_lot_size": 4000, "max_slope": 15},
+        "cartersville": {"minimum_lot_size": 5000, "max_adu_floor_area_ratio": 0.15,
+                         "setbacks": {"side": 5, "rear": 10}},
+        "atlanta": {"minimum_lot_size": 3500, "max_adu_floor_area": 750}
+    })
+
+    allowed, reasons = engine.evaluate(
+        ["cartersville", "cartersville", "atlanta", "atlanta", "marietta"],
+        lot_sizes=[6000, 4500, 3600, 3600, 4200],
+        slopes=[5, 5, 8, 8, 20],
+        adu_floor_area=[800, 600, 700, 900, 600],
+        lot_width=[50, 45, 40, 40, 60],
+        lot_depth=[120, 100, 90, 90, 70])
+    print(f"ADU allowed: {allowed.tolist()}")
+    print(f"Reason codes: {reasons.tolist()}")
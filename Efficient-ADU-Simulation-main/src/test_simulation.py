@@ -1,11 +1,35 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
 import pytest
+import numpy as np
 from src.PropertyModel import PropertyModel
 from src.ADUDesign import ADUDesign
 from src.SimulationEngine import SimulationEngine
 from src.EnergyModel import EnergyModel
 from src.CostEstimator import CostEstimator
-from src.GISAnalyzer import GISAnalyzer
+from src.GISAnalyzer import (GISAnalyzer, ZONING_APPROVED, LOT_TOO_SMALL, SLOPE_TOO_STEEP, FLOOD_ZONE,
+                             ZONING_NONCOMPLIANT, SETBACK_VIOLATION, FLOOR_AREA_EXCEEDED, REJECTION_REASONS)
 from src.OptimizationModule import OptimizationModule
+from src.DesignBatch import DesignBatch
+from src.ParallelSimulationRunner import ParallelSimulationRunner
+from src.ParcelReader import ParcelReader
+from src.DesignSpace import DesignSpace
+from src.MonteCarloEngine import MonteCarloEngine
+from src.WeatherData import WeatherData
+from src.SpatialIndex import SpatialIndex
+from src.PolygonOverlay import PolygonOverlay
+from src.ZoningRuleEngine import ZoningRuleEngine
+from src.Instrumentation import Instrumentation
+from src.ResultStore import ResultStore
+from src.SimulationService import SimulationService
+from src.ReportGenerator import ReportGenerator
+from src.ResultTable import ResultTable
+from src.DesignCodes import MATERIAL_TYPES, HVAC_TYPES, INSULATION_TYPES, encode_categories, round_values
+from benchmarks.run_benchmarks import (Fixtures, build_benchmarks, run_benchmarks, find_regressions,
+                                       append_history)
 
 # Sample data for testing
 property_data = {
@@ -82,7 +106,778 @@ def test_optimization_module(optimization_module):
 
 # Test Case 7: Simulation Execution
 def test_simulation_execution(simulation_engine):
-    result = simulation_engine.run_simulation()
+    result = simulation_engine.run_simulation(property_data, [adu_design_data])
     assert isinstance(result, dict), "Simulation should return a dictionary of results"
-    assert "energy_usage" in result, "Simulation results should include energy usage"
-    assert "total_cost" in result, "Simulation results should include total cost"
+    assert result["best_design"] == adu_design_data, "The only design should be selected"
+    design_result = result["all_designs"][0]
+    assert "daily_energy_usage" in design_result, "Simulation results should include energy usage"
+    assert "total_cost" in design_result, "Simulation results should include total cost"
+
+# Test Case 8: Batch Simulation Matches the Scalar Path
+def test_batch_simulation_matches_scalar(simulation_engine):
+    designs = [
+        {"floor_area": area, "materials": material, "hvac": hvac, "insulation": insulation}
+        for area in (450, 600, 735, 1000)
+        for material in MATERIAL_TYPES
+        for hvac in HVAC_TYPES
+        for insulation in INSULATION_TYPES
+    ]
+    design_table = {
+        "floor_area": np.array([d["floor_area"] for d in designs]),
+        "materials": encode_categories([d["materials"] for d in designs], MATERIAL_TYPES),
+        "hvac": encode_categories([d["hvac"] for d in designs], HVAC_TYPES),
+        "insulation": encode_categories([d["insulation"] for d in designs], INSULATION_TYPES),
+    }
+
+    scalar = simulation_engine.run_simulation(property_data, designs)
+    batch = simulation_engine.run_simulation_batch(property_data, design_table)
+
+    for metric in ("efficiency_score", "daily_energy_usage", "total_cost"):
+        expected = [res[metric] for res in scalar["all_designs"]]
+        assert batch["all_designs"][metric].tolist() == expected, f"Batch {metric} should match the scalar path"
+    assert batch["best_design"] == scalar["best_design"], "Batch and scalar paths should pick the same design"
+
+# Test Case 9: Batch Rounding Matches round()
+def test_round_values_matches_builtin():
+    values = np.array([0.125, 0.375, 2.675, 1.005, 0.7225, 45000.005, -0.125])
+    assert round_values(values, 2).tolist() == [round(v, 2) for v in values.tolist()], "round_values should agree with round()"
+
+# Test Case 10: DesignBatch Round Trip and Model Support
+def test_design_batch_round_trip(energy_model, cost_estimator, optimization_module):
+    designs = [
+        {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+        {"floor_area": 750, "materials": "steel_frame", "hvac": "high_efficiency", "insulation": "high_efficiency"},
+        {"floor_area": 900, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+    ]
+    batch = DesignBatch.from_dicts(designs)
+    assert batch.to_dicts() == designs, "DesignBatch should convert back to the same dicts"
+    assert batch.materials.dtype == np.int8 and batch.floor_area.dtype == np.int32, "DesignBatch should use compact dtypes"
+    assert batch.nbytes == 7 * len(designs), "Each design should take 7 bytes"
+
+    assert energy_model.compute_efficiency(batch).tolist() == [energy_model.compute_efficiency(d) for d in designs]
+    assert cost_estimator.estimate_total_cost(batch).tolist() == [cost_estimator.estimate_total_cost(d) for d in designs]
+    assert ADUDesign(batch).calculate_livable_space().tolist() == [ADUDesign(d).calculate_livable_space() for d in designs]
+    assert optimization_module.find_optimal_design(batch) == optimization_module.find_optimal_design(designs)
+
+    # Fractional floor areas are kept exactly, so the batch costs still match the scalar path
+    fractional = [dict(design, floor_area=design["floor_area"] + 0.497) for design in designs]
+    fractional_batch = DesignBatch.from_dicts(fractional)
+    assert fractional_batch.to_dicts() == fractional
+    assert cost_estimator.estimate_total_cost(fractional_batch).tolist() == [
+        cost_estimator.estimate_total_cost(d) for d in fractional]
+
+    # Whole floor areas beyond the int32 range are kept as float64 instead of wrapping
+    huge = DesignBatch([3.0e9, 600.0], [0, 0], [0, 0], [0, 0])
+    assert huge.floor_area.dtype == np.float64 and huge.floor_area.tolist() == [3.0e9, 600.0]
+    assert DesignBatch(np.array([-2 ** 40]), [0], [0], [0]).floor_area.tolist() == [-2 ** 40]
+
+# Test Case 11: Parallel Runner Streams Results in Order
+def test_parallel_runner_preserves_order(simulation_engine):
+    designs = [
+        {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+        {"floor_area": 800, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+    ]
+    properties = [{"size": 3500 + 250 * i, "slope": i % 18, "zoning_compliance": i % 7 != 0} for i in range(30)]
+
+    runner = ParallelSimulationRunner(designs, max_workers=2, chunksize=4, max_pending_chunks=2)
+    results = list(runner.run(iter(properties)))
+
+    expected = [simulation_engine.run_simulation(p, designs) for p in properties]
+    assert results == expected, "Parallel results should match serial results in input order"
+
+# Test Case 12: Streaming Parcel Ingestion
+def test_parcel_reader_streams_chunks(tmp_path, simulation_engine):
+    parcel_file = tmp_path / "parcels.csv"
+    with open(parcel_file, "w") as handle:
+        handle.write("parcel_id,LOT_SQFT,SLOPE_DEG,FLOOD_OK,LAT,LON,CANOPY\n")
+        for i in range(25):
+            handle.write(f"P{i},{3000 + 200 * i},{i % 20},{'Y' if i % 4 else 'N'},34.0,-84.0,\n")
+
+    reader = ParcelReader(str(parcel_file), column_map={
+        "size": "LOT_SQFT", "slope": "SLOPE_DEG", "zoning_compliance": "FLOOD_OK",
+        "latitude": "LAT", "longitude": "LON", "tree_cover": "CANOPY"
+    }, chunk_size=10, extra_columns=("parcel_id",))
+
+    chunks = list(reader.iter_chunks())
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5], "Chunks should be bounded by chunk_size"
+    assert chunks[0][1] == {"size": 3200.0, "slope": 1.0, "zoning_compliance": True,
+                            "latitude": 34.0, "longitude": -84.0, "parcel_id": "P1"}
+
+    results = list(simulation_engine.run_simulation_stream(reader, [adu_design_data]))
+    assert len(results) == 25, "Every parcel should produce a result"
+    assert "error" in results[0] and "best_design" in results[5]
+
+# Test Case 13: Bulk Zoning Pre-Filter
+def test_screen_parcels_matches_scalar(gis_analyzer):
+    parcels = [
+        {"size": 5000, "slope": 5, "zoning_compliance": True},
+        {"size": 3000, "slope": 20, "zoning_compliance": False},
+        {"size": 6000, "slope": 20, "zoning_compliance": False},
+        {"size": 4500, "slope": 8, "zoning_compliance": False},
+        {"size": 4000, "slope": 15, "zoning_compliance": True},
+    ]
+    allowed, reasons = gis_analyzer.screen_parcels(
+        [p["size"] for p in parcels], [p["slope"] for p in parcels], [p["zoning_compliance"] for p in parcels])
+
+    assert allowed.tolist() == [gis_analyzer.analyze_zoning_constraints(p) for p in parcels]
+    assert reasons.tolist() == [ZONING_APPROVED, LOT_TOO_SMALL, SLOPE_TOO_STEEP, FLOOD_ZONE, ZONING_APPROVED]
+
+# Test Case 14: Rejection Counters Replace Per-Call Prints
+def test_rejection_counts(simulation_engine, capsys):
+    properties = [
+        {"size": 3000, "slope": 5, "zoning_compliance": True},
+        {"size": 3500, "slope": 5, "zoning_compliance": True},
+        {"size": 6000, "slope": 25, "zoning_compliance": True},
+        {"size": 6000, "slope": 5, "zoning_compliance": False},
+        {"size": 6000, "slope": 5, "zoning_compliance": True},
+    ]
+    for property_data in properties:
+        simulation_engine.run_simulation(property_data, [adu_design_data])
+
+    assert capsys.readouterr().out == "", "Simulation should not write to stdout"
+    assert simulation_engine.get_rejection_counts(reset=True) == {
+        REJECTION_REASONS[LOT_TOO_SMALL]: 2,
+        REJECTION_REASONS[SLOPE_TOO_STEEP]: 1,
+        REJECTION_REASONS[ZONING_NONCOMPLIANT]: 1,
+    }
+    assert simulation_engine.get_rejection_counts() == {}, "Counters should be cleared after a reset"
+
+# Test Case 15: Top-k Design Selection
+def test_find_top_designs(optimization_module):
+    designs = [
+        {"floor_area": area, "materials": material, "hvac": hvac}
+        for area in (500, 650, 800)
+        for material in MATERIAL_TYPES
+        for hvac in HVAC_TYPES
+    ] * 2
+    expected = sorted(range(len(designs)), key=lambda i: (-optimization_module.evaluate_design(designs[i]), i))[:5]
+
+    top = optimization_module.find_top_designs(iter(designs), 5)
+    assert [entry["index"] for entry in top] == expected, "Heap selection should return the best designs in order"
+    assert top[0]["design"] == optimization_module.find_optimal_design(designs)
+
+    batch_top = optimization_module.find_top_designs(DesignBatch.from_dicts(designs), 5)
+    assert [entry["index"] for entry in batch_top] == expected, "Batch selection should agree with the heap"
+
+    # Scores already computed by run_simulation_batch() select the same designs
+    batch = DesignBatch.from_dicts(designs)
+    scores = SimulationEngine().run_simulation_batch(property_data, batch)["scores"]
+    assert optimization_module.find_top_designs(batch, 5, scores=scores) == batch_top
+
+# Test Case 16: Pareto Front for Cost vs. Efficiency Trade-offs
+def test_pareto_front_matches_brute_force(optimization_module):
+    rng = np.random.default_rng(7)
+    cost = rng.integers(0, 15, 300).astype(float)
+    efficiency = rng.integers(0, 15, 300) / 20
+    energy = rng.integers(0, 15, 300).astype(float)
+
+    def brute_force(objectives):
+        front = []
+        for i, point in enumerate(objectives):
+            dominated = any(np.all(other <= point) and np.any(other < point) for other in objectives)
+            if not dominated:
+                front.append(i)
+        return front
+
+    two = np.column_stack([cost, -efficiency])
+    three = np.column_stack([cost, -efficiency, energy])
+    assert optimization_module.find_pareto_front(cost, efficiency).tolist() == brute_force(two)
+    assert optimization_module.find_pareto_front(cost, efficiency, energy).tolist() == brute_force(three)
+
+    # A front made of every design (the worst case for the sweep) is found in full
+    plane_cost = rng.random(20000)
+    plane_efficiency = rng.random(20000)
+    plane_energy = 2 - plane_cost + plane_efficiency
+    assert len(optimization_module.find_pareto_front(plane_cost, plane_efficiency, plane_energy)) == 20000
+
+    front = optimization_module.find_pareto_front(cost, efficiency, energy)
+    ranked, scores = optimization_module.rank_pareto_front(front, cost, efficiency, energy, cost_weight=1.0,
+                                                           efficiency_weight=0.0, energy_weight=0.0)
+    assert cost[ranked[0]] == cost.min(), "A pure cost weighting should pick the cheapest design"
+    assert np.all(np.diff(scores) <= 0), "Ranked scores should be non-increasing"
+
+    # Normalizing over the whole sweep keeps the front's best score equal to the sweep's best
+    def sweep_scores(values, higher_is_better):
+        scaled = (values - values.min()) / (values.max() - values.min())
+        return scaled if higher_is_better else 1 - scaled
+
+    all_scores = 0.3 * sweep_scores(cost, False) + 0.5 * sweep_scores(efficiency, True) + 0.2 * sweep_scores(energy, False)
+    _, scores = optimization_module.rank_pareto_front(front, cost, efficiency, energy, cost_weight=0.3,
+                                                      efficiency_weight=0.5, energy_weight=0.2)
+    assert scores[0] == pytest.approx(all_scores.max())
+
+# Test Case 17: Lazy Design-Space Enumeration and Sampling
+def test_design_space_enumeration():
+    design_space = DesignSpace(range(400, 1001, 100))
+    assert len(design_space) == 7 * 3 * 2 * 3, "Design space should cover the full product"
+
+    chunks = list(design_space.iter_chunks(chunk_size=40))
+    assert [len(chunk) for chunk in chunks] == [40, 40, 40, 6], "Chunks should be bounded by chunk_size"
+    designs = DesignBatch.concatenate(chunks).to_dicts()
+    assert len({tuple(d.values()) for d in designs}) == len(design_space), "Every design should appear once"
+
+    strided = DesignBatch.concatenate(design_space.iter_chunks(chunk_size=10, step=5)).to_dicts()
+    assert strided == designs[::5], "Strided enumeration should keep every step-th design"
+
+    sample = design_space.sample_latin_hypercube(7, seed=3)
+    assert sorted(sample.floor_area.tolist()) == list(range(400, 1001, 100)), "LHS should use each floor-area stratum once"
+    assert design_space.sample_random(20, seed=3).to_dicts() == design_space.sample_random(20, seed=3).to_dicts()
+
+# Test Case 18: Design Result Cache
+def test_design_result_cache():
+    designs = [
+        {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+        {"floor_area": 800, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+        {"floor_area": 700, "materials": "steel_frame", "hvac": "high_efficiency", "insulation": "high_efficiency"},
+    ]
+    cached_engine = SimulationEngine(cache_size=2)
+    uncached_engine = SimulationEngine()
+
+    first = cached_engine.run_simulation(property_data, designs[:2])
+    second = cached_engine.run_simulation(property_data, designs[:2])
+    assert first == second == uncached_engine.run_simulation(property_data, designs[:2])
+    info = cached_engine.result_cache.cache_info()
+    assert (info["hits"], info["misses"]) == (2, 2), "Repeated designs should be cache hits"
+
+    cached_engine.run_simulation(property_data, designs)
+    assert cached_engine.result_cache.cache_info()["evictions"] == 1, "The LRU entry should be evicted"
+
+    # Changing a multiplier must invalidate cached results
+    cached_engine.cost_estimator.material_cost["concrete"] = 2.0
+    uncached_engine.cost_estimator.material_cost["concrete"] = 2.0
+    assert cached_engine.run_simulation(property_data, designs) == uncached_engine.run_simulation(property_data, designs)
+    assert cached_engine.result_cache.version == 2, "Only the current parameter version should be kept"
+    assert all(key[0] == 2 for key in cached_engine.result_cache.entries), "Stale entries should be dropped"
+
+# Test Case 19: Monte Carlo Cost Quantiles
+def test_monte_carlo_quantiles(cost_estimator):
+    designs = DesignBatch.from_dicts([
+        {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+        {"floor_area": 900, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+    ])
+    engine = MonteCarloEngine(bins=2048)
+    summary = engine.run(designs, sample_count=20000, seed=11, block_size=3000)
+
+    parallel = engine.run(designs, sample_count=20000, seed=11, block_size=3000, max_workers=2)
+    assert np.array_equal(summary["total_cost"]["p50"], parallel["total_cost"]["p50"]), "Results should not depend on workers"
+
+    # Re-drawing the same blocks in one piece gives the exact quantiles to compare against
+    low, high = engine._bounds(designs)["total_cost"]
+    samples = np.concatenate([
+        engine._evaluate(designs, *engine._draw_parameters(np.random.default_rng(block_seed), size))[0]
+        for block_seed, size in zip(np.random.SeedSequence(11).spawn(7), [3000] * 6 + [2000])
+    ], axis=1)
+    tolerance = (high - low) / 2048 + 1e-9
+    for name, quantile in (("p10", 0.1), ("p50", 0.5), ("p90", 0.9)):
+        assert np.all(np.abs(summary["total_cost"][name] - np.quantile(samples, quantile, axis=1)) <= tolerance)
+
+    point_costs = cost_estimator.estimate_total_cost(designs)
+    assert np.all(summary["total_cost"]["p10"] < point_costs) and np.all(point_costs < summary["total_cost"]["p90"])
+
+    # The efficiency tables are sampled too, around EnergyModel's point scores
+    point_efficiency = EnergyModel().compute_efficiency(designs)
+    efficiency = summary["efficiency_score"]
+    assert np.all(efficiency["p10"] < point_efficiency + 0.01) and np.all(point_efficiency - 0.01 < efficiency["p90"])
+
+    # Splitting the catalog into design chunks does not change the histograms
+    chunked = MonteCarloEngine(bins=2048)
+    chunked.block_cells = 3000
+    chunked_summary = chunked.run(designs, sample_count=20000, seed=11, block_size=3000)
+    for name in engine.metrics:
+        assert np.array_equal(chunked_summary[name]["p50"], summary[name]["p50"])
+        assert np.array_equal(chunked_summary[name]["mean"], summary[name]["mean"])
+
+    # The default resolution shrinks with the catalog so histogram memory stays bounded
+    assert MonteCarloEngine()._bin_count(2) == 512 and MonteCarloEngine()._bin_count(10 ** 5) == 40
+
+# Test Case 20: Hourly Energy Time Series
+def test_hourly_energy_usage(energy_model, tmp_path):
+    weather = WeatherData.synthetic()
+    designs = DesignBatch.from_dicts([
+        {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+        {"floor_area": 600, "materials": "concrete", "hvac": "high_efficiency", "insulation": "standard"},
+        {"floor_area": 900, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+    ])
+
+    loads = energy_model.estimate_hourly_energy_usage(designs, weather, chunk_size=2)
+    assert loads.shape == (3, 8760), "Loads should be a (designs x hours) matrix"
+    assert np.all(loads >= 0), "Hourly loads should never be negative"
+    assert loads[0].sum() > loads[1].sum(), "A better envelope and HVAC should use less energy"
+
+    # With neutral weather the profile is flat and matches the daily model
+    neutral = WeatherData(np.full(24, 21.0), np.zeros(24))
+    flat = energy_model.estimate_hourly_energy_usage(designs, neutral, dtype=np.float64)
+    assert np.allclose(flat.sum(axis=1), energy_model.estimate_daily_energy_usage(designs), atol=0.01)
+
+    mapped = energy_model.estimate_hourly_energy_usage(designs, weather, out=str(tmp_path / "loads.npy"))
+    assert np.array_equal(np.load(tmp_path / "loads.npy", mmap_mode="r"), loads), "Memory-mapped output should match"
+    del mapped
+
+    # Hourly-model parameters are part of the fingerprint that invalidates cached results
+    fingerprint = energy_model.parameter_fingerprint()
+    energy_model.heating_balance_point += 1
+    assert energy_model.parameter_fingerprint() != fingerprint
+
+# Test Case 21: Solar-Geometry Insolation
+def test_annual_insolation(gis_analyzer):
+    latitudes = np.array([0.0, 25.0, 34.0, 45.0, 60.0])
+    insolation = gis_analyzer.estimate_annual_insolation_batch(latitudes, np.zeros(5))
+    assert np.all(np.diff(insolation) < 0), "Insolation should fall with distance from the equator"
+    assert 1000 < insolation[2] < 2500, "Mid-latitude insolation should be in a realistic range (kWh/m^2)"
+
+    shaded = gis_analyzer.estimate_annual_insolation_batch(latitudes, np.full(5, 50.0))
+    assert np.allclose(shaded, insolation / 2), "Tree cover should attenuate insolation proportionally"
+
+    parcel = {"latitude": 34.05, "longitude": -118.25, "tree_cover": 30}
+    assert gis_analyzer.estimate_annual_insolation(parcel) == pytest.approx(insolation[2] * 0.7, rel=0.01)
+    assert int((34.05 + 90) / GISAnalyzer.latitude_band_width) in GISAnalyzer._insolation_by_band, "Bands should be cached"
+
+# Test Case 22: Spatial Index Radius and Nearest-Neighbor Queries
+def test_spatial_index_queries(tmp_path):
+    rng = np.random.default_rng(5)
+    latitudes = 34.0 + rng.random(2000) * 0.1
+    longitudes = -84.5 + rng.random(2000) * 0.1
+    index = SpatialIndex(latitudes, longitudes, cell_size=300)
+    x, y = index.project(latitudes, longitudes)
+
+    query_x, query_y = index.project(34.05, -84.45)
+    distances = np.hypot(x - query_x, y - query_y)
+    assert index.query_radius(34.05, -84.45, 800).tolist() == np.flatnonzero(distances <= 800).tolist()
+
+    for latitude, longitude in ((34.05, -84.45), (34.3, -84.9), (33.99, -84.41)):
+        qx, qy = index.project(latitude, longitude)
+        expected = int(np.argmin(np.hypot(x - qx, y - qy)))
+        assert index.nearest(latitude, longitude)[0] == expected, "Nearest should match brute force"
+
+    mask = index.within_distance([34.02, 34.08], [-84.48, -84.42], 500)
+    assert mask.sum() == len(set(index.query_radius(34.02, -84.48, 500)) | set(index.query_radius(34.08, -84.42, 500)))
+
+    # The vectorized batch queries agree with the per-query ones, including far-away queries
+    query_latitudes = 33.95 + rng.random(300) * 0.2
+    query_longitudes = -84.55 + rng.random(300) * 0.2
+    nearest_indices, nearest_distances = index.nearest_batch(query_latitudes, query_longitudes)
+    expected = [index.nearest(latitude, longitude) for latitude, longitude in zip(query_latitudes, query_longitudes)]
+    assert nearest_indices.tolist() == [nearest for nearest, _ in expected]
+    assert nearest_distances.tolist() == [distance for _, distance in expected]
+    within = np.zeros(len(index), dtype=bool)
+    for latitude, longitude in zip(query_latitudes, query_longitudes):
+        within[index.query_radius(latitude, longitude, 400)] = True
+    assert np.array_equal(index.within_distance(query_latitudes, query_longitudes, 400), within)
+
+    index.save(str(tmp_path / "parcels"))
+    reloaded = SpatialIndex.load(str(tmp_path / "parcels"))
+    assert isinstance(reloaded.x, np.memmap), "Reloaded arrays should be memory-mapped"
+    assert reloaded.query_radius(34.05, -84.45, 800).tolist() == index.query_radius(34.05, -84.45, 800).tolist()
+
+# Test Case 23: Polygon Overlay for Flood Zones and Zoning Districts
+def test_polygon_overlay(gis_analyzer):
+    square = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+    hole = [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]]
+    flood_zones = PolygonOverlay.from_geojson({"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {}, "geometry": {"type": "Polygon", "coordinates": [square, hole]}},
+        {"type": "Feature", "properties": {}, "geometry": {"type": "MultiPolygon", "coordinates": [
+            [[[20, 0], [22, 0], [21, 3], [20, 0]]], [[[30, 30], [31, 30], [31, 31], [30, 30]]]]}},
+    ]})
+    districts = PolygonOverlay([[[[-50, -50], [50, -50], [50, 0.5], [-50, 0.5]]], [[[-50, 0.5], [50, 0.5], [50, 50], [-50, 50]]]],
+                               [{"name": "R-1"}, {"name": "I-1", "adu_allowed": False}])
+
+    longitudes = np.array([5, 5, 1, 21, 30.8, 15, -60])
+    latitudes = np.array([5, 2, 0.2, 1, 30.5, 15, 0])
+    assert flood_zones.locate(longitudes, latitudes).tolist() == [-1, 0, 0, 1, 1, -1, -1]
+
+    compliance, district = gis_analyzer.derive_zoning_compliance(latitudes=latitudes, longitudes=longitudes,
+                                                                 flood_zones=flood_zones, zoning_districts=districts)
+    assert district.tolist() == [1, 1, 0, 1, 1, 1, -1]
+    assert compliance.tolist() == [False, False, False, False, False, False, False]
+    assert gis_analyzer.derive_zoning_compliance(latitudes=[0.2, 0.2], longitudes=[15, 5], flood_zones=flood_zones,
+                                                 zoning_districts=districts)[0].tolist() == [True, False]
+
+    # With overlays set, the engine derives compliance from the coordinates instead of the flag
+    engine = SimulationEngine()
+    engine.gis_analyzer.set_overlays(flood_zones, districts)
+    designs = [{"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"}]
+    flooded = {**property_data, "latitude": 2, "longitude": 5}
+    outside = {**property_data, "zoning_compliance": False, "latitude": 0.2, "longitude": 15}
+    assert "error" in engine.run_simulation(flooded, designs)
+    assert "error" not in engine.run_simulation(outside, designs)
+    assert "error" in engine.run_simulation({**outside, "latitude": None}, designs), "Without coordinates the flag is kept"
+    assert engine.parameter_fingerprint() != SimulationEngine().parameter_fingerprint()
+
+# Test Case 24: Per-Jurisdiction Zoning Rule Engine
+def test_zoning_rule_engine(gis_analyzer, tmp_path):
+    config = tmp_path / "zoning.json"
+    config.write_text(json.dumps({
+        "cartersville": {"minimum_lot_size": 5000, "max_adu_floor_area_ratio": 0.15, "setbacks": {"side": 5, "rear": 10}},
+        "atlanta": {"minimum_lot_size": 3500, "max_adu_floor_area": 750},
+    }))
+    engine = ZoningRuleEngine.from_config(str(config))
+
+    sizes = [5000, 3000, 6000, 4500, 4000]
+    slopes = [5, 20, 20, 8, 15]
+    compliance = [True, False, False, False, True]
+    assert engine.evaluate("default", sizes, slopes, compliance)[1].tolist() == \
+        gis_analyzer.screen_parcels(sizes, slopes, compliance)[1].tolist(), "Default rules should match GISAnalyzer"
+
+    allowed, reasons = engine.evaluate(
+        ["cartersville", "cartersville", "cartersville", "atlanta", "atlanta", "unlisted"],
+        lot_sizes=[6000, 4500, 6000, 3600, 3600, 3800], slopes=[5, 5, 5, 8, 8, 5],
+        adu_floor_area=[800, 600, 950, 700, 900, 600],
+        lot_width=[50, 45, 12, 40, 40, 60], lot_depth=[120, 100, 120, 90, 90, 70])
+    assert reasons.tolist() == [ZONING_APPROVED, LOT_TOO_SMALL, SETBACK_VIOLATION,
+                                ZONING_APPROVED, FLOOR_AREA_EXCEEDED, LOT_TOO_SMALL]
+    assert allowed.tolist() == [True, False, False, True, False, False]
+
+    # The primary dwelling's footprint is taken out of the buildable envelope
+    _, reasons = engine.evaluate("cartersville", [6000], [5], adu_floor_area=[800], lot_width=[50], lot_depth=[120],
+                                 existing_footprint=[4000])
+    assert reasons.tolist() == [SETBACK_VIOLATION]
+
+    # The simulation engine applies each property's jurisdiction rules
+    simulation_engine = SimulationEngine(zoning_rules=engine)
+    designs = [{"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"}]
+    small_lot = {"size": 3600, "slope": 5, "zoning_compliance": True}
+    assert "error" in simulation_engine.run_simulation(small_lot, designs)
+    assert "error" not in simulation_engine.run_simulation({**small_lot, "jurisdiction": "atlanta"}, designs)
+    assert simulation_engine.get_rejection_counts() == {REJECTION_REASONS[LOT_TOO_SMALL]: 1}
+
+    # With a rule set the rule engine alone decides, and its floor-area cap filters the catalog
+    riverside = SimulationEngine(zoning_rules=ZoningRuleEngine(
+        {"riverside": {"flood_zone_restriction": False, "max_adu_floor_area": 500}}))
+    catalog = [{"floor_area": area, "materials": material, "hvac": hvac, "insulation": "standard"}
+               for area, material, hvac in ((900, "steel_frame", "high_efficiency"), (500, "concrete", "standard"),
+                                            (400, "wood_frame", "standard"))]
+    parcel = {"size": 5000, "slope": 5, "zoning_compliance": False, "jurisdiction": "riverside"}
+    assert riverside.zoning_rules.check_property(parcel) == ZONING_APPROVED
+    assert SimulationEngine().run_simulation({**parcel, "zoning_compliance": True}, catalog)["best_design"] == catalog[0]
+    capped = riverside.run_simulation(parcel, catalog)
+    assert capped["best_design"] == catalog[2]
+    assert [row["design"] for row in capped["all_designs"]] == catalog[1:]
+    assert riverside.run_simulation_many([parcel, {**parcel, "jurisdiction": "default"}], catalog) == \
+        [capped, riverside.run_simulation({**parcel, "jurisdiction": "default"}, catalog)]
+    assert SimulationEngine._unpack_result(SimulationEngine._pack_result(capped, catalog), catalog) == capped
+
+    batch = DesignBatch.from_dicts(catalog)
+    batch_result = riverside.run_simulation_batch(parcel, batch)
+    assert batch_result["design_index"].tolist() == [1, 2] and batch_result["best_index"] == 2
+    assert batch_result["all_designs"]["total_cost"].tolist() == [row["total_cost"] for row in capped["all_designs"]]
+    table = ResultTable.from_simulation(batch_result, batch)
+    assert table.to_dicts() == capped["all_designs"] and table[table.best_index]["design"] == catalog[2]
+
+# Test Case 25: Constrained Design-Space Optimizer
+def test_optimize_design_matches_grid(optimization_module):
+    # A livability bonus makes larger ADUs attractive until the budget binds
+    objective = lambda design: optimization_module.evaluate_design(design) + design["floor_area"] / 4000
+    budget, lot_size, coverage = 125000, 5000, 0.2
+
+    grid = [
+        {"floor_area": area, "materials": material, "hvac": hvac, "insulation": insulation}
+        for area in range(400, 1001)
+        for material in MATERIAL_TYPES for hvac in HVAC_TYPES for insulation in INSULATION_TYPES
+        if area <= lot_size * coverage and optimization_module.estimate_cost(
+            {"floor_area": area, "materials": material, "hvac": hvac}) <= budget
+    ]
+    grid_best = max(objective(design) for design in grid)
+
+    result = optimization_module.optimize_design((400, 1000), budget=budget, lot_size=lot_size,
+                                                 max_lot_coverage=coverage, objective=objective)
+    assert result["score"] >= grid_best - 1e-3, "Optimizer should reach the grid optimum"
+    assert result["design"]["floor_area"] <= lot_size * coverage
+    assert optimization_module.estimate_cost(result["design"]) <= budget
+    assert result["evaluations"] + result["cost_evaluations"] < len(grid) / 10, "Optimizer should need far fewer evaluations"
+
+    default = optimization_module.optimize_design((400, 1000), budget=budget)
+    assert default["pruned"] > 0, "Branch-and-bound should prune combinations for the default objective"
+    all_axes = optimization_module.optimize_design((400, 1000), budget=budget,
+                                                   objective_axes=("materials", "hvac", "insulation"))
+    assert default["score"] == all_axes["score"], "Insulation does not affect the default objective"
+    assert default["evaluations"] < all_axes["evaluations"], "Unused axes should not be branched on"
+
+    # Collapsing an axis the budget depends on keeps its cheapest option, not the first one
+    largest = dict(materials=("concrete", "steel_frame", "wood_frame"), budget=120000,
+                   objective=lambda design: design["floor_area"])
+    collapsed = optimization_module.optimize_design((400, 1200), objective_axes=("insulation",), **largest)
+    assert collapsed["score"] == optimization_module.optimize_design((400, 1200), **largest)["score"] == 1200
+
+    # A narrow second peak defeats golden-section search but not the grid scan
+    spiked = lambda design: 1.0 if abs(design["floor_area"] - 900) < 3 else -design["floor_area"] / 1000
+    searched = optimization_module.optimize_design((400, 1000), objective=spiked, objective_axes=())
+    scanned = optimization_module.optimize_design((400, 1000), objective=spiked, unimodal=False, objective_axes=())
+    assert searched["score"] < 1 and scanned["score"] == 1 and abs(scanned["design"]["floor_area"] - 900) < 3
+
+# Test Case 26: Unified Scoring Lookup Table
+def test_unified_scoring_matches_models():
+    engine = SimulationEngine(unified_scoring=True)
+    optimizer = engine.optimization_module
+    designs = [
+        {"floor_area": area, "materials": material, "hvac": hvac, "insulation": insulation}
+        for area in (450, 600, 812.5)
+        for material in MATERIAL_TYPES + ("adobe",) for hvac in HVAC_TYPES for insulation in INSULATION_TYPES
+    ]
+
+    # Fractional floor areas too: the cost is computed in CostEstimator's operation order
+    rng = np.random.default_rng(3)
+    designs += [{"floor_area": round(float(area), 3), "materials": "concrete", "hvac": "high_efficiency",
+                 "insulation": "standard"} for area in rng.uniform(400, 1200, 2000)]
+    designs.append({"floor_area": 461.497, "materials": "concrete", "hvac": "high_efficiency"})
+
+    for design in designs:
+        assert optimizer.estimate_cost(design) == engine.cost_estimator.estimate_total_cost(design)
+        assert optimizer.estimate_energy_efficiency(design) == engine.energy_model.compute_efficiency(design)
+
+    batch = DesignBatch.from_dicts(designs)
+    assert optimizer.evaluate_design(batch).tolist() == [optimizer.evaluate_design(design) for design in designs]
+
+    # The chosen design is the best one by the numbers the engine reports
+    result = engine.run_simulation(property_data, designs)
+    reported = max(result["all_designs"], key=lambda row: 0.6 * row["efficiency_score"]
+                   + 0.4 * (1 / (1 + row["total_cost"] / 100000)))
+    assert result["best_design"] == reported["design"]
+
+    # Changing a model parameter rebuilds the table at the next run (or an explicit refresh)
+    engine.cost_estimator.labor_cost_per_sqft = 80
+    optimizer.find_optimal_design(designs[:2])
+    assert optimizer.estimate_cost(designs[0]) == engine.cost_estimator.estimate_total_cost(designs[0])
+    engine.energy_model.insulation_efficiency["standard"] = 0.9
+    optimizer.refresh_score_table()
+    assert optimizer.estimate_energy_efficiency(designs[0]) == engine.energy_model.compute_efficiency(designs[0])
+
+# Test Case 27: Benchmark History and Regression Flags
+def test_benchmark_regression_tracking(tmp_path):
+    run = run_benchmarks(sizes=(200,), repeat=1, only=["CostEstimator"])
+    assert set(run["results"]) == {"CostEstimator.estimate_total_cost", "CostEstimator.estimate_total_cost[batch]"}
+
+    fixtures = Fixtures(200)
+    build_benchmarks(fixtures)["GISAnalyzer.screen_parcels"]()
+    assert "parcel_arrays" in vars(fixtures)
+    assert "_design_set" not in vars(fixtures), "Parcel benchmarks must not build the design fixtures"
+
+    history = tmp_path / "history.json"
+    append_history(str(history), run)
+    append_history(str(history), run)
+    assert len(json.loads(history.read_text())) == 2
+
+    assert find_regressions(run, run) == [], "A run should not regress against itself"
+    baseline = json.loads(json.dumps(run))
+    current = json.loads(json.dumps(run))
+    baseline["results"]["CostEstimator.estimate_total_cost"]["200"]["seconds"] = 0.01
+    current["results"]["CostEstimator.estimate_total_cost"]["200"]["seconds"] = 0.02
+    regressions = find_regressions(current, baseline, threshold=0.25)
+    assert [(r["benchmark"], r["size"]) for r in regressions] == [("CostEstimator.estimate_total_cost", 200)]
+
+# Test Case 28: Per-Stage Instrumentation
+@pytest.mark.parametrize("profile", [None, "cprofile", "tracemalloc"])
+def test_simulation_instrumentation(profile, tmp_path):
+    designs = [adu_design_data] * 50
+    assert "instrumentation" not in SimulationEngine().run_simulation(property_data, designs)
+
+    instrumentation = Instrumentation(profile=profile)
+    engine = SimulationEngine(instrumentation=instrumentation)
+    engine.run_simulation(property_data, designs)
+    result = engine.run_simulation(property_data, DesignBatch.from_dicts(designs))
+
+    stages = result["instrumentation"]["stages"]
+    assert set(stages) == {"run_simulation", "property_validation", "gis_checks", "design_evaluation", "optimization"}
+    assert stages["run_simulation"]["calls"] == 2
+    assert stages["design_evaluation"]["items"] == 100
+    assert stages["run_simulation"]["wall_seconds"] >= stages["design_evaluation"]["wall_seconds"]
+
+    profile_result = result["instrumentation"]["profile"]
+    assert (profile_result is None) == (profile is None)
+    if profile is not None:
+        assert profile_result["type"] == profile
+
+    path = tmp_path / "instrumentation.json"
+    instrumentation.to_json(str(path))
+    assert json.loads(path.read_text())["stages"]["optimization"]["calls"] == 2
+
+# Test Case 29: Incremental Re-Simulation from the Result Store
+def test_incremental_simulation_reuses_store(tmp_path):
+    designs = [
+        {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+        {"floor_area": 800, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+    ]
+    parcels = [{"size": 4000 + 100 * i, "slope": i % 20, "zoning_compliance": i % 7 != 0} for i in range(50)]
+    engine = SimulationEngine()
+    expected = [engine.run_simulation(parcel, designs) for parcel in parcels]
+
+    path = str(tmp_path / "results.sqlite")
+    with ResultStore(path) as store:
+        assert list(engine.run_simulation_incremental(parcels, designs, store, chunk_size=16)) == expected
+        assert (store.hits, store.misses, len(store)) == (0, 50, 50)
+
+    # A new process re-reads the store; only the edited parcel is simulated again
+    parcels[3] = {**parcels[3], "slope": 2}
+    expected[3] = engine.run_simulation(parcels[3], designs)
+    with ResultStore(path) as store:
+        assert list(engine.run_simulation_incremental(parcels, designs, store)) == expected
+        assert (store.hits, store.misses) == (49, 1)
+
+        # A parameter change invalidates every stored row
+        engine.cost_estimator.labor_cost_per_sqft = 60
+        results = list(engine.run_simulation_incremental(parcels, designs, store))
+        assert store.misses == 51
+        assert results[1]["all_designs"][0]["total_cost"] == engine.cost_estimator.estimate_total_cost(designs[0])
+        assert store.prune(store.hash_record(designs), store.hash_record(engine.parameter_fingerprint())) == 1
+
+    # A parameter change during a run applies to, and is stored under, the following chunks
+    with ResultStore(str(tmp_path / "mid_run.sqlite")) as store:
+        engine.cost_estimator.labor_cost_per_sqft = 50
+        stream = engine.run_simulation_incremental(parcels, designs, store, chunk_size=10)
+        head = [next(stream) for _ in range(10)]
+        engine.cost_estimator.labor_cost_per_sqft = 70
+        tail = list(stream)
+        assert head[1]["all_designs"][0]["total_cost"] != tail[0]["all_designs"][0]["total_cost"]
+        assert tail[0] == engine.run_simulation(parcels[10], designs)
+        assert store.prune(store.hash_record(designs), store.hash_record(engine.parameter_fingerprint())) == 10
+
+# Test Case 30: Micro-Batching HTTP Service
+def test_simulation_service_batches_requests():
+    designs = [
+        {"floor_area": 600, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"},
+        {"floor_area": 812.3, "materials": "concrete", "hvac": "high_efficiency", "insulation": "passive_house"},
+    ]
+    parcels = [{"size": 3500 + 100 * i, "slope": i % 20, "zoning_compliance": i % 5 != 0} for i in range(40)]
+    engine = SimulationEngine()
+    expected = [engine.run_simulation(parcel, designs) for parcel in parcels]
+
+    async def request(port, method, path, payload=None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode() + body)
+        status = int((await reader.readline()).split()[1])
+        response = await reader.read()
+        writer.close()
+        return status, json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+    async def scenario():
+        service = SimulationService(designs=designs, port=0, batch_window=0.05)
+        _, port = await service.start()
+        try:
+            responses = await asyncio.gather(*(request(port, "POST", "/simulate", {"property": parcel})
+                                               for parcel in parcels))
+            bad_request = await request(port, "POST", "/simulate", {"property": 5})
+            bad_designs = await request(port, "POST", "/simulate", {"property": parcels[0], "designs": [
+                {"floor_area": "large", "materials": "wood_frame"}]})
+            _, metrics = await request(port, "GET", "/metrics")
+            approved = next(parcel for parcel, result in zip(parcels, expected) if "error" not in result)
+            default_area = await request(port, "POST", "/simulate", {"property": approved, "designs": [
+                {"materials": "concrete"}]})
+
+            # A catalog that fails evaluation only fails its own request, not the whole batch
+            poisoned = [{"floor_area": None, "materials": "wood_frame", "hvac": "standard", "insulation": "standard"}]
+            shared_batch = await asyncio.gather(service.submit(approved, poisoned),
+                                                *(service.submit(parcel) for parcel in parcels[:5]),
+                                                return_exceptions=True)
+        finally:
+            await service.stop()
+        return responses, bad_request, bad_designs, (approved, default_area), metrics, shared_batch
+
+    responses, bad_request, bad_designs, (approved, default_area), metrics, shared_batch = asyncio.run(scenario())
+    assert [status for status, _ in responses] == [200] * len(parcels)
+    assert [result for _, result in responses] == expected, "Batched results should match run_simulation"
+    assert bad_request[0] == 400 and bad_designs[0] == 400
+    assert default_area == (200, engine.run_simulation(approved, [{"materials": "concrete"}])), \
+        "Missing design fields should take the same defaults as run_simulation"
+    assert isinstance(shared_batch[0], TypeError)
+    assert shared_batch[1:] == expected[:5]
+    assert metrics["requests"] == len(parcels)
+    assert metrics["batches"] < len(parcels), "Concurrent requests should be batched"
+    assert metrics["latency_ms"]["p50"] <= metrics["latency_ms"]["p99"]
+    assert metrics["queue_depth"] == 0
+
+# Test Case 31: Command-Line Entry Point and Lazy Imports
+def test_cli_simulate_and_lazy_imports(capsys):
+    import cli
+
+    assert cli.main(["simulate", "--json"]) == 0
+    expected = SimulationEngine().run_simulation(property_data, cli.DEFAULT_DESIGNS)
+    assert json.loads(capsys.readouterr().out) == expected
+    assert cli.main(["simulate", "--noncompliant"]) == 1
+
+    # A fresh simulate-only process should never load NumPy or matplotlib (until it is used)
+    check = ("import sys, cli; from src.LazyImport import lazy_import, is_loaded; cli.main(['simulate']); "
+             "unused = not (is_loaded('numpy') or is_loaded('matplotlib')); lazy_import('numpy').pi; "
+             "sys.exit(int(not (unused and is_loaded('numpy'))))")
+    assert subprocess.run([sys.executable, "-c", check], capture_output=True).returncode == 0
+
+# Test Case 32: Aggregated Report Generation
+def test_report_generator_aggregates(tmp_path):
+    designs = DesignSpace(range(400, 1201, 5)).sample_random(20000, seed=3, replace=True)
+    results = SimulationEngine().run_simulation_batch(property_data, designs)
+    columns = {**results["all_designs"], "floor_area": designs.floor_area}
+
+    generator = ReportGenerator(bins=20, max_workers=0)
+    aggregates = generator.aggregate(columns)
+    binned = aggregates["binned"]["cost_per_sqft"]
+    assert len(binned["centers"]) == 20 and binned["counts"].sum() == len(designs)
+
+    floor_area = designs.floor_area.astype(np.float64)
+    cost_per_sqft = results["all_designs"]["total_cost"] / floor_area
+    for index in (0, 7, 19):
+        upper = binned["edges"][index + 1] if index < 19 else np.inf
+        members = cost_per_sqft[(floor_area >= binned["edges"][index]) & (floor_area < upper)]
+        assert binned["median"][index] == pytest.approx(np.median(members))
+        assert binned["quantiles"]["p90"][index] == pytest.approx(np.quantile(members, 0.9))
+    assert aggregates["histogram"]["counts"].sum() == len(designs)
+
+    paths = generator.render(aggregates, str(tmp_path))
+    assert len(paths) == 6 and all(os.path.getsize(path) > 0 for path in paths)
+
+
+# Test Case 33: Columnar Result Table and Bulk Export
+def test_result_table_columns_and_export(tmp_path, monkeypatch):
+    import csv
+    import cli
+
+    engine = SimulationEngine()
+    designs = DesignSpace(range(400, 1201, 25)).sample_random(300, seed=4, replace=True)
+    results = engine.run_simulation(property_data, designs.to_dicts())
+    table = ResultTable.from_simulation(results)
+
+    # The columnar form matches the nested dicts and main.py's normalized metrics
+    assert table[table.best_index]["design"] == results["best_design"]
+    for index, row in enumerate(results["all_designs"]):
+        assert table[index] == row
+        floor_area = row["design"]["floor_area"]
+        assert table.energy_per_sqft[index] == round(row["daily_energy_usage"] / floor_area, 4)
+        assert table.cost_per_sqft[index] == round(row["total_cost"] / floor_area, 2)
+
+    # Out-of-vocabulary categories and extra design keys do not round-trip (documented)
+    adobe = {"floor_area": 600, "materials": "adobe", "hvac": "standard", "insulation": "standard", "roof": "flat"}
+    adobe_row = ResultTable.from_rows(engine.run_simulation(property_data, [adobe])["all_designs"]).to_dicts()[0]
+    assert adobe_row["design"] == {"floor_area": 600, "materials": None, "hvac": "standard", "insulation": "standard"}
+
+    # Batch results are wrapped without copying and handed out as read-only views
+    batch_results = engine.run_simulation_batch(property_data, designs)
+    batch_table = ResultTable.from_simulation(batch_results, designs)
+    assert batch_table.best_index == table.best_index
+    cost = batch_table.column("total_cost")
+    assert np.shares_memory(cost, batch_results["all_designs"]["total_cost"]) and not cost.flags.writeable
+    assert np.shares_memory(batch_table[10:20].column("materials"), designs.materials)
+    assert np.array_equal(batch_table.cost_per_sqft, table.cost_per_sqft)
+
+    npz_path = str(tmp_path / "results.npz")
+    table.to_npz(npz_path)
+    loaded = ResultTable.from_npz(npz_path)
+    assert loaded.to_dicts() == results["all_designs"] and loaded.best_index == table.best_index
+
+    csv_path = str(tmp_path / "results.csv")
+    table.to_csv(csv_path, chunk_size=64)
+    with open(csv_path, newline="") as csv_file:
+        rows = list(csv.DictReader(csv_file))
+    assert len(rows) == len(table)
+    assert rows[7]["materials"] == results["all_designs"][7]["design"]["materials"]
+    assert float(rows[7]["cost_per_sqft"]) == table.cost_per_sqft[7]
+
+    with pytest.raises(ValueError):
+        table.export(str(tmp_path / "results.xlsx"))
+
+    # The CLI sweep exports through the table, checking the format before sweeping
+    monkeypatch.setattr(cli, "_run_sweep", lambda *args, **kwargs: pytest.fail("Swept before checking --output"))
+    assert cli.main(["sweep", "--output", str(tmp_path / "sweep.txt")]) == 1
+    monkeypatch.undo()
+    sweep_path = str(tmp_path / "sweep.npz")
+    assert cli.main(["sweep", "--step", "100", "--chunk-size", "50", "--top", "1", "--output", sweep_path]) == 0
+    sweep = ResultTable.from_npz(sweep_path)
+    assert len(sweep) == len(DesignSpace(range(400, 1201, 100)))